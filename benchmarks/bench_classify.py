@@ -0,0 +1,92 @@
+"""Microbenchmark: classify() throughput with and without cable.json rules.
+
+    python benchmarks/bench_classify.py [--items N] [--rules 0,10,100,500]
+
+Builds N synthetic ItemRecords (realistic extension mix, random sizes and
+ages, a few source folders) and times classify() over them, first with the
+plain extension map and then with compiled rule sets of growing size.
+Prints items/sec for each; the rule-set numbers should stay roughly flat.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cable  # noqa: E402
+
+
+def make_items(n: int, seed: int = 7) -> list:
+    rnd   = random.Random(seed)
+    exts  = list(cable.tables().ext_map) + [".bin", ".dat", ""]
+    dirs  = ["/data/inbox", "/data/src/app", "/data/camera/DCIM", "/data/old"]
+    words = ["report", "IMG_", "Screenshot ", "invoice-", "backup", "notes", "track"]
+    now   = time.time()
+    items = []
+    for i in range(n):
+        name = f"{rnd.choice(words)}{i}{rnd.choice(exts)}"
+        size = int(rnd.lognormvariate(11, 3))
+        age  = rnd.uniform(0, 3 * 365 * 86400)
+        items.append(cable.ItemRecord(Path(rnd.choice(dirs)) / name, False, size, int((now - age) * 1e9)))
+    return items
+
+
+def make_rules(n: int, seed: int = 11) -> list[dict]:
+    rnd   = random.Random(seed)
+    cats  = [k for k in cable.tables().categories if "Folders" not in k]
+    rules = []
+    for i in range(n):
+        rule: dict = {"category": rnd.choice(cats)}
+        kind = i % 5
+        if kind == 0:
+            rule["glob"] = f"proj{i}_*"
+        elif kind == 1:
+            rule["regex"] = rf"^rx{i}-\d+"
+        elif kind == 2:
+            rule["ext"]      = [f".x{i}"]
+            rule["min_size"] = rnd.choice(["1KB", "1MB", "100MB"])
+        elif kind == 3:
+            rule["older_than_days"] = rnd.randint(30, 2000)
+            rule["glob"]            = f"*.old{i}"
+        else:
+            rule["in_folder"] = f"folder{i}"
+        rules.append(rule)
+    return rules
+
+
+def bench(items: list, rounds: int = 3) -> float:
+    classify = cable.classify
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for item in items:
+            classify(item)
+        best = min(best, time.perf_counter() - t0)
+    return len(items) / best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--items", type=int, default=200_000)
+    ap.add_argument("--rules", default="0,10,100,500")
+    args = ap.parse_args()
+
+    items = make_items(args.items)
+    raw   = cable.load_cable_config()
+    base  = cable.tables()
+    print(f"{'rules':>6}  {'items/s':>12}")
+    try:
+        for n in (int(x) for x in args.rules.split(",")):
+            cable.install_tables(cable.CableTables({**raw, "rules": make_rules(n)}))
+            print(f"{n:>6}  {bench(items):>12,.0f}")
+    finally:
+        cable.install_tables(base)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYTHONHASHSEED", "0")
+    main()
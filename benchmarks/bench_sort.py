@@ -0,0 +1,290 @@
+"""Benchmark suite: sort-once move/copy, date subfolders, undo and watcher ingest.
+
+    python benchmarks/bench_sort.py [--scenarios move,copy,date,apply,undo,watch] [--files N]
+                                    [--sizes SPEC] [--mix SPEC] [--collisions RATE]
+                                    [--duplicates RATE] [--seed S] [--workers N]
+                                    [--root DIR] [--json FILE]
+
+Every scenario gets a fresh tree from synth.py (same seed, same tree) and
+runs in its own interpreter, with HOME pointed at a scratch directory so the
+hash and capture-date caches start cold and the real ones are left alone.
+The built-in default cable.json is used, not the one next to cable.py.
+
+    move    sort_folder() moving everything into category folders
+    copy    the same in copy mode
+    date    move with YYYY/MM date subfolders (capture dates read up front)
+    apply   plan_sort() then apply_plan(); only the apply is timed, the
+            planning time is reported as plan_seconds
+    undo    restore the journal of a move sort (the move itself is not timed)
+    watch   files renamed one by one into a folder a SortingHandler watches;
+            latency runs from the rename to the file being sorted, so it
+            includes the watcher's 2 s settle delay (needs watchdog)
+
+Reports items/s, MB/s, p50/p99 per-file latency and peak RSS per scenario,
+as a table and, with --json, as a JSON file.
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cable  # noqa: E402
+import synth  # noqa: E402
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None  # type: ignore[assignment]
+
+SCENARIOS = ("move", "copy", "date", "apply", "undo", "watch")
+
+
+class _Icon:
+    title = ""
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, round(q * (len(values) - 1)))]
+
+
+def timed(name: str) -> list[float]:
+    """Wrap cable.<name> so every call's duration is appended to the returned list."""
+    spent: list[float] = []
+    inner = getattr(cable, name)
+
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return inner(*args, **kwargs)
+        finally:
+            spent.append(time.perf_counter() - t0)
+
+    setattr(cable, name, wrapper)
+    return spent
+
+
+def report(items: int, nbytes: int, seconds: float, latencies: list[float]) -> dict:
+    seconds = max(seconds, 1e-9)
+    return {
+        "items":        items,
+        "bytes":        nbytes,
+        "seconds":      round(seconds, 4),
+        "items_per_s":  round(items / seconds, 1),
+        "mb_per_s":     round(nbytes / seconds / 1e6, 2),
+        "p50_ms":       round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms":       round(percentile(latencies, 0.99) * 1000, 3),
+        "peak_rss_mb":  peak_rss_mb(),
+    }
+
+
+def run_sort(tree: Path, copy_mode: bool, date_subfolders: bool, workers: int) -> dict:
+    items   = cable.scan_items(tree, [])
+    nbytes  = sum(item.size for item in items)
+    lat     = timed("_sort_one")
+    journal = None if copy_mode else cable.UndoJournal(tree)
+    t0 = time.perf_counter()
+    try:
+        cable.sort_folder(tree, items, copy_mode=copy_mode, date_subfolders=date_subfolders,
+                          workers=workers, ops_sink=journal.append if journal else None)
+    finally:
+        if journal is not None:
+            journal.close()
+    return report(len(items), nbytes, time.perf_counter() - t0, lat)
+
+
+def run_apply(tree: Path, workers: int) -> dict:
+    items   = cable.scan_items(tree, [])
+    t0      = time.perf_counter()
+    plan    = cable.plan_sort(tree, items)
+    planned = time.perf_counter() - t0
+    nbytes  = sum(op.item.size for op in plan.ops if not op.dup)
+    lat     = timed("_apply_one")
+    journal = cable.UndoJournal(tree)
+    t0 = time.perf_counter()
+    try:
+        cable.apply_plan(plan, workers=workers, ops_sink=journal.append)
+    finally:
+        journal.close()
+    out = report(len(lat), nbytes, time.perf_counter() - t0, lat)
+    out["plan_seconds"] = round(planned, 4)
+    return out
+
+
+def run_undo(tree: Path, workers: int) -> dict:
+    history = cable.UndoHistory(tree)
+    lat     = timed("_move_onto")
+    count = nbytes = 0
+    t0 = time.perf_counter()
+    for run, picked in history.select(None, None, None, None, None):
+        ops = [run.ops[i][:2] for i in picked]
+        restored, _ = cable._restore_ops(ops, workers)
+        history.forget(run, {picked[j] for j in restored})
+        count  += len(restored)
+        nbytes += sum(os.path.getsize(ops[j][0]) for j in restored)
+    return report(count, nbytes, time.perf_counter() - t0, lat)
+
+
+def run_watch(staging: Path, target: Path, workers: int, timeout: float = 120.0) -> dict:
+    from watchdog.observers import Observer
+
+    done: dict[str, float] = {}
+    inner = cable._sort_one
+
+    def sort_one(item, *args, **kwargs):
+        try:
+            return inner(item, *args, **kwargs)
+        finally:
+            done[item.name] = time.perf_counter()
+
+    cable._sort_one = sort_one
+    logging.basicConfig(level=logging.INFO, handlers=[logging.NullHandler()])   # the watcher's log lines
+    handler  = cable.SortingHandler(target, _Icon(), workers=workers)
+    observer = Observer()
+    observer.schedule(handler, str(target), recursive=False)
+    observer.start()
+    try:
+        arrived: dict[str, float] = {}
+        nbytes = 0
+        for path in sorted(staging.iterdir()):
+            nbytes += path.stat().st_size
+            os.rename(path, target / path.name)
+            arrived[path.name] = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        while len(done) < len(arrived) and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        observer.stop()
+        observer.join()
+        handler.close()
+    lat  = [done[name] - t for name, t in arrived.items() if name in done]
+    span = max(done.values(), default=0.0) - min(arrived.values(), default=0.0)
+    out  = report(len(lat), nbytes, span, lat)
+    out["missed"] = len(arrived) - len(lat)
+    return out
+
+
+def child(args: argparse.Namespace) -> None:
+    """One step in a fresh interpreter; the result goes to args.out as JSON."""
+    cable.install_tables(cable.CableTables(json.loads(json.dumps(cable._DEFAULT_CABLE_CONFIG))))
+    tree   = Path(args.tree)
+    target = Path(args.target) if args.target else None
+    action = args.child
+    if action == "generate":
+        out = synth.generate(tree, args.files, args.sizes, args.mix, args.collisions, args.duplicates,
+                             args.seed, dest_root=target, date_subfolders=args.date)
+    elif action in ("move", "copy", "date"):
+        out = run_sort(tree, action == "copy", action == "date", args.workers)
+    elif action == "apply":
+        out = run_apply(tree, args.workers)
+    elif action == "undo":
+        out = run_undo(tree, args.workers)
+    else:
+        assert target is not None
+        out = run_watch(tree, target, args.workers)
+    cable.flush_hash_cache()
+    cable.flush_capture_dates()
+    Path(args.out).write_text(json.dumps(out), encoding="utf-8")
+
+
+def spawn(args: argparse.Namespace, action: str, tree: Path, env: dict,
+          target: Optional[Path] = None, date: bool = False) -> dict:
+    out  = tree.parent / f"{tree.name}-{action}.json"
+    argv = [sys.executable, __file__, "--child", action, "--tree", str(tree), "--out", str(out),
+            "--files", str(args.files), "--sizes", args.sizes, "--mix", args.mix,
+            "--collisions", str(args.collisions), "--duplicates", str(args.duplicates),
+            "--seed", str(args.seed), "--workers", str(args.workers)]
+    if target is not None:
+        argv += ["--target", str(target)]
+    if date:
+        argv.append("--date")
+    subprocess.run(argv, env=env, check=True, stdin=subprocess.DEVNULL,
+                   stdout=subprocess.DEVNULL, stderr=None)
+    return json.loads(out.read_text(encoding="utf-8"))
+
+
+def scenario(args: argparse.Namespace, name: str, scratch: Path, env: dict) -> dict:
+    tree = scratch / name
+    if name == "watch":
+        if importlib.util.find_spec("watchdog") is None:
+            return {"skipped": "watchdog is not installed"}
+        target = scratch / "watched"
+        target.mkdir()
+        spawn(args, "generate", tree, env, target=target)
+        return spawn(args, "watch", tree, env, target=target)
+    spawn(args, "generate", tree, env, date=name == "date")
+    if name == "undo":
+        spawn(args, "move", tree, env)
+    return spawn(args, name, tree, env)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scenarios", default=",".join(SCENARIOS))
+    ap.add_argument("--files", type=int, default=2000)
+    ap.add_argument("--sizes", default="lognormal:16KB,1.5")
+    ap.add_argument("--mix", default=synth.DEFAULT_MIX)
+    ap.add_argument("--collisions", type=float, default=0.05)
+    ap.add_argument("--duplicates", type=float, default=0.05)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=4,
+                    help="worker threads (default 4; 1 would add the UI's per-file delay)")
+    ap.add_argument("--root", metavar="DIR", help="where to build the trees (default: system temp)")
+    ap.add_argument("--json", metavar="FILE", help="also write the results as JSON")
+    ap.add_argument("--child", choices=("generate",) + SCENARIOS, help=argparse.SUPPRESS)
+    ap.add_argument("--tree", help=argparse.SUPPRESS)
+    ap.add_argument("--target", help=argparse.SUPPRESS)
+    ap.add_argument("--out", help=argparse.SUPPRESS)
+    ap.add_argument("--date", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    params  = {k: getattr(args, k) for k in ("files", "sizes", "mix", "collisions", "duplicates",
+                                               "seed", "workers")}
+    results = {}
+    print(f"{'scenario':<8}  {'items':>7}  {'items/s':>10}  {'MB/s':>8}  {'p50 ms':>8}  {'p99 ms':>9}  {'RSS MB':>7}")
+    for name in (s.strip() for s in args.scenarios.split(",") if s.strip()):
+        if name not in SCENARIOS:
+            ap.error(f"unknown scenario {name!r}")
+        with tempfile.TemporaryDirectory(prefix="cable-bench-", dir=args.root) as tmp:
+            scratch = Path(tmp)
+            home    = scratch / "home"
+            home.mkdir()
+            env = {**os.environ, "HOME": str(home), "USERPROFILE": str(home)}
+            r = results[name] = scenario(args, name, scratch, env)
+        if "skipped" in r:
+            print(f"{name:<8}  skipped: {r['skipped']}")
+            continue
+        print(f"{name:<8}  {r['items']:>7}  {r['items_per_s']:>10,.0f}  {r['mb_per_s']:>8.1f}  "
+              f"{r['p50_ms']:>8.2f}  {r['p99_ms']:>9.2f}  {r['peak_rss_mb'] or '-':>7}")
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps({"python": sys.version.split()[0], "params": params, "results": results}, indent=2),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Startup benchmark: cold-start time of each cable.py entry point.
+
+    python benchmarks/bench_startup.py [--runs N] [--top K] [--json FILE]
+
+Runs every entry point in a fresh interpreter under ``python -X importtime``
+(after one warm-up run, so bytecode caches are in place) and reports the
+median wall time, the median time spent importing, how many modules got
+loaded and the heaviest top-level imports.  The daemon, --help and
+headless --sort rows should not list rich, tkinter, watchdog, pystray or
+PIL at all.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT  = Path(__file__).resolve().parent.parent
+CABLE = str(ROOT / "cable.py")
+HEAVY = ("rich", "tkinter", "watchdog", "pystray", "PIL", "sqlite3", "multiprocessing")
+
+
+def entry_points(scratch: str) -> dict[str, list[str]]:
+    empty = os.path.join(scratch, "empty")
+    os.makedirs(empty, exist_ok=True)
+    return {
+        "import":      ["-c", "import cable"],
+        "--help":      [CABLE, "--help"],
+        "--undo-list": [CABLE, "--undo-list", scratch],
+        "daemon":      [CABLE, "--run-watch-daemon", os.path.join(scratch, "missing")],
+        "--sort":      [CABLE, "--sort", empty, "--ndjson"],
+    }
+
+
+def run_once(args: list[str]) -> tuple[float, list[tuple[int, str, int]]]:
+    """Wall seconds and the (depth, module, cumulative us) rows of one cold start."""
+    t0   = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT,
+                          stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, text=True, encoding="utf-8", errors="replace")
+    wall = time.perf_counter() - t0
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if cumulative.strip().isdigit():    # skip the header row
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            rows.append((depth, name.strip(), int(cumulative)))
+    return wall, rows
+
+
+def bench(args: list[str], runs: int, top: int) -> dict:
+    run_once(args)  # warm-up: writes .pyc files, fills the OS cache
+    walls, imports, counts = [], [], []
+    rows: list[tuple[int, str, int]] = []
+    for _ in range(runs):
+        wall, rows = run_once(args)
+        walls.append(wall)
+        imports.append(sum(us for depth, _, us in rows if depth == 0) / 1e6)
+        counts.append(len(rows))
+    heaviest = sorted(((us, name) for depth, name, us in rows if depth == 0), reverse=True)[:top]
+    return {
+        "wall_ms":   round(statistics.median(walls) * 1000, 1),
+        "import_ms": round(statistics.median(imports) * 1000, 1),
+        "modules":   int(statistics.median(counts)),
+        "heavy":     sorted({name.split(".")[0] for _, name, _ in rows if name.split(".")[0] in HEAVY}),
+        "top":       [[name, round(us / 1000, 1)] for us, name in heaviest],
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=5)
+    ap.add_argument("--json", metavar="FILE", help="also write the results as JSON")
+    args = ap.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="cable-bench-") as scratch:
+        print(f"{'entry point':<12}  {'wall ms':>8}  {'import ms':>9}  {'modules':>7}  heaviest imports")
+        for name, argv in entry_points(scratch).items():
+            r = results[name] = bench(argv, args.runs, args.top)
+            heaviest = ", ".join(f"{mod} {ms:.1f}" for mod, ms in r["top"])
+            print(f"{name:<12}  {r['wall_ms']:>8.1f}  {r['import_ms']:>9.1f}  {r['modules']:>7}  {heaviest}")
+            if r["heavy"]:
+                print(f"{'':<12}  loads: {', '.join(r['heavy'])}")
+    if args.json:
+        Path(args.json).write_text(json.dumps({"python": sys.version.split()[0], "results": results}, indent=2),
+                                   encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Synthetic directory trees for the Cable benchmarks.
+
+    python benchmarks/synth.py DIR [--files N] [--sizes SPEC] [--mix SPEC]
+                                   [--collisions RATE] [--duplicates RATE] [--seed S]
+
+Writes N files straight into DIR.  Extensions are drawn from the categories
+in cable.json, weighted by --mix ("Images=30,Code=10,Misc=5"; Misc means an
+extension no category knows).  Sizes follow --sizes:
+
+    fixed:4KB               every file the same size
+    uniform:1KB-1MB         uniform between two sizes
+    lognormal:16KB,1.5      lognormal with the given median and sigma
+
+A --collisions fraction of the files get a different file of the same name
+already waiting at their sorted destination (so the sort has to pick a
+"name (1)" slot), and a --duplicates fraction get an identical copy there (so
+the sort skips them).  Modification times spread over the last three years.
+The same seed always gives the same tree.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import cable  # noqa: E402
+
+DEFAULT_MIX = "Images=30,Documents=15,Code=15,Notepads=10,Sound=10,Video=5,Archives=5,Misc=10"
+MISC_EXTS   = [".bin", ".dat", ".xyz", ""]
+_BLOCK      = 1 << 20
+
+
+def parse_sizes(spec: str):
+    """Turn a --sizes spec into a function rnd -> size in bytes."""
+    kind, _, arg = spec.partition(":")
+    if kind == "fixed":
+        size = cable._parse_size(arg)
+        return lambda rnd: size
+    if kind == "uniform":
+        lo, hi = (cable._parse_size(x) for x in arg.split("-", 1))
+        return lambda rnd: rnd.randint(lo, hi)
+    if kind == "lognormal":
+        median, _, sigma = arg.partition(",")
+        mu, s = math.log(max(1, cable._parse_size(median))), float(sigma or 1.5)
+        return lambda rnd: min(int(rnd.lognormvariate(mu, s)), 1 << 32)
+    raise ValueError(f"unknown size distribution: {spec!r}")
+
+
+def parse_mix(spec: str) -> list[tuple[list[str], float]]:
+    """Turn a --mix spec into [(extensions, weight)] using the current cable.json categories."""
+    cats = {k.split("  ")[-1].strip().lower(): d for k, d in cable.tables().categories.items()}
+    mix  = []
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        label, _, weight = part.partition("=")
+        label = label.strip().lower()
+        if label == "misc":
+            exts = MISC_EXTS
+        elif label in cats and cats[label]["extensions"]:
+            exts = cats[label]["extensions"]
+        else:
+            raise ValueError(f"no category with extensions called {label!r}")
+        mix.append((exts, float(weight or 1)))
+    return mix
+
+
+def _write(path: Path, size: int, seed: int, block: bytes) -> None:
+    """*size* bytes whose first 16 depend on *seed*, so files of equal size still differ."""
+    head = seed.to_bytes(16, "little")[:size]
+    with open(path, "wb") as fh:
+        fh.write(head)
+        left = size - len(head)
+        while left > 0:
+            n = min(left, len(block))
+            fh.write(block[:n])
+            left -= n
+
+
+def generate(
+    root:            Path,
+    files:           int   = 1000,
+    sizes:           str   = "lognormal:16KB,1.5",
+    mix:             str   = DEFAULT_MIX,
+    collisions:      float = 0.0,
+    duplicates:      float = 0.0,
+    seed:            int   = 1,
+    dest_root:       Optional[Path] = None,
+    date_subfolders: bool  = False,
+) -> dict:
+    """Write the tree and return a manifest: files, bytes, collisions, duplicates.
+
+    Collision and duplicate twins go where a "here" sort of *dest_root*
+    (default *root*) would put the file; pass *date_subfolders* to match a
+    sort that uses them.
+    """
+    rnd       = random.Random(seed)
+    size_of   = parse_sizes(sizes)
+    ext_sets  = parse_mix(mix)
+    weights   = [w for _, w in ext_sets]
+    block     = rnd.randbytes(_BLOCK)
+    dest_root = dest_root or root
+    now       = time.time()
+    root.mkdir(parents=True, exist_ok=True)
+
+    manifest = {"files": files, "bytes": 0, "collisions": 0, "duplicates": 0}
+    for i in range(files):
+        exts = rnd.choices(ext_sets, weights)[0][0]
+        name = f"file{i:07d}{rnd.choice(exts)}"
+        size = size_of(rnd)
+        path = root / name
+        _write(path, size, i, block)
+        mtime = now - rnd.uniform(0, 3 * 365 * 86400)
+        os.utime(path, (mtime, mtime))
+        manifest["bytes"] += size
+
+        roll = rnd.random()
+        if roll < collisions + duplicates:
+            item = cable.ItemRecord.from_path(path)
+            cat  = cable.classify(item)
+            dest = cable._dest_dir_for(item, dest_root, cable.cat_meta(cat), cat, date_subfolders)
+            dest.mkdir(parents=True, exist_ok=True)
+            if roll < collisions:
+                _write(dest / name, size, files + i, block)
+                manifest["collisions"] += 1
+            else:
+                _write(dest / name, size, i, block)
+                os.utime(dest / name, (mtime, mtime))
+                manifest["duplicates"] += 1
+    return manifest
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("dir", type=Path)
+    ap.add_argument("--files", type=int, default=1000)
+    ap.add_argument("--sizes", default="lognormal:16KB,1.5")
+    ap.add_argument("--mix", default=DEFAULT_MIX)
+    ap.add_argument("--collisions", type=float, default=0.0)
+    ap.add_argument("--duplicates", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+    m = generate(args.dir, args.files, args.sizes, args.mix, args.collisions, args.duplicates, args.seed)
+    print(f"{m['files']} files, {m['bytes'] / 1e6:.1f} MB, "
+          f"{m['collisions']} collisions, {m['duplicates']} duplicates -> {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,59 +7,41 @@ Cable v2.0 — By 0.6 :3
 import os
 import sys
 import shutil
-import tkinter as tk
 import argparse
+import bisect
+import errno
 import fnmatch
 import hashlib
+import heapq
+import importlib.util
+import itertools
 import json
+import queue
+import re
+import stat
+import struct
 import subprocess
-from tkinter import filedialog
-from pathlib import Path
-from typing import Optional
+import tempfile
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from pathlib import Path, PurePath
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional
 from datetime import datetime
 import logging
 import threading
 
-# Force UTF-8 encoding for Windows terminals and compiled executables
-if sys.stdout and sys.stdout.encoding and sys.stdout.encoding.lower() != 'utf-8':
-    try:
-        sys.stdout.reconfigure(encoding='utf-8')  # type: ignore[attr-defined]
-        if sys.stderr:
-            sys.stderr.reconfigure(encoding='utf-8')  # type: ignore[attr-defined]
-    except AttributeError:
-        import io
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-        if sys.stderr:
-            sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
-
-try:
-    from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler
-    import pystray
-    from PIL import Image, ImageDraw
-except ImportError:
-    Observer = None  # type: ignore[assignment,misc]
-    FileSystemEventHandler = object  # type: ignore[assignment,misc]
-
-try:  # type: ignore[import]
-    from rich.console import Console, Group
+# Rich, tkinter, watchdog, pystray and PIL are imported where they are used,
+# so importing this module (the watcher daemon, --undo, embedding) stays cheap
+if TYPE_CHECKING:
+    from rich.console import Console
     from rich.panel import Panel
     from rich.table import Table
-    from rich.progress import (
-        Progress, SpinnerColumn, BarColumn,
-        TextColumn, TaskProgressColumn, TimeElapsedColumn,
-    )
-    from rich.prompt import Confirm, Prompt
-    from rich.text import Text
-    from rich.rule import Rule
-    from rich import box
-    from rich.align import Align
-    from rich.padding import Padding
-    from rich.columns import Columns
-    import time
-except ImportError:
-    print("[ERROR] Missing 'rich' library.  Run: pip install rich")
-    sys.exit(1)
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
 
 try:
     import tomllib  # type: ignore[import]
@@ -69,7 +51,50 @@ except ModuleNotFoundError:
     except ModuleNotFoundError:
         tomllib = None  # type: ignore[assignment]
 
-console = Console(highlight=False)
+
+def _force_utf8_stdio() -> None:
+    """Force UTF-8 encoding for Windows terminals and compiled executables."""
+    if sys.stdout and sys.stdout.encoding and sys.stdout.encoding.lower() != 'utf-8':
+        try:
+            sys.stdout.reconfigure(encoding='utf-8')  # type: ignore[attr-defined]
+            if sys.stderr:
+                sys.stderr.reconfigure(encoding='utf-8')  # type: ignore[attr-defined]
+        except AttributeError:
+            import io
+            sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+            if sys.stderr:
+                sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+
+class _LazyConsole:
+    """The shared Rich console, created (and Rich imported) on first use.
+
+    Attribute access is forwarded; pass .real where Rich wants the Console
+    object itself (Progress, Prompt).
+    """
+
+    __slots__ = ("_real",)
+
+    def __init__(self) -> None:
+        self._real: Optional["Console"] = None
+
+    @property
+    def real(self) -> "Console":
+        if self._real is None:
+            from rich.console import Console
+            self._real = Console(highlight=False)
+        return self._real
+
+    def __getattr__(self, name: str):
+        return getattr(self.real, name)
+
+
+console = _LazyConsole()
+
+
+def _watcher_available() -> bool:
+    """True when the watcher's optional dependencies are installed (without importing them)."""
+    return all(importlib.util.find_spec(name) is not None for name in ("watchdog", "pystray", "PIL"))
 
 C_ACCENT   = "bold #a78bfa"
 C_ACCENT2  = "bold #60a5fa"
@@ -110,6 +135,7 @@ _DEFAULT_CABLE_CONFIG: dict = {
         "\U0001f3ac  Video",
         "\U0001f50a  Sound",
     ],
+    "rules": [],
     "categories": [
         {
             "key":        "\U0001f4c1  Folders",
@@ -210,8 +236,13 @@ def _write_default_cable_json() -> None:
         pass
 
 
-def load_cable_config() -> dict:
-    """Load cable.json.  Creates it with defaults if absent or unreadable."""
+def load_cable_config(strict: bool = False) -> dict:
+    """Load cable.json.  Creates it with defaults if absent or unreadable.
+
+    With *strict*, a present but unparsable file raises instead of silently
+    falling back to the defaults (used by hot reload to keep the last good
+    tables while the file is mid-edit).
+    """
     if not CABLE_JSON_PATH.exists():
         _write_default_cable_json()
         return json.loads(json.dumps(_DEFAULT_CABLE_CONFIG))  # deep copy
@@ -221,52 +252,373 @@ def load_cable_config() -> dict:
         merged: dict = json.loads(json.dumps(_DEFAULT_CABLE_CONFIG))
         if isinstance(raw.get("session"), dict):
             merged["session"].update(raw["session"])
-        for key in ("defaults_map", "defaults_fallback", "date_media_cats", "categories"):
+        for key in ("defaults_map", "defaults_fallback", "date_media_cats", "categories", "rules"):
             if key in raw:
                 merged[key] = raw[key]
         return merged
     except Exception:
+        if strict:
+            raise
         return json.loads(json.dumps(_DEFAULT_CABLE_CONFIG))
 
 
-_CABLE_CFG = load_cable_config()
+def _expand(p: str) -> Path:
+    """Expand ~ and env-vars, return a Path."""
+    return Path(os.path.expandvars(os.path.expanduser(p)))
+
+
+MISC_KEY    = "❓  Misc"
+MISC_FOLDER = "Miscellaneous"
 
-CATEGORIES: dict[str, dict] = {
-    entry["key"]: {
-        "folder":     entry.get("folder", entry["key"]),
-        "icon":       entry.get("icon", "📄"),
-        "color":      entry.get("color", "#9ca3af"),
-        "extensions": [e.lower() for e in entry.get("extensions", [])],
-    }
-    for entry in _CABLE_CFG.get("categories", [])
-}
+_SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
 
-# flat ext → category key
-EXT_MAP: dict[str, str] = {}
-for _cat, _data in CATEGORIES.items():
-    for _ext in _data["extensions"]:
-        EXT_MAP.setdefault(_ext, _cat)
 
-MISC_KEY        = "❓  Misc"
-SKIP_ROOT       = set(str(d["folder"]).split("/")[0] for d in CATEGORIES.values() if d["folder"])
-DATE_MEDIA_CATS = set(_CABLE_CFG.get("date_media_cats", []))
+def _parse_size(value) -> int:
+    """Bytes from an int or a string like "500", "10MB", "1.5 GB"."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    m = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?B?)\s*", str(value), re.IGNORECASE)
+    if not m:
+        raise ValueError(f"bad size: {value!r}")
+    unit = m.group(2).upper()
+    return int(float(m.group(1)) * _SIZE_UNITS[unit if unit in _SIZE_UNITS else unit + "B"])
+
+
+def _glob_regex(pattern: str, component: bool = False) -> str:
+    """Case-insensitive regex source for a glob.  *component* globs never cross a path separator."""
+    out = []
+    for ch in pattern:
+        if ch == "*":
+            out.append(r"[^\\/]*" if component else ".*")
+        elif ch == "?":
+            out.append(r"[^\\/]" if component else ".")
+        else:
+            out.append(re.escape(ch))
+    return "(?si:" + "".join(out) + ")"
+
+
+_REGEX_META = set(".^$*+?{}[]\\|()")
+
+
+def _literal_shape(glob: str) -> Optional[tuple[str, str]]:
+    """("exact" | "prefix" | "suffix", lowercased literal) for globs that need no regex."""
+    if "?" in glob:
+        return None
+    stars = glob.count("*")
+    if stars == 0:
+        return "exact", glob.lower()
+    if stars == 1 and glob.endswith("*"):
+        return "prefix", glob[:-1].lower()
+    if stars == 1 and glob.startswith("*"):
+        return "suffix", glob[1:].lower()
+    return None
+
+
+def _anchored_prefix(regex: str) -> str:
+    """The literal text an ^-anchored regex must start with ("" if none can be read off)."""
+    if not regex.startswith("^") or "|" in regex:
+        return ""
+    out = []
+    for ch in regex[1:]:
+        if ch in _REGEX_META:
+            # a quantifier applies to the previous char, which is then optional
+            if ch in "*?{" and out:
+                out.pop()
+            break
+        out.append(ch)
+    return "".join(out)
+
+
+class _Rule:
+    """One compiled entry of cable.json["rules"]; only its name check can run per item."""
+    __slots__ = ("index", "category", "exts", "size", "age", "globs", "regex", "glob_res", "name_re",
+                 "folder_re")
+
+    def __init__(self, index: int, raw: dict, categories: dict) -> None:
+        cat = raw["category"]
+        if cat not in categories:   # allow the plain label ("Images") as well as the key
+            cat = next((k for k in categories if k.split("  ")[-1].strip() == cat), cat)
+        if cat not in categories and cat != MISC_KEY:
+            raise ValueError(f"unknown category {raw['category']!r}")
+        self.index    = index
+        self.category = cat
+        exts          = raw.get("ext", raw.get("extensions"))
+        if isinstance(exts, str):
+            exts = [exts]
+        self.exts = {e.lower() if e.startswith(".") else "." + e.lower() for e in exts} if exts else None
+
+        lo = _parse_size(raw["min_size"]) if "min_size" in raw else None
+        hi = _parse_size(raw["max_size"]) if "max_size" in raw else None
+        self.size = (lo, hi) if lo is not None or hi is not None else None
+        # ages in seconds: older_than_days is a lower bound, newer_than_days an upper bound
+        lo = float(raw["older_than_days"]) * 86400 if "older_than_days" in raw else None
+        hi = float(raw["newer_than_days"]) * 86400 if "newer_than_days" in raw else None
+        self.age = (lo, hi) if lo is not None or hi is not None else None
+
+        globs          = raw.get("glob")
+        self.globs     = [globs] if isinstance(globs, str) else list(globs or [])
+        self.regex     = raw.get("regex") or None
+        self.glob_res  = [re.compile(_glob_regex(g) + r"\Z") for g in self.globs]
+        self.name_re   = re.compile(self.regex) if self.regex else None
+
+        folders = raw.get("in_folder")
+        folders = [folders] if isinstance(folders, str) else folders or []
+        self.folder_re = re.compile(
+            r"(?:^|[\\/])(?:" + "|".join(_glob_regex(f, component=True) for f in folders) + r")(?=[\\/]|$)"
+        ) if folders else None
+
+    @property
+    def has_name(self) -> bool:
+        return bool(self.globs) or self.regex is not None
+
+    def name_matches(self, name: str) -> bool:
+        """Any glob matches the whole name, or the regex matches somewhere in it."""
+        return (any(g.match(name) for g in self.glob_res)
+                or (self.name_re is not None and self.name_re.search(name) is not None))
+
+
+def _threshold_masks(rules: list[_Rule], attr: str) -> tuple[list[float], list[int]]:
+    """Sorted bounds and, per interval between them, the bitmask of rules it satisfies."""
+    bounds = sorted({b for r in rules if getattr(r, attr) for b in getattr(r, attr) if b is not None})
+    masks  = []
+    for j in range(len(bounds) + 1):
+        v    = bounds[j - 1] if j else float("-inf")   # every value in the interval behaves like its low end
+        mask = 0
+        for r in rules:
+            rng = getattr(r, attr)
+            if rng is None or ((rng[0] is None or v >= rng[0]) and (rng[1] is None or v < rng[1])):
+                mask |= 1 << r.index
+        masks.append(mask)
+    return bounds, masks
+
+
+class _LiteralIndex:
+    """Rule masks keyed by a literal name prefix or suffix, one dict per literal length."""
+    __slots__ = ("by_len", "suffix")
+
+    def __init__(self, suffix: bool = False) -> None:
+        self.by_len: dict[int, dict[str, int]] = {}
+        self.suffix = suffix
+
+    def add(self, literal: str, bit: int) -> None:
+        table = self.by_len.setdefault(len(literal), {})
+        table[literal] = table.get(literal, 0) | bit
+
+    def lookup(self, name: str) -> int:
+        mask = 0
+        n    = len(name)
+        for length, table in self.by_len.items():
+            if length <= n:
+                hit = table.get(name[n - length:] if self.suffix else name[:length])
+                if hit:
+                    mask |= hit
+        return mask
+
+
+class RuleSet:
+    """cable.json["rules"] compiled into one decision structure.
+
+    Rules are tried in file order and the first whose conditions all hold
+    wins.  Every axis is folded into bitmasks over the rule list, so one
+    item costs about the same with ten rules or five hundred: a dict lookup
+    for the extension, a bisect over the sorted size and age thresholds, a
+    per-directory cache for folder conditions, and for names a few dict
+    lookups (exact, PREFIX* and *SUFFIX globs, ^literal regex prefixes) plus
+    one combined regex for whatever patterns are left.  Only candidates the
+    indexes cannot settle, lowest first, get their own name check.
+    """
+
+    def __init__(self, raw_rules: list[dict], categories: dict) -> None:
+        self.rules:  list[_Rule] = []
+        self.errors: list[str]   = []
+        for raw in raw_rules:
+            try:
+                self.rules.append(_Rule(len(self.rules), raw, categories))
+            except (KeyError, TypeError, ValueError, re.error) as exc:
+                self.errors.append(f"rule {raw!r}: {exc}")
+
+        self.any_ext = 0
+        self.ext_masks: dict[str, int] = {}
+        for r in self.rules:
+            if r.exts is None:
+                self.any_ext |= 1 << r.index
+        for r in self.rules:
+            for e in r.exts or ():
+                self.ext_masks[e] = self.ext_masks.get(e, self.any_ext) | 1 << r.index
+
+        self.size_bounds, self.size_masks = _threshold_masks(self.rules, "size")
+        self.age_bounds,  self.age_masks  = _threshold_masks(self.rules, "age")
+
+        # Name conditions.  "sure" indexes prove a match outright; "maybe"
+        # indexes and the combined regex only nominate rules for a full check.
+        self.no_name = 0
+        self.exact: dict[str, int] = {}
+        self.prefix = _LiteralIndex()
+        self.suffix = _LiteralIndex(suffix=True)
+        self.rx_prefix = _LiteralIndex()
+        self.rx_prefix_rules = 0
+        residue: list[tuple[str, int]] = []
+        for r in self.rules:
+            bit = 1 << r.index
+            if not r.has_name:
+                self.no_name |= bit
+                continue
+            for g in r.globs:
+                shape = _literal_shape(g)
+                if shape is None:
+                    residue.append((rf"^{_glob_regex(g)}\Z", bit))
+                elif shape[0] == "exact":
+                    self.exact[shape[1]] = self.exact.get(shape[1], 0) | bit
+                else:
+                    (self.prefix if shape[0] == "prefix" else self.suffix).add(shape[1], bit)
+            if r.regex is not None:
+                lit = _anchored_prefix(r.regex)
+                if lit:
+                    self.rx_prefix.add(lit, bit)
+                    self.rx_prefix_rules |= bit
+                else:
+                    residue.append((r.regex, bit))
+        # Backreferences would change meaning inside the combined pattern, so
+        # those rules are always nominated instead.
+        safe = [(p, bit) for p, bit in residue if not re.search(r"\\\d|\(\?P=", p)]
+        self.residue_rules = sum({bit for _, bit in safe})
+        self.always_maybe  = sum({bit for _, bit in residue}) & ~self.residue_rules
+        try:
+            self.residue_re: Optional[re.Pattern] = (
+                re.compile("|".join(f"(?:{p})" for p, _ in safe)) if safe else None
+            )
+        except re.error:
+            self.residue_re    = None
+            self.always_maybe |= self.residue_rules
+            self.residue_rules = 0
+
+        # Folder conditions depend only on the parent directory, which items
+        # share, so they are resolved once per directory into a cached mask.
+        self._folder_rules = [r for r in self.rules if r.folder_re is not None]
+        self._no_folder    = sum(1 << r.index for r in self.rules if r.folder_re is None)
+        self._folder_masks: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, item: "ItemRecord") -> Optional[str]:
+        mask = self.ext_masks.get(item.suffix, self.any_ext)
+        if mask and self.size_bounds:
+            mask &= self.size_masks[bisect.bisect_right(self.size_bounds, item.size)]
+        if mask and self.age_bounds:
+            mask &= self.age_masks[bisect.bisect_right(self.age_bounds, time.time() - item.mtime)]
+        if mask and self._folder_rules:
+            mask &= self._folder_mask(str(item.path.parent))
+        if not mask:
+            return None
+
+        sure = self.no_name
+        if mask & ~sure:
+            name  = item.name
+            lname = name.lower()
+            sure |= self.exact.get(lname, 0) | self.prefix.lookup(lname) | self.suffix.lookup(lname)
+            maybe = self.always_maybe
+            if self.rx_prefix_rules:
+                maybe |= self.rx_prefix.lookup(name)
+            if self.residue_re is not None and self.residue_re.search(name):
+                maybe |= self.residue_rules
+            mask &= sure | maybe
+        while mask:
+            low  = mask & -mask
+            rule = self.rules[low.bit_length() - 1]
+            if low & sure or rule.name_matches(item.name):
+                return rule.category
+            mask ^= low
+        return None
+
+    def _folder_mask(self, parent: str) -> int:
+        mask = self._folder_masks.get(parent)
+        if mask is None:
+            mask = self._no_folder
+            for r in self._folder_rules:
+                if r.folder_re.search(parent):  # type: ignore[union-attr]
+                    mask |= 1 << r.index
+            if len(self._folder_masks) >= 4096:
+                self._folder_masks.clear()
+            self._folder_masks[parent] = mask
+        return mask
+
+
+class CableTables:
+    """Everything compiled from one cable.json load.
+
+    Readers grab the current instance once via tables() and use it for the
+    whole item, so a hot reload (which swaps the instance with a single
+    assignment) can never mix categories from one version with extensions
+    from another.
+    """
+    __slots__ = ("categories", "ext_map", "rules", "rule_errors", "skip_root", "date_media_cats",
+                 "defaults_map", "defaults_fallback", "session")
+
+    def __init__(self, raw: dict) -> None:
+        self.categories: dict[str, dict] = {
+            entry["key"]: {
+                "folder":     entry.get("folder", entry["key"]),
+                "icon":       entry.get("icon", "📄"),
+                "color":      entry.get("color", "#9ca3af"),
+                "extensions": [e.lower() for e in entry.get("extensions", [])],
+            }
+            for entry in raw.get("categories", [])
+        }
+
+        # flat ext → category key
+        self.ext_map: dict[str, str] = {}
+        for cat, data in self.categories.items():
+            for ext in data["extensions"]:
+                self.ext_map.setdefault(ext, cat)
+
+        # rules, when there are any, are consulted before the extension map
+        rules            = RuleSet(raw.get("rules") or [], self.categories)
+        self.rules       = rules if len(rules) else None
+        self.rule_errors = rules.errors
+
+        self.skip_root = set(str(d["folder"]).split("/")[0] for d in self.categories.values() if d["folder"])
+        self.skip_root.add(MISC_FOLDER)
+        self.date_media_cats = set(raw.get("date_media_cats", []))
+        self.defaults_map: dict[str, Path] = {
+            k: _expand(v)
+            for k, v in raw.get("defaults_map", {}).items()
+        }
+        self.defaults_fallback = _expand(str(raw.get("defaults_fallback", "~/Downloads")))
+
+        # Session defaults come from cable.json["session"]
+        self.session: dict = dict(raw.get("session", _DEFAULT_CABLE_CONFIG["session"]))
+
+
+_TABLES: Optional[CableTables] = None
+_tables_lock = threading.Lock()
+
+
+def tables() -> CableTables:
+    """The classification tables currently in force.
+
+    cable.json is read (and written with defaults if missing) on the first
+    call, not at import, so importing this module touches no files.
+    """
+    current = _TABLES
+    if current is None:
+        with _tables_lock:
+            if _TABLES is None:
+                install_tables(CableTables(load_cable_config()))
+            current = _TABLES
+    return current  # type: ignore[return-value]
 
-CONFIG_PATH = Path.home() / ".sortconfig.toml"
 
-# Session defaults come from cable.json["session"]
-_CFG_DEFAULTS: dict = dict(_CABLE_CFG.get("session", {
-    "run_mode":         "1",
-    "sort_mode":        "alpha",
-    "copy_mode":        False,
-    "date_subfolders":  False,
-    "dest_mode":        "here",
-    "dest_custom":      "",
-    "exclude_patterns": ["desktop.ini", "*.tmp", "Thumbs.db"],
-}))
+def install_tables(new: CableTables) -> None:
+    global _TABLES
+    _TABLES = new
+
+
+CONFIG_PATH = Path.home() / ".sortconfig.toml"
 
 
 def load_config() -> dict:
-    cfg: dict = dict(_CFG_DEFAULTS)
+    cfg: dict = dict(tables().session)
     if tomllib is None or not CONFIG_PATH.exists():
         return cfg
     try:
@@ -278,6 +630,74 @@ def load_config() -> dict:
     return cfg
 
 
+class ConfigStore:
+    """Session config and tables kept in memory, reloaded only when their files change.
+
+    poll() stats cable.json and ~/.sortconfig.toml; if cable.json moved it is
+    re-parsed and recompiled and the new CableTables swapped in, then the
+    merged session config is rebuilt with *overrides* on top.  start() runs
+    poll() on a background thread, so readers of .cfg and tables() never
+    touch the disk themselves.
+    """
+
+    def __init__(self, overrides: Optional[dict] = None) -> None:
+        self._overrides = dict(overrides or {})
+        self._stamps    = self._stat()
+        self._stop      = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.cfg: dict  = self._build()
+
+    @staticmethod
+    def _stat() -> tuple:
+        stamps = []
+        for path in (CABLE_JSON_PATH, CONFIG_PATH):
+            try:
+                st = path.stat()
+                stamps.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def _build(self) -> dict:
+        cfg = load_config()
+        cfg.update(self._overrides)
+        return cfg
+
+    def poll(self) -> bool:
+        """Reload whatever changed since the last poll.  Returns True on reload."""
+        stamps = self._stat()
+        if stamps == self._stamps:
+            return False
+        if stamps[0] != self._stamps[0]:
+            try:
+                new = CableTables(load_cable_config(strict=True))
+                install_tables(new)
+                for err in new.rule_errors:
+                    logging.warning(f"[CFG]  Skipped {err}")
+            except Exception as e:
+                logging.warning(f"[CFG]  cable.json not reloaded, keeping previous rules: {e}")
+        self._stamps = stamps
+        self.cfg = self._build()
+        return True
+
+    def start(self, interval: float = 2.0) -> None:
+        def loop() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    if self.poll():
+                        logging.info("[CFG]  Configuration reloaded")
+                except Exception as e:
+                    logging.error(f"[CFG]  Reload failed: {e}")
+
+        self._thread = threading.Thread(target=loop, name="cable-config", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
 def save_config(cfg: dict) -> None:
     excludes = "[" + ", ".join(f'"{x}"' for x in cfg["exclude_patterns"]) + "]"
     lines = [
@@ -307,6 +727,8 @@ GRADIENT = ["#a78bfa", "#818cf8", "#60a5fa", "#38bdf8", "#60a5fa", "#818cf8", "#
 
 
 def print_banner() -> None:
+    from rich.align import Align
+    from rich.text import Text
     console.print()
     for i, line in enumerate(BANNER_LINES):
         color = GRADIENT[i % len(GRADIENT)]
@@ -317,15 +739,19 @@ def print_banner() -> None:
     console.print()
 
 def step_header(n: int, label: str) -> None:
+    from rich.rule import Rule
     badge = f"[reverse bold #a78bfa] {n} [/]"
     console.print()
     console.print(Rule(f"{badge} [bold #c4b5fd]{label}[/]", style="#4c1d95"))
     console.print()
 
 def print_legend() -> None:
+    from rich.columns import Columns
+    from rich.panel import Panel
+    from rich.text import Text
     items = [
         Text(f"{d['icon']} {k.split('  ')[-1]:<14}", style=f"{d['color']}")
-        for k, d in CATEGORIES.items()
+        for k, d in tables().categories.items()
     ]
     items.append(Text("❓ Misc", style="dim"))
     console.print(
@@ -338,6 +764,8 @@ def print_legend() -> None:
     )
 
 def pick_folder(title: str = "Select a folder to sort") -> Optional[Path]:
+    import tkinter as tk
+    from tkinter import filedialog
     root = tk.Tk()
     root.withdraw()
     root.attributes("-topmost", True)
@@ -345,21 +773,10 @@ def pick_folder(title: str = "Select a folder to sort") -> Optional[Path]:
     root.destroy()
     return Path(folder) if folder else None
 
-def _expand(p: str) -> Path:
-    """Expand ~ and env-vars, return a Path."""
-    return Path(os.path.expandvars(os.path.expanduser(p)))
-
-
-_DEFAULTS_MAP: dict[str, Path] = {
-    k: _expand(v)
-    for k, v in _CABLE_CFG.get("defaults_map", {}).items()
-}
-_DEFAULTS_FALLBACK = _expand(str(_CABLE_CFG.get("defaults_fallback", "~/Downloads")))
-
-
 def get_default_dest(cat: str) -> Path:
     """Return the Windows known-folder for a category key."""
-    return _DEFAULTS_MAP.get(cat, _DEFAULTS_FALLBACK)
+    t = tables()
+    return t.defaults_map.get(cat, t.defaults_fallback)
 
 def pick_destination(
     source_folder: Path,
@@ -372,6 +789,8 @@ def pick_destination(
       None  → 'here' or 'defaults'  (handled at call-site)
       Path  → chosen directory for 'where'
     """
+    from rich.panel import Panel
+    from rich.prompt import Confirm, Prompt
     default_key = {"here": "1", "defaults": "2", "where": "3"}.get(default_mode, "1")
 
     here_note     = f"[{C_DIM}](subfolders inside [bold]{source_folder.name}[/])[/]"
@@ -392,7 +811,7 @@ def pick_destination(
         raw = Prompt.ask(
             "  [bold #c4b5fd]Choose destination[/]",
             default=default_key,
-            console=console,
+            console=console.real,
         ).strip()
 
         if raw == "1":
@@ -425,7 +844,7 @@ def pick_destination(
                 retry = Confirm.ask(
                     f"  [{C_WARN}]No folder selected. Try again?[/]",
                     default=True,
-                    console=console,
+                    console=console.real,
                 )
                 if not retry:
                     console.print(f"  [{C_DIM}]Falling back to [bold]Here[/].[/]\n")
@@ -435,6 +854,8 @@ def pick_destination(
 
 def pick_run_mode(default: str = "1") -> str:
     """Ask the user if they want a one-time sort or a continuous background watcher."""
+    from rich.panel import Panel
+    from rich.prompt import Prompt
     console.print(Panel(
         f"  [{C_ACCENT}]1[/]  [#f9fafb]One-Time Sort[/]      [dim](Sort files now and exit)[/]\n"
         f"  [{C_ACCENT}]2[/]  [#f9fafb]Background Watcher[/] [dim](Run silently in system tray, auto-sorting new files)[/]",
@@ -447,7 +868,7 @@ def pick_run_mode(default: str = "1") -> str:
         raw = Prompt.ask(
             "  [bold #c4b5fd]Choose mode[/]",
             default=default,
-            console=console,
+            console=console.real,
         ).strip()
         if raw in ("1", "2"):
             label = "One-Time Sort" if raw == "1" else "Background Watcher"
@@ -470,6 +891,8 @@ SORT_OPTIONS = [
 
 def pick_sort_order(default: str = "alpha") -> str:
     """Ask the user how to order files within each category before moving."""
+    from rich.panel import Panel
+    from rich.prompt import Prompt
     code_to_key = {code: key for key, _, code in SORT_OPTIONS}
     default_key = code_to_key.get(default, "1")
     console.print(Panel(
@@ -488,7 +911,7 @@ def pick_sort_order(default: str = "alpha") -> str:
         raw = Prompt.ask(
             "  [bold #c4b5fd]Choose sort order[/]",
             default=default_key,
-            console=console,
+            console=console.real,
         ).strip()
         if raw in valid:
             code = valid[raw]
@@ -502,11 +925,13 @@ def pick_sort_order(default: str = "alpha") -> str:
 
 def pick_options(cfg: dict) -> dict:
     """Interactive step to configure copy mode, date subfolders, and exclude patterns."""
+    from rich.panel import Panel
+    from rich.prompt import Confirm, Prompt
     # Copy mode
     copy_mode = Confirm.ask(
         "  [bold #c4b5fd]Copy files instead of moving?[/]",
         default=bool(cfg["copy_mode"]),
-        console=console,
+        console=console.real,
     )
     console.print()
 
@@ -514,7 +939,7 @@ def pick_options(cfg: dict) -> dict:
     date_subfolders = Confirm.ask(
         "  [bold #c4b5fd]Organise media into YYYY/MM subfolders?[/]",
         default=bool(cfg["date_subfolders"]),
-        console=console,
+        console=console.real,
     )
     console.print()
 
@@ -534,7 +959,7 @@ def pick_options(cfg: dict) -> dict:
     edit = Confirm.ask(
         "  [bold #c4b5fd]Edit exclude patterns?[/]",
         default=False,
-        console=console,
+        console=console.real,
     )
     if edit:
         console.print(f"  [{C_DIM}]Enter patterns separated by commas (e.g. *.tmp, desktop.ini).[/]")
@@ -542,7 +967,7 @@ def pick_options(cfg: dict) -> dict:
         raw = Prompt.ask(
             "  [bold #c4b5fd]Patterns[/]",
             default=",".join(current) if current else "",
-            console=console,
+            console=console.real,
         )
         current = [p.strip() for p in raw.split(",") if p.strip()]
     console.print()
@@ -554,58 +979,577 @@ def pick_options(cfg: dict) -> dict:
         "exclude_patterns": current,
     }
 
-def apply_excludes(items: list[Path], patterns: list[str]) -> list[Path]:
+class ItemRecord:
+    """One directory entry, stat()ed exactly once during the scan.
+
+    Every later stage (ordering, preview, classification, destination and
+    the move itself) reads from here instead of touching the filesystem.
+    """
+    __slots__ = ("path", "name", "suffix", "is_dir", "size", "mtime", "mtime_ns", "inode", "dev")
+
+    def __init__(
+        self,
+        path:     Path,
+        is_dir:   bool,
+        size:     int,
+        mtime_ns: int,
+        inode:    int = 0,
+        dev:      int = 0,
+    ) -> None:
+        self.path     = path
+        self.name     = path.name
+        self.suffix   = path.suffix.lower()
+        self.is_dir   = is_dir
+        self.size     = size
+        self.mtime    = mtime_ns / 1e9
+        self.mtime_ns = mtime_ns
+        self.inode    = inode
+        self.dev      = dev
+
+    @classmethod
+    def from_stat(cls, path: Path, st: os.stat_result) -> "ItemRecord":
+        return cls(path, stat.S_ISDIR(st.st_mode), st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)
+
+    @classmethod
+    def from_entry(cls, entry: os.DirEntry) -> "ItemRecord":
+        try:
+            is_dir = entry.is_dir()
+            st     = entry.stat()
+            return cls(Path(entry.path), is_dir, st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)
+        except OSError:
+            return cls(Path(entry.path), False, 0, 0)
+
+    @classmethod
+    def from_path(cls, path: Path) -> "ItemRecord":
+        """Single stat() for callers that only have a path (the watcher).  Raises OSError."""
+        return cls.from_stat(path, path.stat())
+
+    def cache_key(self) -> Optional[tuple[int, int, int, int]]:
+        """(dev, inode, size, mtime_ns), or None where scandir gives no inode (Windows)."""
+        if not self.inode:
+            return None
+        return (self.dev, self.inode, self.size, self.mtime_ns)
+
+    def __repr__(self) -> str:
+        return f"ItemRecord({self.name!r}, dir={self.is_dir}, size={self.size})"
+
+
+def _is_excluded(name: str, patterns: list[str]) -> bool:
+    return any(fnmatch.fnmatch(name, p) for p in patterns)
+
+
+def apply_excludes(items: list, patterns: list[str]) -> list:
     if not patterns:
         return items
-    return [
-        item for item in items
-        if not any(fnmatch.fnmatch(item.name, p) for p in patterns)
-    ]
+    return [item for item in items if not _is_excluded(item.name, patterns)]
+
+
+def iter_items(target: Path, patterns: list[str]) -> Iterator[ItemRecord]:
+    """Yield *target*'s entries from one os.scandir pass; skip Cable's own files and excludes."""
+    skip_root = tables().skip_root
+    with os.scandir(target) as it:
+        for entry in it:
+            name = entry.name
+            if name in skip_root or name.startswith(".") or name == "sort_log.json":
+                continue
+            if patterns and _is_excluded(name, patterns):
+                continue
+            yield ItemRecord.from_entry(entry)
+
+
+def scan_items(target: Path, patterns: list[str]) -> list[ItemRecord]:
+    """List *target* with one os.scandir pass; skip Cable's own files and excludes."""
+    return list(iter_items(target, patterns))
+
+
+def _record_state(r: ItemRecord) -> tuple:
+    return (str(r.path), r.is_dir, r.size, r.mtime_ns, r.inode, r.dev)
+
+
+def _record_from_state(state: tuple) -> ItemRecord:
+    return ItemRecord(Path(state[0]), *state[1:])
+
+
+def external_sorted(
+    items:    Iterable[ItemRecord],
+    key,
+    run_size: int = 100_000,
+) -> tuple[int, Iterator[ItemRecord]]:
+    """Sort a stream of records in bounded memory.
+
+    Records are sorted in runs of *run_size*; once there is more than one
+    run each is spilled to a temp file and the runs are merged lazily with
+    heapq.merge.  The input is consumed before returning, so the count comes
+    back alongside the merged iterator.
+    """
+    import pickle
+    spill_dir: Optional[str] = None
+    runs:  list[str] = []
+    chunk: list[ItemRecord] = []
+    count = 0
+
+    def spill() -> None:
+        nonlocal spill_dir
+        if spill_dir is None:
+            spill_dir = tempfile.mkdtemp(prefix="cable-sort-")
+        chunk.sort(key=key)
+        path = os.path.join(spill_dir, f"run{len(runs)}")
+        with open(path, "wb") as fh:
+            for start in range(0, len(chunk), 1024):
+                pickle.dump([_record_state(r) for r in chunk[start:start + 1024]], fh,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        runs.append(path)
+        chunk.clear()
+
+    for rec in items:
+        chunk.append(rec)
+        count += 1
+        if len(chunk) >= run_size:
+            spill()
+
+    if not runs:
+        chunk.sort(key=key)
+        return count, iter(chunk)
+    if chunk:
+        spill()
+
+    def read_run(path: str) -> Iterator[ItemRecord]:
+        with open(path, "rb") as fh:
+            while True:
+                try:
+                    batch = pickle.load(fh)
+                except EOFError:
+                    return
+                for state in batch:
+                    yield _record_from_state(state)
+
+    def merged() -> Iterator[ItemRecord]:
+        try:
+            yield from heapq.merge(*(read_run(p) for p in runs), key=key)
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)  # type: ignore[arg-type]
+
+    return count, merged()
+
+
+def walk_items(
+    root:     Path,
+    patterns: list[str],
+    prune:    Iterable[Path] = (),
+) -> Iterator[ItemRecord]:
+    """Lazily yield every file under *root*, one os.scandir per directory.
+
+    Only the stack of directories still to visit is held in memory, so the
+    first files can be moved long before the walk finishes.  Cable's own
+    category folders at the top level and any *prune* directories (destination
+    roots inside the tree) are not descended into; symlinked directories are
+    not followed.
+    """
+    pruned    = {os.path.normcase(os.path.abspath(p)) for p in prune}
+    skip_root = tables().skip_root
+    stack     = [str(root)]
+    top    = True
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            top = False
+            continue
+        with it:
+            for entry in it:
+                name = entry.name
+                if name.startswith(".") or (top and (name in skip_root or name == "sort_log.json")):
+                    continue
+                if patterns and _is_excluded(name, patterns):
+                    continue
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if not is_dir:
+                    yield ItemRecord.from_entry(entry)
+                elif os.path.normcase(os.path.abspath(entry.path)) not in pruned:
+                    stack.append(entry.path)
+        top = False
+
+
+def _prune_dirs(dest_mode: str, dest_root: Optional[Path]) -> set[Path]:
+    """Destination roots a recursive walk must not descend into."""
+    if dest_mode == "where" and dest_root is not None:
+        return {dest_root}
+    if dest_mode == "defaults":
+        t = tables()
+        return set(t.defaults_map.values()) | {t.defaults_fallback}
+    return set()
 
-def _item_sort_key(item: Path, mode: str):
+def _item_sort_key(item: ItemRecord, mode: str):
     name_lower = item.name.lower()
-    ext_lower  = item.suffix.lower()
-    try:
-        stat  = item.stat()
-        size  = stat.st_size
-        mtime = stat.st_mtime
-    except OSError:
-        size, mtime = 0, 0.0
+    ext_lower  = item.suffix
 
     if mode == "alpha":
         return (name_lower,)
     elif mode == "ext":
         return (ext_lower, name_lower)
     elif mode == "size":
-        return (-size, name_lower)
+        return (-item.size, name_lower)
     elif mode == "date":
-        return (-mtime, name_lower)
+        return (-item.mtime, name_lower)
     else:  # combo
-        return (ext_lower, -size, name_lower)
+        return (ext_lower, -item.size, name_lower)
+
+
+def sorted_items(items: list[ItemRecord], mode: str) -> list[ItemRecord]:
+    return sorted(items, key=lambda r: _item_sort_key(r, mode))
+
+# Magic numbers at offset 0 -> the extension the content really has.  Longer
+# signatures win over their prefixes (the trie keeps the deepest match).
+_SIGNATURES: list[tuple[bytes, str]] = [
+    (b"%PDF-",                              ".pdf"),
+    (b"\xff\xd8\xff",                        ".jpg"),
+    (b"\x89PNG\r\n\x1a\n",                   ".png"),
+    (b"GIF87a",                             ".gif"),
+    (b"GIF89a",                             ".gif"),
+    (b"II*\x00",                            ".tiff"),
+    (b"MM\x00*",                            ".tiff"),
+    (b"8BPS",                               ".psd"),
+    (b"RIFF",                               ".riff"),   # refined by _refine_riff
+    (b"PK\x03\x04",                         ".zip"),    # refined by _refine_zip
+    (b"Rar!\x1a\x07",                       ".rar"),
+    (b"7z\xbc\xaf\x27\x1c",                  ".7z"),
+    (b"\x1f\x8b",                            ".gz"),
+    (b"BZh",                                ".bz2"),
+    (b"\xfd7zXZ\x00",                        ".xz"),
+    (b"\x28\xb5\x2f\xfd",                    ".zst"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",    ".doc"),
+    (b"{\\rtf",                             ".rtf"),
+    (b"ID3",                                ".mp3"),
+    (b"\xff\xfb",                            ".mp3"),
+    (b"\xff\xf3",                            ".mp3"),
+    (b"\xff\xf2",                            ".mp3"),
+    (b"fLaC",                               ".flac"),
+    (b"OggS",                               ".ogg"),
+    (b"\x1a\x45\xdf\xa3",                    ".mkv"),
+    (b"MZ",                                 ".exe"),    # refined by _refine_mz
+    (b"<?xml",                              ".xml"),
+]
+
+
+def _build_trie(signatures: list[tuple[bytes, str]]) -> dict:
+    root: dict = {}
+    for magic, ext in signatures:
+        node = root
+        for b in magic:
+            node = node.setdefault(b, {})
+        node[None] = ext
+    return root
+
+
+_SIG_TRIE = _build_trie(_SIGNATURES)
+
+_FTYP_BRANDS = {b"heic": ".heic", b"heix": ".heic", b"mif1": ".heic", b"msf1": ".heic",
+                b"qt  ": ".mov", b"M4A ": ".m4a", b"M4B ": ".m4a"}
+
+
+def _refine_riff(head: bytes) -> Optional[str]:
+    return {b"WEBP": ".webp", b"WAVE": ".wav", b"AVI ": ".avi"}.get(head[8:12])
+
+
+def _refine_mz(head: bytes) -> Optional[str]:
+    """A PE image has "PE\\0\\0" at e_lfanew; "MZ" alone is just two printable bytes."""
+    if len(head) < 0x40:
+        return None
+    pe = int.from_bytes(head[0x3C:0x40], "little")
+    return ".exe" if head[pe:pe + 4] == b"PE\x00\x00" else None
+
+
+def _refine_zip(head: bytes) -> str:
+    """Office and e-book formats are zips; their first member gives them away."""
+    if head[30:38] == b"mimetype":
+        return ".epub" if b"epub" in head[38:80] else ".odt"
+    for marker, ext in ((b"word/", ".docx"), (b"xl/", ".xlsx"), (b"ppt/", ".pptx")):
+        if marker in head:
+            return ext
+    return ".zip"
+
+
+def sniff_bytes(head: bytes) -> Optional[str]:
+    """Extension implied by a file's first bytes, or None if nothing is recognised."""
+    if head[4:8] == b"ftyp":    # ISO media: the box at offset 4 names the brand
+        return _FTYP_BRANDS.get(head[8:12], ".mp4")
+    node = _SIG_TRIE
+    ext: Optional[str] = None
+    for b in head:
+        node = node.get(b)  # type: ignore[assignment]
+        if node is None:
+            break
+        ext = node.get(None, ext)
+    if ext == ".riff":
+        return _refine_riff(head)
+    if ext == ".zip":
+        return _refine_zip(head)
+    if ext == ".exe":
+        return _refine_mz(head)
+    return ext
+
+
+class ContentSniffer:
+    """Classifies files by their first bytes when the suffix says nothing.
+
+    Only HEAD_BYTES are read.  Results are cached by (dev, inode, mtime_ns),
+    so a file is sniffed once per version.  prefetch() and prefetching()
+    hand batches to a small thread pool ahead of the sort loop; a lookup
+    for a file still in flight waits for its batch instead of reading again.
+    """
+
+    HEAD_BYTES  = 512
+    BATCH       = 64
+    MAX_ENTRIES = 200_000
+
+    def __init__(self, workers: int = 4) -> None:
+        self._lock  = threading.Lock()
+        self._cache: dict[tuple, Optional[str]] = {}
+        self._pending: dict[tuple, Future] = {}
+        self._pool  = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cable-sniff")
+
+    @staticmethod
+    def _key(item: ItemRecord) -> tuple:
+        return (item.dev, item.inode, item.mtime_ns) if item.inode else (str(item.path), item.mtime_ns)
 
+    @staticmethod
+    def wanted(item: ItemRecord) -> bool:
+        """Worth sniffing: a non-empty file whose suffix maps to no category."""
+        return not item.is_dir and item.size > 0 and item.suffix not in tables().ext_map
+
+    def _read(self, item: ItemRecord) -> Optional[str]:
+        try:
+            with open(item.path, "rb") as fh:
+                return sniff_bytes(fh.read(self.HEAD_BYTES))
+        except OSError:
+            return None
+
+    def _run_batch(self, batch: list[tuple[tuple, ItemRecord]]) -> None:
+        for key, item in batch:
+            ext = self._read(item)
+            with self._lock:
+                self._store(key, ext)
+
+    def _store(self, key: tuple, ext: Optional[str]) -> None:
+        if len(self._cache) >= self.MAX_ENTRIES:
+            self._cache.clear()
+        self._cache[key] = ext
+        self._pending.pop(key, None)
+
+    def prefetch(self, items: Iterable[ItemRecord]) -> None:
+        """Queue every item that needs sniffing, in batches; returns at once."""
+        batch: list[tuple[tuple, ItemRecord]] = []
+        for item in items:
+            if not self.wanted(item):
+                continue
+            key = self._key(item)
+            batch.append((key, item))
+            if len(batch) >= self.BATCH:
+                self._submit(batch)
+                batch = []
+        if batch:
+            self._submit(batch)
+
+    def _submit(self, batch: list[tuple[tuple, ItemRecord]]) -> None:
+        with self._lock:
+            batch = [(k, it) for k, it in batch if k not in self._cache and k not in self._pending]
+            if not batch:
+                return
+            fut = self._pool.submit(self._run_batch, batch)
+            for k, _ in batch:
+                self._pending[k] = fut
+
+    def prefetching(self, items: Iterable[ItemRecord], window: int = 512) -> Iterator[ItemRecord]:
+        """Pass *items* through unchanged, sniffing up to *window* items ahead of the consumer."""
+        ahead: list[ItemRecord] = []
+        for item in items:
+            ahead.append(item)
+            if len(ahead) >= window:
+                self.prefetch(ahead)
+                yield from ahead
+                ahead = []
+        self.prefetch(ahead)
+        yield from ahead
+
+    def sniff(self, item: ItemRecord) -> Optional[str]:
+        """The content-implied extension of *item* (cached; waits for a queued batch)."""
+        key = self._key(item)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+            fut = self._pending.get(key)
+        if fut is not None:
+            fut.result()
+            with self._lock:
+                if key in self._cache:
+                    return self._cache[key]
+        ext = self._read(item)
+        with self._lock:
+            self._store(key, ext)
+        return ext
+
+
+_sniffer: Optional[ContentSniffer] = None
+_sniffer_lock = threading.Lock()
 
-def sorted_items(items: list[Path], mode: str) -> list[Path]:
-    return sorted(items, key=lambda p: _item_sort_key(p, mode))
 
-def classify(item: Path) -> str:
-    if item.is_dir():
+def sniffer() -> ContentSniffer:
+    """The process-wide ContentSniffer, created on first use."""
+    global _sniffer
+    with _sniffer_lock:
+        if _sniffer is None:
+            _sniffer = ContentSniffer()
+        return _sniffer
+
+
+def classify(item: ItemRecord) -> str:
+    if item.is_dir:
         return "📁  Folders"
-    return EXT_MAP.get(item.suffix.lower(), MISC_KEY)
+    t = tables()
+    if t.rules is not None:
+        cat = t.rules.match(item)
+        if cat is not None:
+            return cat
+    cat = t.ext_map.get(item.suffix)
+    if cat is None and item.size > 0:
+        ext = sniffer().sniff(item)
+        if ext is not None:
+            cat = t.ext_map.get(ext)
+    return cat or MISC_KEY
 
 
 def cat_meta(key: str) -> dict:
-    return CATEGORIES.get(key, {"folder": "Miscellaneous", "icon": "❓", "color": "#9ca3af"})
+    return tables().categories.get(key, {"folder": MISC_FOLDER, "icon": "❓", "color": "#9ca3af"})
 
-def unique_dest(dest: Path) -> Path:
-    if not dest.exists():
-        return dest
-    counter = 1
-    while True:
-        nd = dest.parent / f"{dest.stem} ({counter}){dest.suffix}"
-        if not nd.exists():
-            return nd
-        counter += 1
-    return dest  # unreachable; satisfies type checker
+_NUMBERED_STEM_RE = re.compile(r"^(.*) \((\d+)\)$")
+
+
+class _DirNames:
+    __slots__ = ("lock", "names", "next_n", "complete")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.names: Optional[set[str]] = None
+        self.next_n: dict[tuple[str, str], int] = {}
+        self.complete = True   # False once max_names was hit; misses then fall back to lexists()
+
+
+class DestIndex:
+    """Names present in each destination directory, listed once per run.
+
+    Replaces probing "name (1)", "name (2)", … with exists(): the next free
+    suffix comes from a per-(stem, suffix) counter.  Claims are made with
+    O_CREAT | O_EXCL, so a file another process created behind the index's
+    back is never overwritten; the claim just moves on to the next number.
+
+    With *max_names* set, each directory remembers at most that many names
+    and answers the rest from the filesystem, keeping memory flat for
+    streaming runs.  A *dry_run* index (the planner's) creates nothing:
+    claims are kept in memory only, and directories that do not exist yet
+    are collected in *missing* instead of being made.
+    """
+
+    def __init__(self, max_names: Optional[int] = None, dry_run: bool = False) -> None:
+        self._lock = threading.Lock()
+        self._dirs: dict[str, _DirNames] = {}
+        self._max_names = max_names
+        self.dry_run    = dry_run
+        self.missing: list[Path] = []
+
+    def _dir(self, dest_dir: Path) -> _DirNames:
+        key = os.path.normcase(str(dest_dir))
+        with self._lock:
+            d = self._dirs.get(key)
+            if d is None:
+                d = self._dirs[key] = _DirNames()
+        with d.lock:
+            if d.names is None:
+                t0 = time.perf_counter()
+                if not self.dry_run:
+                    dest_dir.mkdir(parents=True, exist_ok=True)
+                d.names = set()
+                try:
+                    with os.scandir(dest_dir) as it:
+                        for entry in it:
+                            self._note(d, entry.name)
+                except FileNotFoundError:
+                    if not self.dry_run:
+                        raise
+                    self.missing.append(dest_dir)
+                if _METRICS is not None and not self.dry_run:
+                    _METRICS.lap("mkdir", t0)
+        return d
+
+    def _note(self, d: _DirNames, name: str) -> None:
+        assert d.names is not None
+        if self._max_names is not None and len(d.names) >= self._max_names:
+            d.complete = False
+        else:
+            d.names.add(os.path.normcase(name))
+        p = PurePath(name)
+        m = _NUMBERED_STEM_RE.match(p.stem)
+        if m:
+            k = (os.path.normcase(m.group(1)), os.path.normcase(p.suffix))
+            d.next_n[k] = max(d.next_n.get(k, 1), int(m.group(2)) + 1)
+
+    def contains(self, dest_dir: Path, name: str) -> bool:
+        d = self._dir(dest_dir)
+        with d.lock:
+            if os.path.normcase(name) in d.names:  # type: ignore[operator]
+                return True
+            return not d.complete and os.path.lexists(dest_dir / name)
+
+    def claim(self, dest_dir: Path, name: str, is_dir: bool = False) -> Path:
+        """Reserve a free path for *name* in *dest_dir* (creating the directory).
+
+        Files get an empty placeholder so the claim is atomic on disk; the
+        transfer then replaces it.  Directories are claimed in the index only.
+        """
+        d = self._dir(dest_dir)
+        p = PurePath(name)
+        k = (os.path.normcase(p.stem), os.path.normcase(p.suffix))
+        with d.lock:
+            assert d.names is not None
+            candidate = name
+            while True:
+                if os.path.normcase(candidate) in d.names or (
+                    not d.complete and os.path.lexists(dest_dir / candidate)
+                ):
+                    n = d.next_n.get(k, 1)
+                    candidate = f"{p.stem} ({n}){p.suffix}"
+                    d.next_n[k] = n + 1
+                    continue
+                path = dest_dir / candidate
+                if not is_dir and not self.dry_run:
+                    try:
+                        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                    except FileExistsError:
+                        self._note(d, candidate)
+                        continue
+                self._note(d, candidate)
+                return path
+
+    def release(self, path: Path) -> None:
+        """Give back a claim whose transfer failed, removing its empty placeholder."""
+        d = self._dir(path.parent)
+        with d.lock:
+            d.names.discard(os.path.normcase(path.name))  # type: ignore[union-attr]
+            try:
+                if path.is_file() and path.stat().st_size == 0:
+                    path.unlink()
+            except OSError:
+                pass
+
+
+def _move_onto(src: str, dst: str) -> None:
+    """Move a file onto its claimed placeholder (rename, or copy+delete across devices)."""
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(src, dst)
 
 def file_hash(path: Path, chunk: int = 65536) -> str:
     h = hashlib.sha256()
@@ -620,91 +1564,831 @@ def file_hash(path: Path, chunk: int = 65536) -> str:
         return ""
     return h.hexdigest()
 
-def _fmt_size(b: int) -> str:
-    n: float = b
-    for unit in ("B", "KB", "MB", "GB"):
-        if n < 1024:
-            return f"{n:.0f} {unit}"
-        n /= 1024
-    return f"{n:.1f} TB"
-
+HASH_CACHE_PATH = Path.home() / ".cable_cache.sqlite"
 
-def _item_size(item: Path) -> int:
-    try:
-        return item.stat().st_size
-    except OSError:
-        return 0
 
-def build_preview(items: list[Path], sort_mode: str = "alpha") -> Table:
-    extra_labels = {
-        "alpha": "Extension",
-        "ext":   "Extension",
-        "size":  "Size",
-        "date":  "Modified",
-        "combo": "Ext / Size",
-    }
-    extra_label = extra_labels.get(sort_mode, "Info")
-    total_size  = sum(_item_size(i) for i in items)
+class HashCache:
+    """Persistent SHA-256 cache keyed by (dev, inode, size, mtime_ns).
 
-    t = Table(
-        box=box.SIMPLE_HEAD,
-        border_style="#4c1d95",
-        header_style="bold #a78bfa",
-        show_edge=True,
-        show_lines=False,
-        expand=True,
-        title=(
-            f"[bold #c4b5fd]Preview — {len(items)} item{'s' if len(items) != 1 else ''}"
-            f"  ·  {_fmt_size(total_size)} total[/]"
-        ),
-        title_style="bold",
-    )
-    t.add_column("#",          style=C_DIM,    width=4, justify="right")
-    t.add_column("Name",       style="#f9fafb", ratio=5)
-    t.add_column("Category",   ratio=3)
-    t.add_column(extra_label,  style="#60a5fa", ratio=2)
-    t.add_column("→ Folder",   style="#818cf8", ratio=3)
+    A rename keeps all four, so a file hashed before a move is still a hit
+    in its category folder on the next run or watcher event.  Falls back to
+    an in-memory table when the cache file cannot be opened.
+    """
 
-    for idx, item in enumerate(items[:60], 1):  # type: ignore[misc]
-        cat   = classify(item)
-        meta  = cat_meta(cat)
-        label = cat.split("  ")[-1] if "  " in cat else cat
+    _FLUSH_EVERY = 256
 
+    def __init__(self, path: Path = HASH_CACHE_PATH) -> None:
+        self._lock    = threading.Lock()
+        self._pending = 0
+        import sqlite3
         try:
-            stat = item.stat()
-            if sort_mode == "size":
-                extra = _fmt_size(stat.st_size)
-            elif sort_mode == "date":
-                extra = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d")
-            elif sort_mode == "combo":
-                extra = f"{item.suffix.lower() or '–'}  {_fmt_size(stat.st_size)}"
-            else:
-                extra = item.suffix.lower() or "–"
-        except OSError:
-            extra = "–"
-
-        t.add_row(
-            f"[dim]{idx}[/]",
-            f"[{meta['color']}]{meta['icon']}[/]  {item.name}",
-            f"[{meta['color']}]{label}[/]",
-            f"[dim]{extra}[/]",
-            f"[dim]{meta['folder']}/[/]",
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error:
+            self._db = sqlite3.connect(":memory:", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " dev INTEGER, ino INTEGER, size INTEGER, mtime_ns INTEGER, sha256 TEXT,"
+            " PRIMARY KEY (dev, ino, size, mtime_ns))"
         )
 
-    if len(items) > 60:
-        t.add_row("…", f"[dim]…and {len(items)-60} more[/]", "", "", "")
+    def lookup(self, key: tuple[int, int, int, int]) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT sha256 FROM hashes WHERE dev=? AND ino=? AND size=? AND mtime_ns=?", key
+            ).fetchone()
+        return row[0] if row else None
 
-    return t
+    def store(self, key: tuple[int, int, int, int], digest: str) -> None:
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)", (*key, digest))
+            self._pending += 1
+            if self._pending >= self._FLUSH_EVERY:
+                self._db.commit()
+                self._pending = 0
+
+    def digest(self, path: Path, key: Optional[tuple[int, int, int, int]]) -> str:
+        """SHA-256 of *path*, hashing only on a cache miss."""
+        if key is None:
+            return file_hash(path)
+        cached = self.lookup(key)
+        if cached is not None:
+            return cached
+        digest = file_hash(path)
+        if digest:
+            self.store(key, digest)
+        return digest
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._pending:
+                self._db.commit()
+                self._pending = 0
 
-def build_summary(
-    results:      dict,
-    size_results: dict,
-    elapsed:      float,
-    copy_mode:    bool,
-    duplicates:   int,
-) -> Table:
-    verb = "Copied" if copy_mode else "Moved"
-    t = Table(
+
+_hash_cache: Optional[HashCache] = None
+_hash_cache_lock = threading.Lock()
+
+
+def hash_cache() -> HashCache:
+    """The process-wide HashCache, opened on first use."""
+    global _hash_cache
+    with _hash_cache_lock:
+        if _hash_cache is None:
+            _hash_cache = HashCache()
+        return _hash_cache
+
+
+def flush_hash_cache() -> None:
+    """Commit pending cache writes, if the cache was ever opened."""
+    if _hash_cache is not None:
+        _hash_cache.flush()
+
+
+_FINGERPRINT_BYTES = 4096
+
+
+def _fingerprint(path: Path, size: int) -> bytes:
+    """First and last 4 KiB of a file (the whole file when it is smaller than 8 KiB)."""
+    with open(path, "rb") as fh:
+        head = fh.read(_FINGERPRINT_BYTES)
+        if size <= 2 * _FINGERPRINT_BYTES:
+            return head + fh.read()
+        fh.seek(-_FINGERPRINT_BYTES, os.SEEK_END)
+        return head + fh.read(_FINGERPRINT_BYTES)
+
+
+def files_identical(item: ItemRecord, other: Path) -> bool:
+    """Staged duplicate check: size, then head/tail fingerprint, then cached SHA-256."""
+    if item.is_dir:
+        return False
+    try:
+        ost = other.stat()
+        if stat.S_ISDIR(ost.st_mode) or ost.st_size != item.size:
+            return False
+        if _fingerprint(item.path, item.size) != _fingerprint(other, ost.st_size):
+            return False
+        if item.size <= 2 * _FINGERPRINT_BYTES:
+            return True
+        cache    = hash_cache()
+        item_key = item.cache_key()
+        if item_key is None:
+            item_key = ItemRecord.from_path(item.path).cache_key()
+        other_key = ItemRecord.from_stat(other, ost).cache_key()
+    except OSError:
+        return False
+    a = cache.digest(item.path, item_key)
+    return bool(a) and a == cache.digest(other, other_key)
+
+# Capture dates for YYYY/MM subfolders.  Header-only readers: JPEG APP1/EXIF,
+# TIFF (and TIFF-based raw), HEIC's Exif item, and the mvhd box of MP4/MOV.
+# Nothing is decoded; a JPEG costs a few segment headers, a video a walk over
+# top-level box headers.
+
+_MAC_EPOCH_OFFSET = 2082844800     # seconds from 1904-01-01 (QuickTime) to 1970-01-01
+_HEIC_BRANDS      = {b"heic", b"heix", b"mif1", b"msf1", b"heim", b"heis", b"avif"}
+
+
+def _exif_ts(text: str) -> Optional[float]:
+    try:
+        return datetime.strptime(text[:19], "%Y:%m:%d %H:%M:%S").timestamp()
+    except ValueError:      # blank or "0000:00:00 00:00:00"
+        return None
+
+
+def _tiff_date(buf: bytes, base: int = 0) -> Optional[float]:
+    """DateTimeOriginal (else DateTimeDigitized, else IFD0 DateTime) from a TIFF block at *base*."""
+    order = buf[base:base + 2]
+    if order not in (b"II", b"MM"):
+        return None
+    e = "<" if order == b"II" else ">"
+
+    def entries(off: int) -> dict[int, tuple[int, int, bytes]]:
+        p   = base + off
+        out = {}
+        if off <= 0 or p + 2 > len(buf):
+            return out
+        for i in range(struct.unpack_from(e + "H", buf, p)[0]):
+            q = p + 2 + 12 * i
+            if q + 12 > len(buf):
+                break
+            tag, typ, cnt, val = struct.unpack_from(e + "HHI4s", buf, q)
+            out[tag] = (typ, cnt, val)
+        return out
+
+    def text(entry: tuple[int, int, bytes]) -> str:
+        typ, cnt, val = entry
+        if typ != 2:
+            return ""
+        if cnt <= 4:
+            raw = val[:cnt]
+        else:
+            off = base + struct.unpack(e + "I", val)[0]
+            raw = buf[off:off + cnt]
+        return raw.split(b"\0")[0].decode("ascii", "ignore")
+
+    ifd0 = entries(struct.unpack_from(e + "I", buf, base + 4)[0])
+    exif = entries(struct.unpack(e + "I", ifd0[0x8769][2])[0]) if 0x8769 in ifd0 else {}
+    for table, tag in ((exif, 0x9003), (exif, 0x9004), (ifd0, 0x0132)):
+        if tag in table:
+            ts = _exif_ts(text(table[tag]))
+            if ts is not None:
+                return ts
+    return None
+
+
+def _jpeg_date(fh) -> Optional[float]:
+    fh.seek(2)
+    while True:
+        hdr = fh.read(4)
+        if len(hdr) < 4 or hdr[0] != 0xFF:
+            return None
+        marker, length = hdr[1], struct.unpack(">H", hdr[2:])[0]
+        if marker in (0xDA, 0xD9):      # image data starts: no EXIF after this
+            return None
+        if marker == 0xE1:
+            seg = fh.read(length - 2)
+            if seg[:6] == b"Exif\0\0":
+                return _tiff_date(seg, 6)
+        else:
+            fh.seek(length - 2, 1)
+
+
+def _boxes(fh, start: int, end: int) -> Iterator[tuple[bytes, int, int]]:
+    """(type, payload start, box end) for each ISO-BMFF box in [start, end), reading headers only."""
+    pos = start
+    while pos + 8 <= end:
+        fh.seek(pos)
+        hdr = fh.read(8)
+        if len(hdr) < 8:
+            return
+        size, typ = struct.unpack(">I4s", hdr)
+        head = 8
+        if size == 1:
+            size = struct.unpack(">Q", fh.read(8))[0]
+            head = 16
+        elif size == 0:
+            size = end - pos
+        if size < head:
+            return
+        yield typ, pos + head, pos + size
+        pos += size
+
+
+def _mvhd_date(fh, size: int) -> Optional[float]:
+    for typ, a, b in _boxes(fh, 0, size):
+        if typ != b"moov":
+            continue
+        for typ2, a2, _ in _boxes(fh, a, b):
+            if typ2 == b"mvhd":
+                fh.seek(a2)
+                d  = fh.read(12)
+                ct = struct.unpack(">Q", d[4:12])[0] if d[0] == 1 else struct.unpack(">I", d[4:8])[0]
+                return float(ct - _MAC_EPOCH_OFFSET) if ct > _MAC_EPOCH_OFFSET else None
+        return None
+    return None
+
+
+def _uint(d: bytes, p: int, n: int) -> int:
+    return int.from_bytes(d[p:p + n], "big") if n else 0
+
+
+def _heic_date(fh, size: int) -> Optional[float]:
+    """EXIF date from a HEIF file: find the Exif item in iinf, its extent in iloc, read only that."""
+    for typ, a, b in _boxes(fh, 0, size):
+        if typ != b"meta":
+            continue
+        kids = {t: (x, y) for t, x, y in _boxes(fh, a + 4, b)}     # meta is a full box
+        if b"iinf" not in kids or b"iloc" not in kids:
+            return None
+        x, y = kids[b"iinf"]
+        fh.seek(x)
+        exif_id = None
+        for t, ix, iy in _boxes(fh, x + (6 if fh.read(1)[0] == 0 else 8), y):
+            if t != b"infe":
+                continue
+            fh.seek(ix)
+            d = fh.read(16)
+            if d[0] == 2 and d[8:12] == b"Exif":
+                exif_id = _uint(d, 4, 2)
+            elif d[0] == 3 and d[10:14] == b"Exif":
+                exif_id = _uint(d, 4, 4)
+        if exif_id is None:
+            return None
+        x, y = kids[b"iloc"]
+        fh.seek(x)
+        d   = fh.read(min(y - x, 1 << 20))
+        ver = d[0]
+        off_size, len_size = d[4] >> 4, d[4] & 15
+        base_size, idx_size = d[5] >> 4, (d[5] & 15) if ver in (1, 2) else 0
+        id_size = 4 if ver == 2 else 2
+        count   = _uint(d, 6, id_size)
+        p       = 6 + id_size
+        for _ in range(count):
+            item_id = _uint(d, p, id_size)
+            p += id_size + (2 if ver in (1, 2) else 0) + 2     # construction method, data ref index
+            base = _uint(d, p, base_size)
+            p += base_size
+            extents = _uint(d, p, 2)
+            p += 2
+            first: Optional[tuple[int, int]] = None
+            for _ in range(extents):
+                p += idx_size
+                ext = (_uint(d, p, off_size), _uint(d, p + off_size, len_size))
+                p += off_size + len_size
+                first = first or ext
+            if item_id == exif_id and first is not None:
+                fh.seek(base + first[0])
+                data = fh.read(min(first[1] or 65536, 65536))
+                return _tiff_date(data, 4 + struct.unpack(">I", data[:4])[0])
+        return None
+    return None
+
+
+def read_capture_time(path: str) -> Optional[float]:
+    """When a photo or video was taken, from its own header; None if it does not say."""
+    try:
+        with open(path, "rb") as fh:
+            head = fh.read(16)
+            if head[:3] == b"\xff\xd8\xff":
+                return _jpeg_date(fh)
+            if head[:4] in (b"II*\x00", b"MM\x00*"):
+                fh.seek(0)
+                return _tiff_date(fh.read(256 * 1024))
+            if head[4:8] == b"ftyp":
+                size = os.fstat(fh.fileno()).st_size
+                return _heic_date(fh, size) if head[8:12] in _HEIC_BRANDS else _mvhd_date(fh, size)
+    except (OSError, struct.error, ValueError, IndexError, OverflowError):
+        return None
+    return None
+
+
+def _capture_batch(paths: list[str]) -> list[Optional[float]]:
+    """Process-pool entry point."""
+    return [read_capture_time(p) for p in paths]
+
+
+CAPTURE_CACHE_PATH = Path.home() / ".cable_dates.sqlite"
+
+
+class CaptureDates:
+    """Persistent capture-time cache keyed by (dev, inode, size, mtime_ns).
+
+    A file without a readable date is cached as NULL too, so an unchanged
+    library is never parsed twice.  prefetch() resolves a whole batch up
+    front: cached rows first, then the misses, on a process pool once there
+    are PROCESS_MIN of them (parsing is CPU-bound and holds the GIL).
+    prefetching() does the same a window at a time, on one pool per run.
+    """
+
+    _FLUSH_EVERY = 512
+    PROCESS_MIN  = 256
+    MAX_MEMORY   = 200_000
+
+    def __init__(self, path: Path = CAPTURE_CACHE_PATH) -> None:
+        self._lock    = threading.Lock()
+        self._pending = 0
+        self._mem: dict[tuple, Optional[float]] = {}
+        import sqlite3
+        try:
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error:
+            self._db = sqlite3.connect(":memory:", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS dates ("
+            " dev INTEGER, ino INTEGER, size INTEGER, mtime_ns INTEGER, ts REAL,"
+            " PRIMARY KEY (dev, ino, size, mtime_ns))"
+        )
+
+    @staticmethod
+    def _key(item: ItemRecord) -> tuple:
+        key = item.cache_key()
+        if key is None:
+            try:
+                key = ItemRecord.from_path(item.path).cache_key()
+            except OSError:
+                pass
+        return key or (str(item.path), item.size, item.mtime_ns)
+
+    def _lookup(self, key: tuple) -> tuple[bool, Optional[float]]:
+        with self._lock:
+            if key in self._mem:
+                return True, self._mem[key]
+            if len(key) != 4:
+                return False, None
+            row = self._db.execute(
+                "SELECT ts FROM dates WHERE dev=? AND ino=? AND size=? AND mtime_ns=?", key
+            ).fetchone()
+        return (True, row[0]) if row else (False, None)
+
+    def _store(self, key: tuple, ts: Optional[float]) -> None:
+        with self._lock:
+            if len(self._mem) >= self.MAX_MEMORY:
+                self._mem.clear()
+            self._mem[key] = ts
+            if len(key) == 4:
+                self._db.execute("INSERT OR REPLACE INTO dates VALUES (?, ?, ?, ?, ?)", (*key, ts))
+                self._pending += 1
+                if self._pending >= self._FLUSH_EVERY:
+                    self._db.commit()
+                    self._pending = 0
+
+    def get(self, item: ItemRecord) -> Optional[float]:
+        """Capture time of *item* (epoch seconds), parsing its header only on a cache miss."""
+        key = self._key(item)
+        hit, ts = self._lookup(key)
+        if not hit:
+            ts = read_capture_time(str(item.path))
+            self._store(key, ts)
+        return ts
+
+    def prefetch(self, items: Iterable[ItemRecord]) -> None:
+        pool = self._prefetch(items, None)
+        if pool is not None:
+            pool.shutdown()
+
+    def _prefetch(self, items: Iterable[ItemRecord], pool: Optional[Executor]) -> Optional[Executor]:
+        """Resolve *items*, starting a process pool if none is given and one is worth it.
+
+        Returns the pool used (or None), for the caller to reuse and shut down.
+        """
+        misses: list[tuple[tuple, str]] = []
+        for item in items:
+            key = self._key(item)
+            hit, ts = self._lookup(key)
+            if hit:
+                with self._lock:
+                    self._mem[key] = ts
+            else:
+                misses.append((key, str(item.path)))
+        if not misses:
+            return pool
+        paths = [p for _, p in misses]
+        results: Optional[list] = None
+        if len(misses) >= self.PROCESS_MIN:
+            chunks = [paths[i:i + 64] for i in range(0, len(paths), 64)]
+            try:
+                if pool is None:
+                    from concurrent.futures import ProcessPoolExecutor
+                    pool = ProcessPoolExecutor()
+                results = [ts for part in pool.map(_capture_batch, chunks) for ts in part]
+            except Exception:   # no process support (e.g. a sandbox); parse here instead
+                if pool is not None:
+                    pool.shutdown(wait=False)
+                pool, results = None, None
+        if results is None:
+            results = _capture_batch(paths)
+        for (key, _), ts in zip(misses, results):
+            self._store(key, ts)
+        self.flush()
+        return pool
+
+    def prefetching(
+        self, pairs: Iterable[tuple[ItemRecord, str]], window: int = 2048,
+    ) -> Iterator[tuple[ItemRecord, str]]:
+        """Pass classified (item, category) pairs through unchanged, resolving
+        dated media's capture times a window at a time."""
+        pool: Optional[Executor] = None
+        ahead: list[tuple[ItemRecord, str]] = []
+        try:
+            for pair in pairs:
+                ahead.append(pair)
+                if len(ahead) >= window:
+                    pool = self._prefetch(dated_media(ahead), pool)
+                    yield from ahead
+                    ahead = []
+            pool = self._prefetch(dated_media(ahead), pool)
+            yield from ahead
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._pending:
+                self._db.commit()
+                self._pending = 0
+
+
+_capture_dates: Optional[CaptureDates] = None
+_capture_dates_lock = threading.Lock()
+
+
+def capture_dates() -> CaptureDates:
+    """The process-wide CaptureDates cache, opened on first use."""
+    global _capture_dates
+    with _capture_dates_lock:
+        if _capture_dates is None:
+            _capture_dates = CaptureDates()
+        return _capture_dates
+
+
+def flush_capture_dates() -> None:
+    if _capture_dates is not None:
+        _capture_dates.flush()
+
+
+def dated_media(pairs: Iterable[tuple[ItemRecord, str]]) -> Iterator[ItemRecord]:
+    """The items of classified (item, category) pairs whose destination depends
+    on a capture date (date subfolders on)."""
+    cats = tables().date_media_cats
+    return (i for i, cat in pairs if not i.is_dir and cat in cats)
+
+
+METRICS_DIR      = Path.home() / ".cable_metrics"
+_METRICS_REPORTS = 200     # newest JSON run reports kept in METRICS_DIR
+
+
+def _prom_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Metrics:
+    """Counters and latency histograms per (phase, category) for one run.
+
+    A sort, an undo or a watcher session makes one and activates it; the
+    shared code paths (_sort_one, DestIndex, the restore pool) time their
+    phases into whichever Metrics is active and skip the bookkeeping when
+    none is.  Phases: scan, classify, mkdir (first use of a destination
+    directory, inside claim), lock_wait (collision and source locks),
+    hash (duplicate checks), claim, lane_wait (a free cross-device copy
+    lane), rename, copy, cross_device_copy, item (a whole file, per
+    category) and, in the watcher, debounce (first event to dispatch),
+    worker_wait (batch waiting for a worker) and batch.  Histograms use
+    fixed buckets, so recording is a bisect and three additions under a
+    lock.
+    """
+
+    BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+               0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, mode: str, folder: Path) -> None:
+        self.mode    = mode
+        self.folder  = str(folder)
+        self.started = time.time()
+        self._lock   = threading.Lock()
+        # (phase, category key) -> [count, seconds, bytes, *bucket counts (last one is +Inf)]
+        self._series: dict[tuple[str, str], list] = {}
+        self.counters: dict[str, int]   = {}
+        self.gauges:   dict[str, float] = {}
+
+    def observe(self, phase: str, seconds: float, cat: str = "", nbytes: int = 0) -> None:
+        slot = 3 + bisect.bisect_left(self.BUCKETS, seconds)
+        with self._lock:
+            s = self._series.get((phase, cat))
+            if s is None:
+                s = self._series[(phase, cat)] = [0, 0.0, 0] + [0] * (len(self.BUCKETS) + 1)
+            s[0]    += 1
+            s[1]    += seconds
+            s[2]    += nbytes
+            s[slot] += 1
+
+    def lap(self, phase: str, since: float, cat: str = "", nbytes: int = 0, item: str = "") -> float:
+        """Observe the time from *since* to now and return now, for back-to-back phases.
+
+        With --trace on, the same span also goes to the Tracer, labelled with *item*.
+        """
+        now = time.perf_counter()
+        self.observe(phase, now - since, cat, nbytes)
+        if _TRACER is not None:
+            _TRACER.span(phase, since, now, cat, item)
+        return now
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def _snapshot(self) -> tuple[dict, dict, dict]:
+        with self._lock:
+            return {k: list(v) for k, v in self._series.items()}, dict(self.counters), dict(self.gauges)
+
+    def _quantile(self, s: list, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None past the last bucket)."""
+        rank, seen = q * s[0], 0
+        for i, n in enumerate(s[3:]):
+            seen += n
+            if seen and seen >= rank:
+                return self.BUCKETS[i] if i < len(self.BUCKETS) else None
+        return None
+
+    def report(self) -> dict:
+        series, counters, gauges = self._snapshot()
+
+        def entry(s: list) -> dict:
+            return {"count": s[0], "seconds": round(s[1], 6), "bytes": s[2],
+                    "p50": self._quantile(s, 0.50), "p99": self._quantile(s, 0.99)}
+
+        phases:     dict[str, list] = {}
+        categories: dict[str, dict] = {}
+        for (phase, cat), s in series.items():
+            total = phases.setdefault(phase, [0] * len(s))
+            for i, v in enumerate(s):
+                total[i] += v
+            if cat:
+                categories.setdefault(cat.split("  ")[-1].strip(), {})[phase] = entry(s)
+        return {
+            "mode":       self.mode,
+            "folder":     self.folder,
+            "started":    datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "elapsed":    round(time.time() - self.started, 3),
+            "phases":     {phase: entry(s) for phase, s in phases.items()},
+            "categories": categories,
+            "counters":   counters,
+            "gauges":     gauges,
+        }
+
+    def write_report(self) -> Optional[Path]:
+        """Save report() as METRICS_DIR/<start ms>-<mode>.json, pruning old reports."""
+        try:
+            METRICS_DIR.mkdir(parents=True, exist_ok=True)
+            path = METRICS_DIR / f"{int(self.started * 1000)}-{self.mode}.json"
+            path.write_text(json.dumps(self.report(), indent=1, ensure_ascii=False), encoding="utf-8")
+            for old in sorted(METRICS_DIR.glob("*.json"))[:-_METRICS_REPORTS]:
+                old.unlink(missing_ok=True)
+            return path
+        except OSError:
+            return None
+
+    def prometheus(self) -> str:
+        """The current values in Prometheus text exposition format."""
+        series, counters, gauges = self._snapshot()
+        base = f'mode="{_prom_escape(self.mode)}",folder="{_prom_escape(self.folder)}"'
+        out  = ["# HELP cable_phase_seconds Time spent per phase and category.",
+                "# TYPE cable_phase_seconds histogram"]
+        keyed = sorted(series.items())
+        for (phase, cat), s in keyed:
+            labels = f'{base},phase="{phase}",category="{_prom_escape(cat.split("  ")[-1].strip())}"'
+            running = 0
+            for bound, n in zip(self.BUCKETS, s[3:]):
+                running += n
+                out.append(f'cable_phase_seconds_bucket{{{labels},le="{bound}"}} {running}')
+            out.append(f'cable_phase_seconds_bucket{{{labels},le="+Inf"}} {s[0]}')
+            out.append(f"cable_phase_seconds_sum{{{labels}}} {s[1]:.6f}")
+            out.append(f"cable_phase_seconds_count{{{labels}}} {s[0]}")
+        out += ["# HELP cable_phase_bytes_total Bytes handled per phase and category.",
+                "# TYPE cable_phase_bytes_total counter"]
+        for (phase, cat), s in keyed:
+            if s[2]:
+                labels = f'{base},phase="{phase}",category="{_prom_escape(cat.split("  ")[-1].strip())}"'
+                out.append(f"cable_phase_bytes_total{{{labels}}} {s[2]}")
+        out += ["# HELP cable_events_total Duplicates, errors and other run events.",
+                "# TYPE cable_events_total counter"]
+        out += [f'cable_events_total{{{base},event="{name}"}} {n}' for name, n in sorted(counters.items())]
+        for name, value in sorted(gauges.items()):
+            out += [f"# TYPE cable_{name} gauge", f"cable_{name}{{{base}}} {value}"]
+        out += ["# TYPE cable_start_time_seconds gauge", f"cable_start_time_seconds{{{base}}} {self.started:.3f}"]
+        return "\n".join(out) + "\n"
+
+    def write_prometheus(self, path: Path) -> None:
+        """Replace *path* atomically, as node_exporter's textfile collector expects."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.prometheus(), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+_METRICS: Optional[Metrics] = None
+
+
+def activate_metrics(m: Optional[Metrics]) -> Optional[Metrics]:
+    """Make *m* the Metrics the shared code paths record into; returns the previous one."""
+    global _METRICS
+    previous, _METRICS = _METRICS, m
+    return previous
+
+
+@contextmanager
+def collecting(m: Metrics) -> Iterator[Metrics]:
+    previous = activate_metrics(m)
+    try:
+        yield m
+    finally:
+        activate_metrics(previous)
+
+
+class Tracer:
+    """Per-item timeline for --trace, as Chrome trace-event JSON (open it in Perfetto).
+
+    Every Metrics.lap becomes a complete ("X") event on the thread that ran
+    it, so a file's classify, lock_wait, hash, claim and transfer nest under
+    its item span; debounce waits overlap, so they are async events with a
+    row per path.  Events are buffered and appended in chunks to a JSON
+    array, which trace viewers still open if the closing bracket never
+    made it to disk.
+    """
+
+    FLUSH_EVERY = 2048
+
+    def __init__(self, path: Path) -> None:
+        self.path     = path
+        self._t0      = time.perf_counter()
+        self._pid     = os.getpid()
+        self._lock    = threading.Lock()
+        self._buf: list[dict] = []
+        self._threads: set[int] = set()
+        self._ids     = itertools.count(1)
+        self._first   = True
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(path, "w", encoding="utf-8")
+        self._fh.write("[\n")
+        self._emit({"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0,
+                    "args": {"name": "cable"}})
+
+    def _us(self, t: float) -> float:
+        return round((t - self._t0) * 1e6, 1)
+
+    def _emit(self, ev: dict) -> None:
+        with self._lock:
+            self._buf.append(ev)
+            if len(self._buf) >= self.FLUSH_EVERY:
+                self._flush_locked()
+
+    def span(self, phase: str, start: float, end: float, cat: str = "", item: str = "") -> None:
+        """One finished phase; item spans are named after the file so they read on the timeline."""
+        tid = threading.get_native_id()
+        if tid not in self._threads:
+            self._threads.add(tid)
+            self._emit({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                        "args": {"name": threading.current_thread().name}})
+        args = {}
+        if item:
+            args["file"] = item
+        if cat:
+            args["category"] = cat.split("  ")[-1].strip()
+        self._emit({"name": item if phase == "item" and item else phase, "cat": phase, "ph": "X",
+                    "ts": self._us(start), "dur": self._us(end) - self._us(start),
+                    "pid": self._pid, "tid": tid, "args": args})
+
+    def wait(self, phase: str, key: str, start: float, end: float) -> None:
+        """A wait that overlaps others of its kind (debounce), as an async begin/end pair."""
+        ident = next(self._ids)
+        args  = {"file": os.path.basename(key)}
+        self._emit({"name": phase, "cat": phase, "ph": "b", "id": ident,
+                    "ts": self._us(start), "pid": self._pid, "tid": 0, "args": args})
+        self._emit({"name": phase, "cat": phase, "ph": "e", "id": ident,
+                    "ts": self._us(end), "pid": self._pid, "tid": 0})
+
+    def _flush_locked(self) -> None:
+        if not self._buf or self._fh.closed:
+            return
+        chunk = ",\n".join(json.dumps(ev, ensure_ascii=False) for ev in self._buf)
+        self._fh.write(chunk if self._first else ",\n" + chunk)
+        self._fh.flush()
+        self._first = False
+        self._buf.clear()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            if not self._fh.closed:
+                self._fh.write("\n]\n")
+                self._fh.close()
+
+
+_TRACER: Optional[Tracer] = None
+
+
+def activate_tracer(tr: Optional[Tracer]) -> Optional[Tracer]:
+    """Make *tr* the Tracer Metrics.lap and the debounce queue report to; returns the previous one."""
+    global _TRACER
+    previous, _TRACER = _TRACER, tr
+    return previous
+
+
+def _fmt_size(b: int) -> str:
+    n: float = b
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+def build_preview(plan: "SortPlan", sort_mode: str = "alpha") -> "Table":
+    from rich import box
+    from rich.table import Table
+    extra_labels = {
+        "alpha": "Extension",
+        "ext":   "Extension",
+        "size":  "Size",
+        "date":  "Modified",
+        "combo": "Ext / Size",
+    }
+    extra_label = extra_labels.get(sort_mode, "Info")
+    ops         = plan.ops
+    total_size  = sum(op.item.size for op in ops)
+
+    t = Table(
+        box=box.SIMPLE_HEAD,
+        border_style="#4c1d95",
+        header_style="bold #a78bfa",
+        show_edge=True,
+        show_lines=False,
+        expand=True,
+        title=(
+            f"[bold #c4b5fd]Preview — {len(ops)} item{'s' if len(ops) != 1 else ''}"
+            f"  ·  {_fmt_size(total_size)} total[/]"
+        ),
+        title_style="bold",
+    )
+    t.add_column("#",          style=C_DIM,    width=4, justify="right")
+    t.add_column("Name",       style="#f9fafb", ratio=5)
+    t.add_column("Category",   ratio=3)
+    t.add_column(extra_label,  style="#60a5fa", ratio=2)
+    t.add_column("→ Folder",   style="#818cf8", ratio=3)
+
+    for idx, op in enumerate(ops[:60], 1):  # type: ignore[misc]
+        item  = op.item
+        cat   = op.cat
+        meta  = cat_meta(cat)
+        label = cat.split("  ")[-1] if "  " in cat else cat
+
+        if sort_mode == "size":
+            extra = _fmt_size(item.size)
+        elif sort_mode == "date":
+            extra = datetime.fromtimestamp(item.mtime).strftime("%Y-%m-%d") if item.mtime else "–"
+        elif sort_mode == "combo":
+            extra = f"{item.suffix or '–'}  {_fmt_size(item.size)}"
+        else:
+            extra = item.suffix or "–"
+
+        if op.dup:
+            where = f"[{C_WARN}]identical exists · skip[/]"
+        elif op.dest.name != item.name:
+            where = f"[dim]{meta['folder']}/[/][{C_WARN}]{op.dest.name}[/]"
+        else:
+            where = f"[dim]{meta['folder']}/[/]"
+        t.add_row(
+            f"[dim]{idx}[/]",
+            f"[{meta['color']}]{meta['icon']}[/]  {item.name}",
+            f"[{meta['color']}]{label}[/]",
+            f"[dim]{extra}[/]",
+            where,
+        )
+
+    if len(ops) > 60:
+        t.add_row("…", f"[dim]…and {len(ops)-60} more[/]", "", "", "")
+
+    return t
+
+def build_summary(
+    results:      dict,
+    size_results: dict,
+    elapsed:      float,
+    copy_mode:    bool,
+    duplicates:   int,
+    lanes:        Optional[list[dict]] = None,
+    phases:       Optional[dict[str, dict]] = None,
+) -> "Table":
+    from rich import box
+    from rich.table import Table
+    verb = "Copied" if copy_mode else "Moved"
+    t = Table(
         box=box.SIMPLE_HEAD,
         border_style="#065f46",
         header_style="bold #34d399",
@@ -750,9 +2434,46 @@ def build_summary(
         f"[bold #fbbf24]{_fmt_size(total_bytes)}[/]",
         f"[dim]in {elapsed:.1f}s[/]",
     )
+
+    if lanes:
+        t.add_section()
+        for lane in lanes:
+            secs = max(lane["seconds"], 1e-6)
+            if lane["same_device"]:
+                label = "⇢  Renames · same device" if not copy_mode else "⇢  Copies · same device"
+                rate  = f"{lane['files'] / secs:,.0f} files/s"
+            else:
+                label = f"⇆  Copy lane · dev {lane['src_dev']} → {lane['dst_dev']}"
+                rate  = f"{lane['bytes'] / secs / 1024 ** 2:,.1f} MB/s"
+            how = ", ".join(f"{k} {n}" for k, n in sorted(lane["strategies"].items(), key=lambda x: -x[1])
+                            if k != "rename")
+            if how:
+                label += f"  [dim]({how})[/]"
+            t.add_row(
+                f"[#60a5fa]{label}[/]",
+                f"[#f9fafb]{lane['files']}[/]",
+                f"[dim]{_fmt_size(lane['bytes'])}[/]",
+                f"[dim]{rate}[/]",
+            )
+
+    # where the time went (Metrics.report()["phases"]), slowest phase first
+    shown = {k: v for k, v in (phases or {}).items() if k != "item" and v["count"]}
+    if shown:
+        t.add_section()
+        for phase, p in sorted(shown.items(), key=lambda x: -x[1]["seconds"]):
+            p99 = f" · p99 ≤ {p['p99'] * 1000:g} ms" if p["p99"] is not None else ""
+            t.add_row(
+                f"[#a78bfa]⏱  {phase.replace('_', ' ')}[/]",
+                f"[#f9fafb]{p['count']}[/]",
+                f"[dim]{_fmt_size(p['bytes']) if p['bytes'] else ''}[/]",
+                f"[dim]{p['seconds']:.2f}s{p99}[/]",
+            )
     return t
 
-def build_stats_panel(results: dict, size_results: dict) -> Panel:
+def build_stats_panel(results: dict, size_results: dict) -> "Panel":
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.text import Text
     BAR_WIDTH = 28
     total     = max(sum(results.values()), 1)
     lines: list[Text] = []
@@ -783,7 +2504,7 @@ def build_stats_panel(results: dict, size_results: dict) -> Panel:
     )
 
 def _dest_dir_for(
-    item:            Path,
+    item:            ItemRecord,
     target:          Path,
     meta:            dict,
     cat:             str,
@@ -798,25 +2519,512 @@ def _dest_dir_for(
     else:  # "here"
         base = target / str(meta["folder"])
 
-    if date_subfolders and cat in DATE_MEDIA_CATS:
-        try:
-            dt   = datetime.fromtimestamp(item.stat().st_mtime)
-            base = base / str(dt.year) / f"{dt.month:02d}"
-        except OSError:
-            pass
+    if date_subfolders and cat in tables().date_media_cats and item.mtime:
+        dt   = datetime.fromtimestamp(capture_dates().get(item) or item.mtime)
+        base = base / str(dt.year) / f"{dt.month:02d}"
     return base
 
+class _KeyedLocks:
+    """One lock per key, created on demand and dropped once nobody holds it."""
+
+    def __init__(self) -> None:
+        self._mutex = threading.Lock()
+        self._locks: dict[str, list] = {}   # key → [lock, holders]
+
+    @contextmanager
+    def hold(self, key: str):
+        with self._mutex:
+            slot = self._locks.get(key)
+            if slot is None:
+                slot = self._locks[key] = [threading.Lock(), 0]
+            slot[1] += 1
+        slot[0].acquire()
+        try:
+            yield
+        finally:
+            slot[0].release()
+            with self._mutex:
+                slot[1] -= 1
+                if not slot[1]:
+                    self._locks.pop(key, None)
+
+
+_COPY_SUFFIX_RE = re.compile(r"(?: \(\d+\))+$")
+
+
+def _collision_key(dest_dir: Path, name: str) -> str:
+    """Key shared by every name that can collide with *name* in *dest_dir*.
+
+    "invoice.pdf", "invoice (1).pdf" and "Invoice (2).PDF" all map to the same
+    key, so holding it covers both the duplicate check and the numbered
+    fallback claimed from the DestIndex.
+    """
+    stem, dot, ext = name.rpartition(".")
+    if not dot:
+        stem, ext = name, ""
+    base = _COPY_SUFFIX_RE.sub("", stem)
+    return os.path.normcase(os.path.join(str(dest_dir), f"{base}.{ext}".lower()))
+
+
+def _sort_one(
+    item:            ItemRecord,
+    target:          Path,
+    copy_mode:       bool,
+    date_subfolders: bool,
+    dest_mode:       str,
+    dest_root:       Optional[Path],
+    index:           DestIndex,
+    locks:           Optional[_KeyedLocks] = None,
+    engine:          Optional["MoveEngine"] = None,
+    cat:             Optional[str] = None,
+    dest_dir:        Optional[Path] = None,
+) -> tuple[str, str, Optional[Path]]:
+    """Move or copy one item into its category folder.
+
+    Shared by sort_folder and the watcher's batches.  Returns (category,
+    status, dest) where status is "done" or "dup" and dest is where the item
+    landed (None for duplicates).  Callers that have already classified the
+    item pass *cat* and *dest_dir* so that work is not repeated.  The
+    transfer itself goes through *engine*.  Phase timings go to the active
+    Metrics, if any.
+    """
+    m     = _METRICS
+    start = lap = time.perf_counter()
+    if cat is None or dest_dir is None:
+        cat      = classify(item)
+        dest_dir = _dest_dir_for(item, target, cat_meta(cat), cat, date_subfolders, dest_mode, dest_root)
+        if m is not None:
+            lap = m.lap("classify", lap, cat, item=item.name)
+
+    with (locks.hold(_collision_key(dest_dir, item.name)) if locks else nullcontext()):
+        if m is not None and locks:
+            lap = m.lap("lock_wait", lap, cat, item=item.name)
+        if index.contains(dest_dir, item.name):
+            identical = files_identical(item, dest_dir / item.name)
+            if m is not None:
+                lap = m.lap("hash", lap, cat, item.size, item.name)
+            if identical:
+                if m is not None:
+                    m.count("duplicates")
+                    m.lap("item", start, cat, item=item.name)
+                return cat, "dup", None
+        dest = index.claim(dest_dir, item.name, item.is_dir)
+        if m is not None:
+            lap = m.lap("claim", lap, cat, item=item.name)
+
+        engine = engine or _DIRECT
+        try:
+            how = engine.transfer(item, dest, copy_mode)
+        except BaseException:
+            index.release(dest)
+            raise
+        if m is not None:
+            phase = ("rename" if how == "rename" else
+                     "cross_device_copy" if engine.crosses(item, dest_dir) else "copy")
+            m.lap(phase, lap, cat, item.size, item.name)
+            m.lap("item", start, cat, item.size, item.name)
+        return cat, "done", dest
+
+
+FICLONE = 0x40049409   # linux/fs.h: _IOW(0x94, 9, int)
+
+# errno values meaning "this strategy does not work between these filesystems";
+# the strategy is skipped for the whole device pair from then on
+_UNSUPPORTED = {
+    getattr(errno, name) for name in
+    ("EXDEV", "EOPNOTSUPP", "ENOTSUP", "ENOSYS", "ENOTTY")
+    if hasattr(errno, name)
+}
+# errno values that may only concern this one file (a swapfile, an immutable or
+# odd-sized file, ...): fall back to the next strategy for this file only
+_FALLBACK = _UNSUPPORTED | {
+    getattr(errno, name) for name in ("EINVAL", "ETXTBSY", "EBADF", "EPERM")
+    if hasattr(errno, name)
+}
+
+
+def _copy_reflink(fin: int, fout: int, size: int, bufsize: int) -> None:
+    fcntl.ioctl(fout, FICLONE, fin)
+
+
+def _copy_range(fin: int, fout: int, size: int, bufsize: int) -> None:
+    done = 0
+    while done < size:
+        n = os.copy_file_range(fin, fout, min(size - done, 1 << 30))
+        if n == 0:
+            if done == 0:   # some FUSE/NFS/CIFS mounts and pseudo-files: not supported here
+                raise OSError(errno.EINVAL, "no bytes copied at offset 0")
+            break
+        done += n
+
+
+def _copy_sendfile(fin: int, fout: int, size: int, bufsize: int) -> None:
+    done = 0
+    while done < size:
+        n = os.sendfile(fout, fin, done, min(size - done, 1 << 30))
+        if n == 0:
+            if done == 0:   # some FUSE/NFS/CIFS mounts and pseudo-files: not supported here
+                raise OSError(errno.EINVAL, "no bytes copied at offset 0")
+            break
+        done += n
+
+
+def _copy_buffered(fin: int, fout: int, size: int, bufsize: int) -> None:
+    while True:
+        chunk = os.read(fin, bufsize)
+        if not chunk:
+            break
+        view = memoryview(chunk)
+        pos  = 0
+        while pos < len(chunk):
+            pos += os.write(fout, view[pos:])
+
+
+# Tried in order, per file; each is skipped where the OS does not have it
+_COPY_STRATEGIES: list[tuple[str, Callable[[int, int, int, int], None]]] = [
+    (name, fn) for name, fn, available in (
+        ("reflink",         _copy_reflink,   sys.platform.startswith("linux")),
+        ("copy_file_range", _copy_range,     hasattr(os, "copy_file_range")),
+        ("sendfile",        _copy_sendfile,  sys.platform.startswith("linux") and hasattr(os, "sendfile")),
+        ("buffered",        _copy_buffered,  True),
+    ) if available
+]
+
+
+class VerifyError(OSError):
+    """A verified copy did not read back with the digest its source streamed."""
+
+
+class CopyEngine:
+    """Copies file contents with the cheapest strategy the two filesystems allow.
+
+    Per file it tries a reflink clone (instant on Btrfs/XFS), then
+    copy_file_range and sendfile (data stays in the kernel), then a plain
+    buffered copy.  A strategy that reports "unsupported" for a pair of
+    devices is not tried again for that pair; other recoverable errors
+    (EINVAL, EPERM, ...) only skip it for the file at hand, as does a
+    kernel copy that moves no bytes at all.  A copy that still ends short
+    of the source's size empties *dst* and raises OSError.  Metadata is
+    copied afterwards with shutil.copystat, as shutil.copy2 does.
+
+    With verify=True every copy instead streams through _copy_verified.
+    """
+
+    def __init__(self, bufsize: int = 1024 * 1024) -> None:
+        self.bufsize = bufsize
+        self._lock   = threading.Lock()
+        self._dead: dict[tuple[int, int], set[str]] = {}
+
+    def copy(self, src: str, dst: str, verify: bool = False) -> str:
+        """Copy *src* onto *dst* (contents and metadata); returns the strategy used."""
+        if verify:
+            return self._copy_verified(src, dst)
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fin, fout = fsrc.fileno(), fdst.fileno()
+            sst, dst_st = os.fstat(fin), os.fstat(fout)
+            pair = (sst.st_dev, dst_st.st_dev)
+            dead = self._dead.get(pair, set())
+            for name, fn in _COPY_STRATEGIES:
+                if name in dead and name != "buffered":
+                    continue
+                try:
+                    fn(fin, fout, sst.st_size, self.bufsize)
+                except OSError as exc:
+                    if exc.errno not in _FALLBACK or name == "buffered":
+                        raise
+                    if exc.errno in _UNSUPPORTED:
+                        with self._lock:
+                            self._dead.setdefault(pair, set()).add(name)
+                    os.lseek(fin, 0, os.SEEK_SET)
+                    os.ftruncate(fout, 0)
+                    os.lseek(fout, 0, os.SEEK_SET)
+                    continue
+                break
+            if os.fstat(fout).st_size < os.fstat(fin).st_size:
+                os.ftruncate(fout, 0)
+                raise OSError(errno.EIO, f"{name} copy ended short of its source", dst)
+        shutil.copystat(src, dst)
+        return name
+
+    def _copy_verified(self, src: str, dst: str) -> str:
+        """Copy while hashing, then check *dst* reads back with the same SHA-256.
+
+        A reader thread reads and hashes the next chunk while this thread
+        writes the last one, so the source is read exactly once.  After an
+        fsync the destination is read back once (its cached pages dropped
+        first where the OS allows) and compared.  On a mismatch *dst* is
+        emptied and VerifyError raised; the source is untouched.  The digest
+        goes into the hash cache under both files' keys, so later duplicate
+        checks against either side skip hashing.
+        """
+        chunks: "queue.Queue[bytes]" = queue.Queue(maxsize=4)
+        stop    = threading.Event()
+        failed: list[BaseException] = []
+        h       = hashlib.sha256()
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            sst = os.fstat(fsrc.fileno())
+
+            def reader() -> None:
+                try:
+                    while not stop.is_set():
+                        buf = fsrc.read(self.bufsize)
+                        h.update(buf)
+                        chunks.put(buf)
+                        if not buf:
+                            return
+                except BaseException as exc:
+                    failed.append(exc)
+                    chunks.put(b"")
+
+            t = threading.Thread(target=reader, name="cable-verify-read", daemon=True)
+            t.start()
+            try:
+                while True:
+                    buf = chunks.get()
+                    if not buf:
+                        break
+                    fdst.write(buf)
+            finally:
+                stop.set()
+                while t.is_alive():     # unblock a reader stuck on a full queue
+                    try:
+                        chunks.get(timeout=0.05)
+                    except queue.Empty:
+                        pass
+                t.join()
+            if failed:
+                raise failed[0]
+            fdst.flush()
+            os.fsync(fdst.fileno())
+
+        digest = h.hexdigest()
+        with open(dst, "rb") as fh:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            check = hashlib.sha256()
+            while True:
+                buf = fh.read(self.bufsize)
+                if not buf:
+                    break
+                check.update(buf)
+        if check.hexdigest() != digest:
+            os.truncate(dst, 0)
+            raise VerifyError(errno.EIO, "copy does not match its source", dst)
+
+        shutil.copystat(src, dst)
+        cache = hash_cache()
+        cache.store((sst.st_dev, sst.st_ino, sst.st_size, sst.st_mtime_ns), digest)
+        key = ItemRecord.from_path(Path(dst)).cache_key()
+        if key is not None:
+            cache.store(key, digest)
+        return "verified"
+
+
+class MoveEngine:
+    """Carries out transfers, routed by (source device, destination device).
+
+    A move that stays on one device is a rename and runs on the calling
+    thread.  Anything that crosses devices is a real copy: at most
+    *copy_lanes* of those run at once, each with a COPY_BUFFER sized buffer,
+    so a slow or remote disk neither holds up the renames nor gets thrashed
+    by many small interleaved reads.  File copies (copy mode, or moves
+    across devices) go through a CopyEngine.  Per-lane counts, bytes,
+    active time and the copy strategies used are kept for the summary.
+    """
+
+    COPY_BUFFER = 8 * 1024 * 1024
+
+    def __init__(self, copy_lanes: int = 2, verify: bool = False) -> None:
+        self.copy_lanes = max(1, copy_lanes)
+        self.verify     = verify
+        self._slots = threading.BoundedSemaphore(self.copy_lanes)
+        self._lock  = threading.Lock()
+        self.copier = CopyEngine(self.COPY_BUFFER)
+        self._devs: dict[str, int] = {}
+        # (src_dev, dst_dev) -> [files, bytes, busy_seconds, first_start, last_end, {strategy: files}]
+        self._lanes: dict[tuple[int, int], list] = {}
+
+    def _dev_of(self, d: Path) -> int:
+        """Device of *d*, or of its nearest existing ancestor if it is not there yet."""
+        key = str(d)
+        dev = self._devs.get(key)
+        if dev is None:
+            p = d
+            while True:
+                try:
+                    dev = os.stat(p).st_dev
+                    break
+                except OSError:
+                    if p.parent == p:
+                        dev = -1
+                        break
+                    p = p.parent
+            self._devs[key] = dev
+        return dev
+
+    def lane(self, item: ItemRecord, dest_dir: Path) -> tuple[int, int]:
+        src_dev = item.dev or self._dev_of(item.path.parent)
+        return src_dev, self._dev_of(dest_dir)
+
+    def crosses(self, item: ItemRecord, dest_dir: Path) -> bool:
+        src_dev, dst_dev = self.lane(item, dest_dir)
+        return src_dev != dst_dev
+
+    def transfer(self, item: ItemRecord, dest: Path, copy_mode: bool) -> str:
+        """Move or copy *item* onto its claimed *dest*; returns the strategy used."""
+        src_str = str(item.path)
+        dst_str = str(dest)
+        lane    = self.lane(item, dest.parent)
+        if lane[0] == lane[1]:
+            t0 = time.perf_counter()
+            how = self._one(item, src_str, dst_str, copy_mode, same_device=True)
+        else:
+            t0 = time.perf_counter()
+            with self._slots:
+                t0  = _METRICS.lap("lane_wait", t0, item=item.name) if _METRICS else time.perf_counter()
+                how = self._one(item, src_str, dst_str, copy_mode, same_device=False)
+        self._note(lane, item.size, t0, time.perf_counter(), how)
+        return how
+
+    def _one(self, item: ItemRecord, src: str, dst: str, copy_mode: bool, same_device: bool) -> str:
+        if item.is_dir:
+            if copy_mode:
+                shutil.copy2(src, dst)
+                return "copy2"
+            shutil.move(src, dst)
+            return "rename" if same_device else "copytree"
+        if not copy_mode and same_device:
+            _move_onto(src, dst)
+            return "rename"
+        how = self.copier.copy(src, dst, self.verify)
+        if not copy_mode:
+            if os.stat(dst).st_size != os.stat(src).st_size:
+                raise OSError(errno.EIO, "copy does not match its source's size; source kept", dst)
+            os.unlink(src)
+        return how
+
+    def _note(self, lane: tuple[int, int], size: int, t0: float, t1: float, how: str) -> None:
+        with self._lock:
+            st = self._lanes.get(lane)
+            if st is None:
+                st = self._lanes[lane] = [0, 0, 0.0, t0, t1, {}]
+            st[0] += 1
+            st[1] += size
+            st[2] += t1 - t0
+            st[3]  = min(st[3], t0)
+            st[4]  = max(st[4], t1)
+            st[5][how] = st[5].get(how, 0) + 1
+
+    def report(self) -> list[dict]:
+        """Per-lane totals, renames first.  "seconds" is the time the lane was active."""
+        with self._lock:
+            lanes = sorted(self._lanes.items(), key=lambda kv: (kv[0][0] != kv[0][1], kv[0]))
+            return [
+                {"src_dev": src, "dst_dev": dst, "same_device": src == dst,
+                 "files": st[0], "bytes": st[1], "seconds": min(st[2], st[4] - st[3]),
+                 "strategies": dict(st[5])}
+                for (src, dst), st in lanes
+            ]
+
+
+_DIRECT = MoveEngine()
+
+
+_STREAM_INDEX_NAMES = 50_000
+
+# on_item(item, category, status, dest, error) for headless runs (see _run_transfers)
+ItemCallback = Callable[[ItemRecord, str, str, Optional[Path], Optional[BaseException]], None]
+
+
 def sort_folder(
     target:          Path,
-    items:           list[Path],
+    items:           Iterable[ItemRecord],
     copy_mode:       bool = False,
     date_subfolders: bool = False,
     dest_mode:       str  = "here",
     dest_root:       Optional[Path] = None,
+    workers:         int  = 1,
+    total:           Optional[int] = None,
+    ops_sink:        Optional[Callable[[dict], None]] = None,
+    bounded:         bool = False,
+    engine:          Optional[MoveEngine] = None,
+    on_item:         Optional[ItemCallback] = None,
 ) -> tuple[dict, dict, float, list[dict], int]:
     """
     Returns: (results, size_results, elapsed, ops_log, duplicates_count)
     ops_log entries only written for move operations (for undo support).
+
+    With workers > 1 items are moved on a thread pool; the progress bar and
+    all bookkeeping are driven from the pool's completion queue on this thread.
+    *items* may be a lazy iterator (see walk_items); pass *total* if known.
+    When *ops_sink* is given, undo ops are handed to it as they happen and the
+    returned ops_log stays empty.  *bounded* caps the destination name index
+    so memory does not grow with the number of files.  Items whose
+    destination is on another device are handed to *engine*'s copy lane;
+    pass an engine to read its per-lane report afterwards.  *on_item* makes
+    the run headless (see _run_transfers).
+
+    This classifies and moves in one pass, for streams too big to plan; a
+    listing that fits in memory can go through plan_sort and apply_plan.
+    """
+    engine = engine or MoveEngine()
+    index  = DestIndex(max_names=_STREAM_INDEX_NAMES if bounded else None)
+    locks  = _KeyedLocks()
+
+    # each item is classified once, here; capture dates are read for the
+    # classified window and _sort_one gets the result
+    def classified() -> Iterator[tuple[ItemRecord, str]]:
+        m = _METRICS
+        for item in items:
+            lap = time.perf_counter()
+            cat = classify(item)
+            if m is not None:
+                m.lap("classify", lap, cat, item=item.name)
+            yield item, cat
+
+    def jobs() -> Iterator[tuple[ItemRecord, Path, tuple[str, Path]]]:
+        pairs = classified()
+        if date_subfolders:
+            pairs = capture_dates().prefetching(pairs)
+        for item, cat in pairs:
+            dest_dir = _dest_dir_for(item, target, cat_meta(cat), cat, date_subfolders, dest_mode, dest_root)
+            yield item, dest_dir, (cat, dest_dir)
+
+    def run_one(item: ItemRecord, where: tuple[str, Path]) -> tuple[str, str, Optional[Path]]:
+        return _sort_one(item, target, copy_mode, date_subfolders, dest_mode, dest_root,
+                         index, locks, engine, *where)
+
+    if total is None and isinstance(items, list):
+        total = len(items)
+    out = _run_transfers(jobs(), run_one, copy_mode, workers, total, ops_sink, engine,
+                         pace=workers == 1 and on_item is None, on_item=on_item)
+    flush_hash_cache()
+    flush_capture_dates()
+    return out
+
+
+def _run_transfers(
+    jobs:      Iterable[tuple[ItemRecord, Path, object]],
+    run_one:   Callable[[ItemRecord, object], tuple[str, str, Optional[Path]]],
+    copy_mode: bool,
+    workers:   int,
+    total:     Optional[int],
+    ops_sink:  Optional[Callable[[dict], None]],
+    engine:    MoveEngine,
+    pace:      bool = False,
+    on_item:   Optional[ItemCallback] = None,
+) -> tuple[dict, dict, float, list[dict], int]:
+    """The progress bars, worker pool and copy lane behind sort_folder and apply_plan.
+
+    *jobs* yields (item, destination directory, argument); run_one(item,
+    argument) does the transfer and returns (category, status, dest) with
+    status "done", "dup", "gone" (the source vanished) or "stale" (it changed
+    since planning); the last two are skipped.  *pace*
+    adds the short per-file pause of the single-threaded UI.
+
+    With *on_item* the run is headless: no progress bars, and every outcome
+    goes to on_item(item, category, status, dest, error) on this thread.
+    A failed item then has status "error" and does not stop the run.
     """
     results:      dict[str, int] = {}
     size_results: dict[str, int] = {}
@@ -825,143 +3033,1631 @@ def sort_folder(
 
     t0 = time.perf_counter()
 
+    if on_item is None:
+        from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TaskProgressColumn, TimeElapsedColumn
+        bars = Progress(
+            SpinnerColumn(spinner_name="dots2", style=C_ACCENT),
+            TextColumn("[bold #c4b5fd]{task.description}"),
+            BarColumn(bar_width=36, style=C_PROGRESS, complete_style=C_DONE),
+            TaskProgressColumn(style="#a78bfa"),
+            TextColumn("[dim]·[/]"),
+            TimeElapsedColumn(),
+            TextColumn("[dim]{task.fields[fn]}[/]"),
+            console=console.real,
+            transient=False,
+        )
+    with (bars if on_item is None else nullcontext()) as prog:
+        task  = prog.add_task("Sorting", total=total, fn="") if prog is not None else 0
+        keep  = ops_sink or ops_log.append
+        done: "queue.Queue[tuple]" = queue.Queue()
+        lane_task: Optional[int] = None
+        lane_bytes = 0
+
+        def record(item: ItemRecord, cat: str, status: str, dest: Optional[Path]) -> None:
+            nonlocal duplicates
+            if status == "dup":
+                duplicates += 1
+            elif status == "done":
+                if not copy_mode:
+                    keep({"src": str(item.path), "dst": str(dest), "cat": cat})
+                results[cat]      = results.get(cat, 0) + 1
+                size_results[cat] = size_results.get(cat, 0) + item.size
+            if prog is not None:
+                prog.update(task, advance=1, fn=item.name[:45])  # type: ignore[misc]
+            else:
+                on_item(item, cat, status, dest, None)  # type: ignore[misc]
+
+        def work(item: ItemRecord, arg: object, crossed: bool) -> None:
+            try:
+                done.put((item, crossed, run_one(item, arg), None))
+            except Exception as exc:
+                done.put((item, crossed, None, exc))
+
+        error: Optional[BaseException] = None
+        in_flight = {False: 0, True: 0}
+
+        def drain(block: bool) -> None:
+            nonlocal error
+            while sum(in_flight.values()) and (block or not done.empty()):
+                item, crossed, outcome, exc = done.get()
+                in_flight[crossed] -= 1
+                block = False
+                if crossed and lane_task is not None:
+                    prog.update(lane_task, advance=item.size, fn=item.name[:45])  # type: ignore[misc]
+                if exc is not None:
+                    if _METRICS is not None:
+                        _METRICS.count("errors")
+                    if prog is not None:
+                        error = error or exc
+                        prog.update(task, advance=1, fn=item.name[:45])  # type: ignore[misc]
+                    else:
+                        on_item(item, "", "error", None, exc)  # type: ignore[misc]
+                else:
+                    record(item, *outcome)
+
+        # Same-device items are renamed here (or on the worker pool); items that
+        # cross devices go to the copy lane, which has its own bar in bytes.
+        with ThreadPoolExecutor(max_workers=engine.copy_lanes, thread_name_prefix="cable-copy") as lane, \
+             (ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cable-sort")
+              if workers > 1 else nullcontext()) as pool:
+            for item, dest_dir, arg in jobs:
+                if error is not None:
+                    break
+                if engine.crosses(item, dest_dir):
+                    lane_bytes += item.size
+                    if prog is not None and lane_task is None:
+                        lane_task = prog.add_task("Cross-device", total=lane_bytes, fn="")
+                    elif prog is not None:
+                        prog.update(lane_task, total=lane_bytes)
+                    while in_flight[True] >= engine.copy_lanes * 2:
+                        drain(block=True)
+                    lane.submit(work, item, arg, True)
+                    in_flight[True] += 1
+                elif pool is None:
+                    in_flight[False] += 1
+                    work(item, arg, False)
+                    if pace:
+                        time.sleep(0.008)
+                else:
+                    while in_flight[False] >= workers * 4:
+                        drain(block=True)
+                    pool.submit(work, item, arg, False)
+                    in_flight[False] += 1
+                drain(block=False)
+            while sum(in_flight.values()):
+                drain(block=True)
+        if error is not None:
+            raise error
+
+        if prog is not None and total is None:  # streamed input: settle the bar once the count is known
+            prog.update(task, total=prog.tasks[0].completed)
+
+    return results, size_results, time.perf_counter() - t0, ops_log, duplicates
+
+
+PLAN_VERSION = 1
+
+
+class PlanOp:
+    """One planned transfer: *item* goes to *dest*, or, if *dup*, stays put
+    because *dest* already holds an identical file."""
+    __slots__ = ("item", "cat", "dest", "dup")
+
+    def __init__(self, item: ItemRecord, cat: str, dest: Path, dup: bool = False) -> None:
+        self.item = item
+        self.cat  = cat
+        self.dest = dest
+        self.dup  = dup
+
+
+class SortPlan:
+    """Everything a sort will do, decided in one classification pass.
+
+    Ops keep the scan's order, collisions are already resolved to
+    "name (n)" and duplicates marked, and *mkdirs* lists each destination
+    directory that has to be created, once.  The preview, the category
+    counts and apply_plan all read from here, and save()/load() let a plan
+    made now be reviewed and applied later (--plan-out / --apply).
+    """
+
+    def __init__(
+        self,
+        target:          Path,
+        copy_mode:       bool = False,
+        date_subfolders: bool = False,
+        dest_mode:       str  = "here",
+        dest_root:       Optional[Path] = None,
+    ) -> None:
+        self.target          = target
+        self.copy_mode       = copy_mode
+        self.date_subfolders = date_subfolders
+        self.dest_mode       = dest_mode
+        self.dest_root       = dest_root
+        self.created         = time.time()
+        self.ops:    list[PlanOp] = []
+        self.mkdirs: list[Path]   = []
+
+    @property
+    def duplicates(self) -> int:
+        return sum(1 for op in self.ops if op.dup)
+
+    def counts(self) -> tuple[dict[str, int], dict[str, int]]:
+        """Files and bytes per category that will actually be transferred."""
+        counts: dict[str, int] = {}
+        sizes:  dict[str, int] = {}
+        for op in self.ops:
+            if not op.dup:
+                counts[op.cat] = counts.get(op.cat, 0) + 1
+                sizes[op.cat]  = sizes.get(op.cat, 0) + op.item.size
+        return counts, sizes
+
+    def save(self, path: Path) -> None:
+        data = {
+            "version":         PLAN_VERSION,
+            "created":         datetime.fromtimestamp(self.created).isoformat(timespec="seconds"),
+            "target":          str(self.target),
+            "copy_mode":       self.copy_mode,
+            "date_subfolders": self.date_subfolders,
+            "dest_mode":       self.dest_mode,
+            "dest_root":       str(self.dest_root) if self.dest_root else "",
+            "mkdirs":          [str(d) for d in self.mkdirs],
+            # [path, is_dir, size, mtime_ns, inode, dev, category, dest, duplicate]
+            "ops":             [[*_record_state(op.item), op.cat, str(op.dest), op.dup] for op in self.ops],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "SortPlan":
+        """Read a plan written by save().  Raises OSError or ValueError."""
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(data, dict) or data.get("version") != PLAN_VERSION:
+            raise ValueError(f"{path.name} is not a version {PLAN_VERSION} Cable plan")
+        plan = cls(Path(data["target"]), bool(data["copy_mode"]), bool(data["date_subfolders"]),
+                   str(data["dest_mode"]), Path(data["dest_root"]) if data["dest_root"] else None)
+        plan.created = datetime.fromisoformat(data["created"]).timestamp()
+        plan.mkdirs  = [Path(d) for d in data["mkdirs"]]
+        plan.ops     = [PlanOp(_record_from_state(op[:6]), op[6], Path(op[7]), bool(op[8]))
+                        for op in data["ops"]]
+        return plan
+
+
+def plan_sort(
+    target:          Path,
+    items:           list[ItemRecord],
+    copy_mode:       bool = False,
+    date_subfolders: bool = False,
+    dest_mode:       str  = "here",
+    dest_root:       Optional[Path] = None,
+) -> SortPlan:
+    """Classify *items* once and decide every destination without touching the disk.
+
+    Names already taken at a destination are compared with files_identical,
+    so duplicates are found (and hashed) here rather than during the apply.
+    """
+    plan  = SortPlan(target, copy_mode, date_subfolders, dest_mode, dest_root)
+    index = DestIndex(dry_run=True)
+    m     = _METRICS
+    pairs: list[tuple[ItemRecord, str]] = []
+    for item in items:
+        lap = time.perf_counter()
+        cat = classify(item)
+        if m is not None:
+            m.lap("classify", lap, cat, item=item.name)
+        pairs.append((item, cat))
+    if date_subfolders:
+        capture_dates().prefetch(dated_media(pairs))
+    for item, cat in pairs:
+        lap      = time.perf_counter()
+        dest_dir = _dest_dir_for(item, target, cat_meta(cat), cat, date_subfolders, dest_mode, dest_root)
+        if index.contains(dest_dir, item.name):
+            identical = files_identical(item, dest_dir / item.name)
+            if m is not None:
+                m.lap("hash", lap, cat, item.size, item.name)
+            if identical:
+                plan.ops.append(PlanOp(item, cat, dest_dir / item.name, dup=True))
+                continue
+        plan.ops.append(PlanOp(item, cat, index.claim(dest_dir, item.name, item.is_dir)))
+    plan.mkdirs = index.missing
+    flush_hash_cache()
+    flush_capture_dates()
+    return plan
+
+
+def _apply_one(op: PlanOp, copy_mode: bool, index: DestIndex, engine: MoveEngine) -> tuple[str, str, Optional[Path]]:
+    """Transfer one planned op onto its planned name (or the next free one if
+    something took that name since planning).
+
+    The source is stat()ed first: a vanished one is "gone", and one whose
+    size, mtime or inode differ from the plan's is "stale" and left alone,
+    since its category, destination and duplicate check may no longer hold.
+    """
+    m     = _METRICS
+    item  = op.item
+    dest  = op.dest
+    start = time.perf_counter()
+    try:
+        st = os.stat(item.path)
+    except FileNotFoundError:
+        if m is not None:
+            m.count("missing")
+        return op.cat, "gone", None
+    if (item.inode and st.st_ino != item.inode) or (
+        not item.is_dir and (st.st_size, st.st_mtime_ns) != (item.size, item.mtime_ns)
+    ):
+        if m is not None:
+            m.count("stale")
+        return op.cat, "stale", None
+    try:
+        if not item.is_dir:
+            os.close(os.open(dest, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        elif os.path.lexists(dest):
+            raise FileExistsError(dest)
+    except (FileExistsError, FileNotFoundError):   # name taken, or the directory was removed
+        dest = index.claim(dest.parent, dest.name, item.is_dir)
+    lap = m.lap("claim", start, op.cat, item=item.name) if m is not None else start
+
+    try:
+        how = engine.transfer(item, dest, copy_mode)
+    except FileNotFoundError:
+        index.release(dest)
+        if os.path.lexists(item.path):
+            raise
+        if m is not None:
+            m.count("missing")
+        return op.cat, "gone", None
+    except BaseException:
+        index.release(dest)
+        raise
+    if m is not None:
+        phase = ("rename" if how == "rename" else
+                 "cross_device_copy" if engine.crosses(item, dest.parent) else "copy")
+        m.lap(phase, lap, op.cat, item.size, item.name)
+        m.lap("item", start, op.cat, item.size, item.name)
+    return op.cat, "done", dest
+
+
+def apply_plan(
+    plan:     SortPlan,
+    workers:  int = 1,
+    ops_sink: Optional[Callable[[dict], None]] = None,
+    engine:   Optional[MoveEngine] = None,
+    pace:     bool = False,
+    on_item:  Optional[ItemCallback] = None,
+) -> tuple[dict, dict, float, list[dict], int]:
+    """Carry out *plan*: every missing directory first, then the transfers.
+
+    Returns the same tuple as sort_folder, and takes the same *on_item*.
+    Nothing is classified or hashed again; sources that disappeared or
+    changed since planning are skipped (see _apply_one).
+    """
+    engine = engine or MoveEngine()
+    m      = _METRICS
+    t0     = time.perf_counter()
+    for d in plan.mkdirs:
+        lap = time.perf_counter()
+        d.mkdir(parents=True, exist_ok=True)
+        if m is not None:
+            m.lap("mkdir", lap)
+    dups = plan.duplicates
+    if m is not None and dups:
+        m.count("duplicates", dups)
+    index = DestIndex()   # only asked when a planned name was taken after planning
+    jobs  = ((op.item, op.dest.parent, op) for op in plan.ops if not op.dup)
+    results, size_results, _, ops_log, _ = _run_transfers(
+        jobs, lambda item, op: _apply_one(op, plan.copy_mode, index, engine),  # type: ignore[arg-type]
+        plan.copy_mode, workers, len(plan.ops) - dups, ops_sink, engine, pace, on_item,
+    )
+    return results, size_results, time.perf_counter() - t0, ops_log, dups
+
+
+LINKS_MANIFEST = ".cable_links.json"
+
+
+class LinkView:
+    """The links a virtual sort has made for one source folder.
+
+    Maps each source path to [link path, "hard" | "sym", link inode] and is
+    kept next to the sources, so a refresh only touches what changed: new or
+    replaced files get a link, and links whose source is gone are pruned.
+    """
+
+    def __init__(self, folder: Path) -> None:
+        self.path = folder / LINKS_MANIFEST
+        self.links: dict[str, list] = {}
+        try:
+            self.links = json.loads(self.path.read_text(encoding="utf-8"))["links"]
+        except Exception:
+            pass
+
+    def save(self) -> None:
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"links": self.links}, ensure_ascii=False, separators=(",", ":")),
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def _is_our_link(link: str, kind: str, ino: int) -> bool:
+    """True if *link* is still the link we made (not something a user put in its place)."""
+    try:
+        st = os.lstat(link)
+    except OSError:
+        return False
+    return stat.S_ISLNK(st.st_mode) if kind == "sym" else st.st_ino == ino
+
+
+def _place_link(src: str, dest: Path, hard: bool, is_dir: bool) -> str:
+    """Link *src* onto its claimed *dest*; returns "hard" or "sym".
+
+    The link is made under a temporary name and renamed over the claim's
+    placeholder.  A hardlink the filesystem refuses falls back to a symlink.
+    """
+    tmp = f"{dest}.cable-link-{os.getpid()}-{threading.get_ident()}"
+    kind = "sym"
+    if hard:
+        try:
+            os.link(src, tmp, follow_symlinks=False)
+            kind = "hard"
+        except OSError:
+            pass
+    if kind == "sym":
+        os.symlink(src, tmp, target_is_directory=is_dir)
+    try:
+        os.replace(tmp, dest)
+    except OSError:
+        os.unlink(tmp)
+        raise
+    return kind
+
+
+def link_sort(
+    target:          Path,
+    items:           Iterable[ItemRecord],
+    date_subfolders: bool = False,
+    dest_mode:       str  = "here",
+    dest_root:       Optional[Path] = None,
+    total:           Optional[int] = None,
+) -> dict[str, int]:
+    """Virtual sort: fill the category folders with links instead of moving anything.
+
+    Files get a hardlink when the category folder is on the same device and
+    a symlink otherwise (folders always get a symlink), so no data moves and
+    no space is used.  Running it again refreshes the view incrementally.
+    Returns counts: added, kept, relinked, pruned, hard, sym.
+    """
+    from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TaskProgressColumn, TimeElapsedColumn
+    view   = LinkView(target)
+    engine = MoveEngine()
+    index  = DestIndex()
+    counts = dict.fromkeys(("added", "kept", "relinked", "pruned", "hard", "sym"), 0)
+    seen: set[str] = set()
+
+    # the manifest is saved even if the run stops part way, so the links made
+    # so far are known to the next refresh (kept or pruned, not duplicated)
+    try:
+        with Progress(
+            SpinnerColumn(spinner_name="dots2", style=C_ACCENT),
+            TextColumn("[bold #c4b5fd]{task.description}"),
+            BarColumn(bar_width=36, style=C_PROGRESS, complete_style=C_DONE),
+            TaskProgressColumn(style="#a78bfa"),
+            TextColumn("[dim]·[/]"),
+            TimeElapsedColumn(),
+            TextColumn("[dim]{task.fields[fn]}[/]"),
+            console=console.real,
+        ) as prog:
+            task = prog.add_task("Linking", total=total, fn="")
+            pairs: Iterable[tuple[ItemRecord, str]] = ((item, classify(item)) for item in items)
+            if date_subfolders:
+                pairs = capture_dates().prefetching(pairs)
+            for item, cat in pairs:
+                src = str(item.path)
+                seen.add(src)
+                prog.update(task, advance=1, fn=item.name[:45])  # type: ignore[misc]
+                dest_dir = _dest_dir_for(item, target, cat_meta(cat), cat, date_subfolders, dest_mode, dest_root)
+
+                entry = view.links.get(src)
+                if entry is not None:
+                    link, kind, ino = entry
+                    current = _is_our_link(link, kind, ino)
+                    if current and os.path.dirname(link) == str(dest_dir) and (
+                        kind == "sym" or ino == os.lstat(src).st_ino
+                    ):
+                        counts["kept"] += 1
+                        continue
+                    if current:     # category or date changed, or the file was replaced
+                        os.unlink(link)
+                    counts["relinked"] += 1
+                else:
+                    counts["added"] += 1
+
+                dest = index.claim(dest_dir, item.name, item.is_dir)
+                try:
+                    kind = _place_link(src, dest, not item.is_dir and not engine.crosses(item, dest_dir),
+                                       item.is_dir)
+                except BaseException:
+                    index.release(dest)
+                    raise
+                counts[kind] += 1
+                view.links[src] = [str(dest), kind, os.lstat(dest).st_ino]
+
+            if total is None:
+                prog.update(task, total=prog.tasks[0].completed)
+
+        for src in [s for s in view.links if s not in seen]:
+            link, kind, ino = view.links.pop(src)
+            if _is_our_link(link, kind, ino):
+                try:
+                    os.unlink(link)
+                except OSError:
+                    pass
+            counts["pruned"] += 1
+    finally:
+        view.save()
+    flush_capture_dates()
+    return counts
+
+
+JOURNAL_DIR_NAME = ".cable_undo"
+
+
+def _try_lock(fh) -> bool:
+    """Non-blocking exclusive lock on an open file; False if another process holds it."""
+    try:
+        if sys.platform == "win32":
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+class UndoJournal:
+    """Append-only, crash-safe undo journal for one sort run or watcher session.
+
+    Each run gets its own file under <folder>/.cable_undo/, one JSON array per
+    line: a header, a directory table ("D" lines) and a category table ("K"
+    lines), each entry written the first time it is seen, ops that refer to
+    both by id ("M" lines), a time mark ("T") whenever the clock second
+    changes, then an end marker.  Lines are buffered and fsync'ed in groups,
+    every GROUP_OPS ops or GROUP_SECS seconds and on commit()/close(), so a
+    crash loses at most the last group.  recover_journals() trims a torn
+    tail and seals the run so it can still be undone.  The writer holds an
+    OS lock on the file for as long as it is open.
+    """
+
+    VERSION    = 2
+    GROUP_OPS  = 512
+    GROUP_SECS = 0.5
+
+    def __init__(self, folder: Path, mode: str = "move") -> None:
+        jdir = folder / JOURNAL_DIR_NAME
+        jdir.mkdir(exist_ok=True)
+        self.path  = jdir / f"{time.time_ns()}-{os.getpid()}-{mode}.journal"
+        self.count = 0
+        self._fh   = open(self.path, "a", encoding="utf-8", newline="\n")
+        _try_lock(self._fh)
+        self._lock = threading.Lock()
+        self._dirs: dict[str, int] = {}
+        self._cats: dict[str, int] = {}
+        self._cat_counts: dict[str, int] = {}
+        self._second      = int(time.time())
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+        self._summary = {"mode": mode, "started": self._second, "ended": self._second, "ops": 0, "cats": {}}
+        header = {"started": datetime.now().isoformat(timespec="seconds"), "t": self._second,
+                  "mode": mode, "folder": str(folder)}
+        self._write(["H", self.VERSION, header])
+        self.commit()
+
+    def _write(self, rec: list) -> None:
+        self._fh.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def _dir_id(self, d: str) -> int:
+        i = self._dirs.get(d)
+        if i is None:
+            i = self._dirs[d] = len(self._dirs)
+            self._write(["D", i, d])
+        return i
+
+    def _cat_id(self, cat: str) -> int:
+        i = self._cats.get(cat)
+        if i is None:
+            i = self._cats[cat] = len(self._cats)
+            self._write(["K", i, cat])
+        return i
+
+    def append(self, op: dict) -> None:
+        """Journal one completed move ({"src": ..., "dst": ..., "cat": ...})."""
+        src_dir, src_name = os.path.split(os.path.abspath(op["src"]))
+        dst_dir, dst_name = os.path.split(os.path.abspath(op["dst"]))
+        cat = op.get("cat", MISC_KEY)
+        with self._lock:
+            now = int(time.time())
+            if now != self._second:
+                self._second = now
+                self._write(["T", now])
+            rec = ["M", self._dir_id(src_dir), self._dir_id(dst_dir), self._cat_id(cat), src_name]
+            if dst_name != src_name:
+                rec.append(dst_name)
+            self._write(rec)
+            self.count        += 1
+            self._uncommitted += 1
+            self._cat_counts[cat] = self._cat_counts.get(cat, 0) + 1
+            if (self._uncommitted >= self.GROUP_OPS
+                    or time.monotonic() - self._last_commit >= self.GROUP_SECS):
+                self._commit_locked()
+
+    def _commit_locked(self) -> None:
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def commit(self) -> None:
+        """Group commit: make every op appended so far durable."""
+        with self._lock:
+            if self._fh is not None and (self._uncommitted or not self.count):
+                self._commit_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is None:
+                return
+            self._write(["E", {"ended": datetime.now().isoformat(timespec="seconds"), "ops": self.count}])
+            self._commit_locked()
+            self._fh.close()
+            self._fh = None
+        if not self.count:
+            self.path.unlink(missing_ok=True)
+            return
+        self._summary.update(ended=int(time.time()), ops=self.count, cats=dict(self._cat_counts))
+        UndoHistory(self.path.parent.parent).note(self.path, self._summary)
+
+    def __enter__(self) -> "UndoJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class JournalRun:
+    """A parsed journal: header info, ops as (src, dst, category, time), and whether it was sealed."""
+    __slots__ = ("path", "header", "ops", "sealed")
+
+    def __init__(self, path: Path) -> None:
+        self.path   = path
+        self.header: dict = {}
+        self.ops: list[tuple[str, str, str, int]] = []
+        self.sealed = False
+
+    def summary(self) -> dict:
+        cats: dict[str, int] = {}
+        for op in self.ops:
+            cats[op[2]] = cats.get(op[2], 0) + 1
+        started = int(self.header.get("t", 0))
+        return {
+            "mode":    self.header.get("mode", "move"),
+            "started": started,
+            "ended":   self.ops[-1][3] if self.ops else started,
+            "ops":     len(self.ops),
+            "cats":    cats,
+        }
+
+
+def _scan_journal(fh) -> tuple[JournalRun, int]:
+    """Parse an open journal; returns the run and the byte length of its valid prefix."""
+    run   = JournalRun(Path(fh.name))
+    dirs: dict[int, str] = {}
+    cats: dict[int, str] = {}
+    version = 1
+    now     = 0
+    valid   = 0
+    for raw in fh:
+        if not raw.endswith(b"\n"):
+            break
+        try:
+            rec = json.loads(raw)
+        except ValueError:
+            break
+        kind = rec[0]
+        if kind == "M":
+            if version >= 2:
+                cat, names = cats[rec[3]], rec[4:]
+            else:
+                cat, names = MISC_KEY, rec[3:]
+            src_name = names[0]
+            dst_name = names[1] if len(names) > 1 else src_name
+            run.ops.append((os.path.join(dirs[rec[1]], src_name),
+                            os.path.join(dirs[rec[2]], dst_name), cat, now))
+        elif kind == "D":
+            dirs[rec[1]] = rec[2]
+        elif kind == "K":
+            cats[rec[1]] = rec[2]
+        elif kind == "T":
+            now = rec[1]
+        elif kind == "H":
+            version    = rec[1]
+            run.header = rec[2]
+            now        = int(run.header.get("t", 0))
+        elif kind == "E":
+            run.sealed = True
+        valid += len(raw)
+    return run, valid
+
+
+def _read_journal(path: Path) -> Optional[JournalRun]:
+    try:
+        with open(path, "rb") as fh:
+            return _scan_journal(fh)[0]
+    except (OSError, ValueError, IndexError, KeyError):
+        return None
+
+
+def recover_journals(folder: Path) -> int:
+    """Seal journals left open by a crashed run.  Returns how many were recovered.
+
+    A journal still locked by a live writer (a running watcher) is left alone.
+    """
+    jdir = folder / JOURNAL_DIR_NAME
+    if not jdir.is_dir():
+        return 0
+    recovered = 0
+    for path in sorted(jdir.glob("*.journal")):
+        try:
+            with open(path, "r+b") as fh:
+                if not _try_lock(fh):
+                    continue
+                fh.seek(0)
+                run, valid = _scan_journal(fh)
+                if run.sealed:
+                    continue
+                fh.truncate(valid)
+                fh.seek(valid)
+                fh.write(json.dumps(["E", {"recovered": True, "ops": len(run.ops)}],
+                                    separators=(",", ":")).encode("utf-8") + b"\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+                recovered += 1
+        except OSError:
+            continue
+    return recovered
+
+
+class UndoHistory:
+    """Every undo journal kept for a folder, plus a summary index.
+
+    .cable_undo/index.json caches each sealed journal's summary (mode, time
+    span, op count, ops per category) keyed by file name and validated by
+    size and mtime, so listing and filtering many runs only opens the
+    journals a selection actually touches.  The index is a cache: anything
+    missing or stale is rebuilt from the journal itself.
+    """
+
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
+        self.jdir   = folder / JOURNAL_DIR_NAME
+        self._index_path = self.jdir / "index.json"
+
+    def _load_index(self) -> dict:
+        try:
+            return json.loads(self._index_path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def _save_index(self, index: dict) -> None:
+        try:
+            tmp = self._index_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(index, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self._index_path)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _stamp(path: Path) -> Optional[list[int]]:
+        try:
+            st = path.stat()
+            return [st.st_size, st.st_mtime_ns]
+        except OSError:
+            return None
+
+    def note(self, path: Path, summary: Optional[dict]) -> None:
+        """Record (or with None, drop) one journal's summary in the index."""
+        index = self._load_index()
+        if summary is None:
+            index.pop(path.name, None)
+        else:
+            index[path.name] = {**summary, "stamp": self._stamp(path)}
+        self._save_index(index)
+
+    def runs(self) -> list[dict]:
+        """Summaries of every sealed run with ops, newest first; each has "name" and "id" (1 = newest)."""
+        if not self.jdir.is_dir():
+            return []
+        index   = self._load_index()
+        changed = False
+        out: list[dict] = []
+        names = sorted((p.name for p in self.jdir.glob("*.journal")),
+                       key=lambda n: int(n.split("-")[0]), reverse=True)
+        for name in names:
+            path  = self.jdir / name
+            stamp = self._stamp(path)
+            entry = index.get(name)
+            if entry is None or entry.get("stamp") != stamp:
+                run = _read_journal(path)
+                if run is None or not run.sealed:
+                    continue
+                entry   = {**run.summary(), "stamp": stamp}
+                index[name] = entry
+                changed = True
+            if entry["ops"]:
+                out.append({**entry, "name": name})
+        for stale in set(index) - set(names):
+            del index[stale]
+            changed = True
+        if changed:
+            self._save_index(index)
+        for i, entry in enumerate(out, 1):
+            entry["id"] = i
+        return out
+
+    def select(
+        self,
+        run_ids:  Optional[list[int]] = None,
+        category: Optional[str]       = None,
+        since:    Optional[datetime]  = None,
+        until:    Optional[datetime]  = None,
+        pattern:  Optional[str]       = None,
+    ) -> list[tuple[JournalRun, list[int]]]:
+        """Pick ops to restore: [(run, op indexes)], newest run first.
+
+        With no filter at all this is the newest run, like the old single
+        sort_log.json.  Filters combine; run-level summaries rule out whole
+        journals before any of them is opened.
+        """
+        runs = self.runs()
+        if not any((run_ids, category, since, until, pattern)):
+            runs = runs[:1]
+        elif run_ids:
+            runs = [r for r in runs if r["id"] in run_ids]
+
+        def cat_matches(cat: str) -> bool:
+            assert category is not None
+            label = cat.split("  ")[-1].strip()
+            return category in (cat, label) or category.lower() == label.lower()
+
+        lo = since.timestamp() if since else None
+        hi = until.timestamp() if until else None
+        picked: list[tuple[JournalRun, list[int]]] = []
+        for summary in runs:
+            if category and not any(cat_matches(c) for c in summary["cats"]):
+                continue
+            if lo is not None and summary["ended"] < lo:
+                continue
+            if hi is not None and summary["started"] > hi:
+                continue
+            run = _read_journal(self.jdir / summary["name"])
+            if run is None:
+                continue
+            keep = []
+            for i, (src, _dst, cat, t) in enumerate(run.ops):
+                if category and not cat_matches(cat):
+                    continue
+                if (lo is not None and t < lo) or (hi is not None and t > hi):
+                    continue
+                if pattern and not fnmatch.fnmatch(src if os.sep in pattern or "/" in pattern
+                                                   else os.path.basename(src), pattern):
+                    continue
+                keep.append(i)
+            if keep:
+                picked.append((run, keep))
+        return picked
+
+    def forget(self, run: JournalRun, restored: set[int]) -> None:
+        """Drop restored ops: delete the journal, or rewrite it with what is left."""
+        remaining = [op for i, op in enumerate(run.ops) if i not in restored]
+        if not remaining:
+            run.path.unlink(missing_ok=True)
+            self.note(run.path, None)
+            return
+        tmp = run.path.with_suffix(".rewrite")
+        dirs: dict[str, int] = {}
+        cats: dict[str, int] = {}
+        second = None
+        with open(tmp, "w", encoding="utf-8", newline="\n") as fh:
+            def w(rec: list) -> None:
+                fh.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+            def table(kind: str, table: dict, value: str) -> int:
+                if value not in table:
+                    table[value] = len(table)
+                    w([kind, table[value], value])
+                return table[value]
+
+            w(["H", UndoJournal.VERSION, run.header])
+            for src, dst, cat, t in remaining:
+                if t != second:
+                    second = t
+                    w(["T", t])
+                sd, sn = os.path.split(src)
+                dd, dn = os.path.split(dst)
+                rec = ["M", table("D", dirs, sd), table("D", dirs, dd), table("K", cats, cat), sn]
+                if dn != sn:
+                    rec.append(dn)
+                w(rec)
+            w(["E", {"ops": len(remaining), "partial_undo": True}])
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, run.path)
+        rewritten = JournalRun(run.path)
+        rewritten.header, rewritten.ops, rewritten.sealed = run.header, remaining, True
+        self.note(run.path, rewritten.summary())
+
+
+def _restore_ops(
+    ops:     list[tuple[str, str]],
+    workers: int = 8,
+    cats:    Optional[list[str]] = None,
+) -> tuple[set[int], int]:
+    """Move (src, dst) ops back in parallel.  Returns (restored op indexes, missing count).
+
+    Source directories are recreated in one pass up front.  Ops whose two
+    sides share a device are plain renames and run first; the rest are
+    cross-device copies and follow on the same pool.  *cats* (one category
+    per op) labels the timings recorded into the active Metrics.
+    """
+    from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TaskProgressColumn
+    restored: set[int] = set()
+    fail: int = 0
+
+    m = _METRICS
+    for d in sorted({os.path.dirname(src) for src, _ in ops}):
+        t0 = time.perf_counter()
+        try:
+            os.makedirs(d, exist_ok=True)
+        except OSError:
+            pass
+        if m is not None:
+            m.lap("mkdir", t0)
+
+    dev_cache: dict[str, int] = {}
+
+    def dev(d: str) -> int:
+        if d not in dev_cache:
+            try:
+                dev_cache[d] = os.stat(d).st_dev
+            except OSError:
+                dev_cache[d] = -1
+        return dev_cache[d]
+
+    renames: list[int] = []
+    copies:  list[int] = []
+    for i, (src, dst) in enumerate(ops):
+        same = dev(os.path.dirname(src)) == dev(os.path.dirname(dst))
+        (renames if same else copies).append(i)
+
+    def restore(i: int, phase: str) -> bool:
+        src, dst = ops[i]
+        t0 = time.perf_counter()
+        if not os.path.lexists(dst):
+            return False
+        if os.path.isdir(dst):
+            shutil.move(dst, src)
+        else:
+            _move_onto(dst, src)
+        if m is not None:
+            m.lap(phase, t0, cats[i] if cats else "", os.path.getsize(src) if phase == "copy" else 0)
+        return True
+
     with Progress(
         SpinnerColumn(spinner_name="dots2", style=C_ACCENT),
         TextColumn("[bold #c4b5fd]{task.description}"),
         BarColumn(bar_width=36, style=C_PROGRESS, complete_style=C_DONE),
         TaskProgressColumn(style="#a78bfa"),
-        TextColumn("[dim]·[/]"),
-        TimeElapsedColumn(),
-        TextColumn("[dim]{task.fields[fn]}[/]"),
-        console=console,
-        transient=False,
+        console=console.real,
     ) as prog:
-        task = prog.add_task("Sorting", total=len(items), fn="")
-
-        for item in items:
-            cat       = classify(item)
-            meta      = cat_meta(cat)
-            dest_dir  = _dest_dir_for(item, target, meta, cat, date_subfolders, dest_mode, dest_root)
-            dest_dir.mkdir(parents=True, exist_ok=True)
-            dest      = dest_dir / item.name
-            item_size = _item_size(item)
-
-            if dest.exists():
-                if file_hash(item) == file_hash(dest):
-                    duplicates += 1
-                    prog.update(task, advance=1, fn=item.name[:45])  # type: ignore[misc]
-                    time.sleep(0.008)
-                    continue
-                dest = unique_dest(dest)
-
-            src_str = str(item)
-            dst_str = str(dest)
-            if copy_mode:
-                shutil.copy2(src_str, dst_str)
-            else:
-                shutil.move(src_str, dst_str)
-                ops_log.append({"src": src_str, "dst": dst_str})
+        task = prog.add_task("Restoring", total=len(ops))
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="cable-undo") as pool:
+            for phase, picked in (("rename", renames), ("copy", copies)):
+                futures = {pool.submit(restore, i, phase): i for i in picked}
+                for fut in as_completed(futures):
+                    try:
+                        if fut.result():
+                            restored.add(futures[fut])
+                        else:
+                            fail += 1
+                    except OSError:
+                        fail += 1
+                        if m is not None:
+                            m.count("errors")
+                    prog.update(task, advance=1)
+    return restored, fail
+
+
+def _parse_when(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def virtual_sort(folder: Path, recursive: bool = False) -> None:
+    from rich.panel import Panel
+    console.clear()
+    print_banner()
+    cfg         = load_config()
+    dest_mode   = str(cfg.get("dest_mode", "here"))
+    dest_custom = str(cfg.get("dest_custom", ""))
+    dest_root   = Path(dest_custom) if dest_mode == "where" and dest_custom else None
+    patterns    = list(cfg["exclude_patterns"])
 
-            results[cat]      = results.get(cat, 0) + 1
-            size_results[cat] = size_results.get(cat, 0) + item_size
-            prog.update(task, advance=1, fn=item.name[:45])  # type: ignore[misc]
-            time.sleep(0.008)
+    step_header(1, "Linking Category Views")
+    t0 = time.perf_counter()
+    if recursive:
+        items  = sniffer().prefetching(walk_items(folder, patterns, _prune_dirs(dest_mode, dest_root)))
+        counts = link_sort(folder, items, bool(cfg["date_subfolders"]), dest_mode, dest_root)
+    else:
+        items  = scan_items(folder, patterns)
+        sniffer().prefetch(items)
+        counts = link_sort(folder, items, bool(cfg["date_subfolders"]), dest_mode, dest_root,
+                           total=len(items))
+    elapsed = time.perf_counter() - t0
+
+    msg = (
+        f"  [{C_GOOD}]✔  {counts['added']} added, {counts['relinked']} relinked, "
+        f"{counts['kept']} unchanged, {counts['pruned']} pruned[/]  [dim]in {elapsed:.1f}s[/]\n"
+        f"  [{C_DIM}]New links: {counts['hard']} hardlinks, {counts['sym']} symlinks · "
+        f"nothing was moved or copied.  Run again to refresh.[/]"
+    )
+    console.print()
+    console.print(Panel(msg, title="[bold #34d399]Virtual Sort Complete[/]", border_style="#065f46",
+                        padding=(1, 2)))
+    console.print()
 
-    return results, size_results, time.perf_counter() - t0, ops_log, duplicates
 
-def write_undo_log(target: Path, ops: list[dict]) -> None:
-    log = {
-        "timestamp": datetime.now().isoformat(timespec="seconds"),
-        "mode":      "move",
-        "ops":       ops,
-    }
-    try:
-        (target / "sort_log.json").write_text(
-            json.dumps(log, indent=2), encoding="utf-8"
+def list_undo_history(folder: Path) -> None:
+    from rich import box
+    from rich.panel import Panel
+    from rich.table import Table
+    console.clear()
+    print_banner()
+    recover_journals(folder)
+    runs = UndoHistory(folder).runs()
+    if not runs:
+        console.print(Panel(
+            f"  [{C_DIM}]No undo history in:[/]  [#f9fafb]{folder}[/]",
+            border_style="#4c1d95", padding=(1, 2),
+        ))
+        return
+    t = Table(
+        box=box.SIMPLE_HEAD,
+        border_style="#4c1d95",
+        header_style="bold #a78bfa",
+        show_edge=True,
+        expand=True,
+        title="[bold #c4b5fd]Undo History[/]",
+    )
+    t.add_column("#",          style=C_DIM, width=4, justify="right")
+    t.add_column("Started",    style="#f9fafb", ratio=3)
+    t.add_column("Kind",       style="#60a5fa", ratio=2)
+    t.add_column("Files",      justify="right", width=8)
+    t.add_column("Categories", ratio=6)
+    for run in runs:
+        cats = "  ".join(
+            f"[{cat_meta(c)['color']}]{cat_meta(c)['icon']} {n}[/]"
+            for c, n in sorted(run["cats"].items(), key=lambda x: -x[1])
         )
-    except Exception:
-        pass
+        t.add_row(
+            str(run["id"]),
+            datetime.fromtimestamp(run["started"]).strftime("%Y-%m-%d %H:%M:%S"),
+            "watcher" if run["mode"] == "watch" else "sort",
+            f"[bold #f9fafb]{run['ops']}[/]",
+            cats,
+        )
+    console.print(t)
+    console.print(f"  [{C_DIM}]Undo one with --undo {folder} --undo-run N (repeatable), or filter with "
+                  f"--undo-category / --undo-since / --undo-until / --undo-glob.[/]")
+    console.print()
 
 
-def undo_sort(folder: Path) -> None:
+def undo_sort(
+    folder:   Path,
+    run_ids:  Optional[list[int]] = None,
+    category: Optional[str]       = None,
+    since:    Optional[datetime]  = None,
+    until:    Optional[datetime]  = None,
+    pattern:  Optional[str]       = None,
+    workers:  int                 = 8,
+) -> None:
+    from rich.panel import Panel
     console.clear()
     print_banner()
 
-    log_path = folder / "sort_log.json"
-    if not log_path.exists():
-        console.print(Panel(
-            f"  [{C_BAD}]No sort_log.json found in:[/]  [#f9fafb]{folder}[/]",
-            border_style="#7f1d1d", padding=(1, 2),
-        ))
-        return
-
-    try:
-        log = json.loads(log_path.read_text(encoding="utf-8"))
-    except Exception as exc:
-        console.print(f"  [{C_BAD}]Could not read sort_log.json: {exc}[/]")
-        return
+    recovered = recover_journals(folder)
+    if recovered:
+        console.print(f"  [{C_WARN}]Recovered undo data from {recovered} interrupted run"
+                      f"{'s' if recovered != 1 else ''}.[/]")
 
-    if log.get("mode") != "move":
+    history   = UndoHistory(folder)
+    selection = history.select(run_ids, category, since, until, pattern)
+    log_path  = folder / "sort_log.json"
+    filtered  = any((run_ids, category, since, until, pattern))
+    if not selection and (filtered or not log_path.exists()):
         console.print(Panel(
-            f"  [{C_WARN}]This log is from a copy operation — undo is not available for copies.[/]",
-            border_style="#78350f", padding=(1, 2),
+            f"  [{C_BAD}]Nothing to undo in:[/]  [#f9fafb]{folder}[/]"
+            + (f"\n  [{C_DIM}]No journaled move matches the given filters.[/]" if filtered else ""),
+            border_style="#7f1d1d", padding=(1, 2),
         ))
         return
 
-    ops: list[dict] = log.get("ops", [])
     step_header(1, "Restoring Files")
+    metrics = Metrics("undo", folder)
+    if selection:
+        ok = fail = 0
+        for run, picked in selection:   # newest run first
+            ops = [run.ops[i][:2] for i in picked]
+            with collecting(metrics):
+                restored, missing = _restore_ops(ops, workers, [run.ops[i][2] for i in picked])
+            history.forget(run, {picked[j] for j in restored})
+            ok   += len(restored)
+            fail += missing
+    else:
+        # Log written before the journal existed
+        try:
+            log = json.loads(log_path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            console.print(f"  [{C_BAD}]Could not read sort_log.json: {exc}[/]")
+            return
 
-    ok: int = 0
-    fail: int = 0
-    with Progress(
-        SpinnerColumn(spinner_name="dots2", style=C_ACCENT),
-        TextColumn("[bold #c4b5fd]{task.description}"),
-        BarColumn(bar_width=36, style=C_PROGRESS, complete_style=C_DONE),
-        TaskProgressColumn(style="#a78bfa"),
-        console=console,
-    ) as prog:
-        task = prog.add_task("Restoring", total=len(ops))
-        for op in reversed(ops):
-            src = Path(op["src"])
-            dst = Path(op["dst"])
-            if dst.exists():
-                src.parent.mkdir(parents=True, exist_ok=True)
-                shutil.move(str(dst), str(src))
-                ok += 1
-            else:
-                fail += 1
-            prog.update(task, advance=1)
-
-    log_path.unlink(missing_ok=True)
-
+        if log.get("mode") != "move":
+            console.print(Panel(
+                f"  [{C_WARN}]This log is from a copy operation — undo is not available for copies.[/]",
+                border_style="#78350f", padding=(1, 2),
+            ))
+            return
+        legacy = [(op["src"], op["dst"]) for op in reversed(log.get("ops", []))]
+        with collecting(metrics):
+            restored, fail = _restore_ops(legacy, workers)
+        ok = len(restored)
+        log_path.unlink(missing_ok=True)
+
+    metrics.count("restored", ok)
+    metrics.count("missing", fail)
+    report = metrics.write_report()
     msg = f"  [{C_GOOD}]✔  Restored {ok} file{'s' if ok != 1 else ''}.[/]"
     if fail:
         msg += f"\n  [{C_WARN}]⚠  {fail} file{'s' if fail != 1 else ''} not found (already moved?).[/]"
+    if report is not None:
+        msg += f"\n  [{C_DIM}]Metrics → {report}[/]"
     console.print()
     console.print(Panel(msg, title="[bold #34d399]Undo Complete[/]", border_style="#065f46", padding=(1, 2)))
     console.print()
 
+def apply_saved_plan(
+    path:       Path,
+    workers:    int = 1,
+    copy_lanes: int = 2,
+    verify:     bool = False,
+    trace_path: Optional[Path] = None,
+) -> None:
+    from rich.columns import Columns
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+    from rich.text import Text
+    console.clear()
+    print_banner()
+    try:
+        plan = SortPlan.load(path)
+    except (OSError, ValueError, KeyError, IndexError, TypeError) as exc:
+        console.print(Panel(f"  [{C_BAD}]Could not read plan {path}:[/] {exc}",
+                            border_style="#7f1d1d", padding=(1, 2)))
+        return
+    if not plan.target.is_dir():
+        console.print(Panel(f"  [{C_BAD}]The planned folder no longer exists:[/]  [#f9fafb]{plan.target}[/]",
+                            border_style="#7f1d1d", padding=(1, 2)))
+        return
+
+    step_header(1, "Plan")
+    counts, sizes = plan.counts()
+    moving = sum(counts.values())
+    verb   = "copy" if plan.copy_mode else "move"
+    dest   = ("Defaults" if plan.dest_mode == "defaults" else
+              str(plan.dest_root) if plan.dest_mode == "where" and plan.dest_root else "Here")
+    console.print(Panel(
+        f"  [{C_DIM}]Folder:[/]  [#f9fafb]{plan.target}[/]\n"
+        f"  [{C_DIM}]Planned:[/] {datetime.fromtimestamp(plan.created).strftime('%Y-%m-%d %H:%M')}  "
+        f"[{C_DIM}]·  Dest:[/] {dest}  [{C_DIM}]·  Media:[/] {'YYYY/MM' if plan.date_subfolders else 'flat'}\n"
+        f"  [#fbbf24]{moving}[/] files to {verb} ({_fmt_size(sum(sizes.values()))}), "
+        f"{plan.duplicates} duplicates skipped, {len(plan.mkdirs)} new folders",
+        title="[bold #a78bfa]Saved Plan[/]", border_style="#4c1d95", padding=(1, 2),
+    ))
+    console.print(Columns(
+        [Text(f"  {cat_meta(cat)['icon']} {cat.split('  ')[-1]}: {n}", style=cat_meta(cat)["color"])
+         for cat, n in sorted(counts.items(), key=lambda x: -x[1])[:6]],
+        padding=(0, 1),
+    ))
+    console.print()
+
+    step_header(2, "Confirm")
+    if not moving or not Confirm.ask(f"  [bold #c4b5fd]Apply the plan and {verb} {moving} items?[/]",
+                                     default=True, console=console.real):
+        console.print()
+        console.print("  [bold #fbbf24]Nothing was moved.[/]")
+        console.print()
+        return
+
+    step_header(3, "Applying")
+    recover_journals(plan.target)
+    journal = None if plan.copy_mode else UndoJournal(plan.target)
+    engine  = MoveEngine(copy_lanes=copy_lanes, verify=verify)
+    metrics = Metrics(verb, plan.target)
+    tracer  = Tracer(trace_path) if trace_path else None
+    activate_tracer(tracer)
+    try:
+        with collecting(metrics):
+            results, size_results, elapsed, _, duplicates = apply_plan(
+                plan, workers, journal.append if journal else None, engine,
+            )
+    finally:
+        if journal is not None:
+            journal.close()
+        if tracer is not None:
+            activate_tracer(None)
+            tracer.close()
+
+    missing = metrics.counters.get("missing", 0)
+    if missing:
+        console.print(f"\n  [{C_WARN}]⚠  {missing} planned file{'s' if missing != 1 else ''} no longer there "
+                      f"(skipped).[/]")
+    stale = metrics.counters.get("stale", 0)
+    if stale:
+        console.print(f"\n  [{C_WARN}]⚠  {stale} file{'s' if stale != 1 else ''} changed since planning "
+                      f"(skipped; plan again to sort {'them' if stale != 1 else 'it'}).[/]")
+    if journal is not None and journal.count:
+        console.print(f"\n  [{C_DIM}]Undo journal saved \u2192 [bold]{JOURNAL_DIR_NAME}/{journal.path.name}[/]  "
+                      f"(run with --undo to restore)[/]")
+    report = metrics.write_report()
+    if report is not None:
+        console.print(f"  [{C_DIM}]Metrics report \u2192 {report}[/]")
+    console.print()
+    console.print(build_summary(results, size_results, elapsed, plan.copy_mode, duplicates,
+                                engine.report(), metrics.report()["phases"]))
+    console.print()
+    console.print(build_stats_panel(results, size_results))
+    console.print()
+
+
+# Exit codes of a headless --sort run
+EXIT_OK          = 0     # everything sorted (or nothing to sort)
+EXIT_PARTIAL     = 1     # some items failed; the rest were sorted
+EXIT_USAGE       = 2     # bad arguments (argparse's own code)
+EXIT_FAILED      = 3     # the run could not start or stopped early (missing folder, I/O error)
+EXIT_INTERRUPTED = 130   # Ctrl+C / SIGINT
+
+
+class EventStream:
+    """NDJSON events for --sort --ndjson: one JSON object per line.
+
+    Lines go through the stream's own buffer and are flushed at most every
+    *interval* seconds (and on close), so a consumer sees progress as it
+    happens without a flush per file.  If the reader goes away (a closed
+    pipe), the rest of the events are dropped and the sort carries on.
+    """
+
+    def __init__(self, stream, interval: float = 0.2) -> None:
+        self._stream   = stream
+        self.interval  = interval
+        self._flushed  = time.monotonic()
+
+    def emit(self, event: str, **fields) -> None:
+        try:
+            self._stream.write(json.dumps({"event": event, **fields}, ensure_ascii=False) + "\n")
+            now = time.monotonic()
+            if now - self._flushed >= self.interval:
+                self._stream.flush()
+                self._flushed = now
+        except BrokenPipeError:
+            self._drop()
+
+    def close(self) -> None:
+        try:
+            self._stream.flush()
+        except BrokenPipeError:
+            self._drop()
+
+    def _drop(self) -> None:
+        # Point the descriptor at devnull so the interpreter's final flush does not fail too
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, self._stream.fileno())
+        os.close(devnull)
+
+
+def headless_sort(
+    target:     Path,
+    cfg:        dict,
+    workers:    int  = 1,
+    copy_lanes: int  = 2,
+    verify:     bool = False,
+    recursive:  bool = False,
+    stream:     bool = False,
+    ndjson:     bool = False,
+    dry_run:    bool = False,
+    plan_out:   Optional[Path] = None,
+    trace_path: Optional[Path] = None,
+) -> int:
+    """Sort *target* with no prompts and no Rich output; returns an exit code.
+
+    *cfg* holds the session keys (cable.json's, with the command line's
+    overrides applied).  A flat folder is planned and then applied, so
+    --dry-run and --plan-out can stop after planning; --recursive and
+    --stream sort in one pass.  Failed items are reported and skipped
+    instead of stopping the run.  With *ndjson*, stdout gets a "start"
+    event, one "op" event per item and a closing "summary".
+    """
+    events          = EventStream(sys.stdout) if ndjson else None
+    copy_mode       = bool(cfg["copy_mode"])
+    date_subfolders = bool(cfg["date_subfolders"])
+    dest_mode       = str(cfg["dest_mode"])
+    dest_root       = Path(cfg["dest_custom"]) if dest_mode == "where" and cfg["dest_custom"] else None
+    patterns        = list(cfg["exclude_patterns"])
+    done_status     = "copied" if copy_mode else "moved"
+    totals          = {done_status: 0, "bytes": 0, "duplicates": 0, "missing": 0, "stale": 0, "errors": 0}
+    tally           = {"duplicate": "duplicates", "missing": "missing", "stale": "stale", "error": "errors"}
+    by_category: dict[str, int] = {}
+    plan: Optional[SortPlan] = None
+    t0              = time.perf_counter()
+
+    def fail(message: str) -> int:
+        if events is not None:
+            events.emit("summary", status="failed", error=message, exit=EXIT_FAILED)
+            events.close()
+        else:
+            print(f"cable: error: {message}", file=sys.stderr)
+        return EXIT_FAILED
+
+    if not target.is_dir():
+        return fail(f"{target} is not a directory")
+    if events is not None:
+        events.emit("start", folder=str(target), mode="copy" if copy_mode else "move", dest_mode=dest_mode,
+                    dest=str(dest_root or ""), date_subfolders=date_subfolders, dry_run=dry_run)
+
+    def on_item(item: ItemRecord, cat: str, status: str, dest: Optional[Path],
+                exc: Optional[BaseException]) -> None:
+        status = {"done": done_status, "dup": "duplicate", "gone": "missing"}.get(status, status)
+        label  = cat.split("  ")[-1].strip()
+        if status == done_status:
+            totals[done_status] += 1
+            totals["bytes"]     += item.size
+            by_category[label]   = by_category.get(label, 0) + 1
+        elif status in tally:
+            totals[tally[status]] += 1
+        if events is not None:
+            ev = {"status": status, "src": str(item.path), "dst": str(dest) if dest else None,
+                  "category": label or None, "bytes": item.size}
+            if exc is not None:
+                ev["error"] = str(exc)
+            events.emit("op", **ev)
+        elif exc is not None:
+            print(f"cable: {item.path}: {exc}", file=sys.stderr)
+
+    metrics = Metrics("copy" if copy_mode else "move", target)
+    tracer  = Tracer(trace_path) if trace_path else None
+    journal: Optional[UndoJournal] = None
+    code    = EXIT_OK
+    activate_tracer(tracer)
+    try:
+        with collecting(metrics):
+            engine = MoveEngine(copy_lanes=copy_lanes, verify=verify)
+            if recursive or stream:
+                if recursive:
+                    items: Iterable[ItemRecord] = walk_items(target, patterns, _prune_dirs(dest_mode, dest_root))
+                else:
+                    _, items = external_sorted(iter_items(target, patterns),
+                                               key=lambda r: _item_sort_key(r, str(cfg["sort_mode"])))
+                items = sniffer().prefetching(items)
+                recover_journals(target)
+                journal = None if copy_mode else UndoJournal(target)
+                sort_folder(target, items, copy_mode, date_subfolders, dest_mode, dest_root, workers,
+                            ops_sink=journal.append if journal else None, bounded=True, engine=engine,
+                            on_item=on_item)
+            else:
+                lap   = time.perf_counter()
+                items = sorted_items(scan_items(target, patterns), str(cfg["sort_mode"]))
+                metrics.lap("scan", lap, nbytes=sum(i.size for i in items))
+                sniffer().prefetch(items)
+                plan = plan_sort(target, items, copy_mode, date_subfolders, dest_mode, dest_root)
+                if plan_out is not None:
+                    plan.save(plan_out)
+                for op in plan.ops:
+                    if op.dup:
+                        on_item(op.item, op.cat, "dup", op.dest, None)
+                    elif dry_run or plan_out is not None:
+                        on_item(op.item, op.cat, "planned", op.dest, None)
+                if not (dry_run or plan_out is not None):
+                    recover_journals(target)
+                    journal = None if copy_mode else UndoJournal(target)
+                    apply_plan(plan, workers, journal.append if journal else None, engine, on_item=on_item)
+    except KeyboardInterrupt:
+        code = EXIT_INTERRUPTED
+    except OSError as exc:
+        return fail(str(exc))
+    except Exception as exc:
+        return fail(f"{type(exc).__name__}: {exc}")
+    finally:
+        if journal is not None:
+            journal.close()
+        if tracer is not None:
+            activate_tracer(None)
+            tracer.close()
+
+    if code == EXIT_OK and totals["errors"]:
+        code = EXIT_PARTIAL
+    report  = metrics.write_report() if not (dry_run or plan_out) else None
+    elapsed = time.perf_counter() - t0
+    status  = {EXIT_OK: "ok", EXIT_PARTIAL: "partial", EXIT_INTERRUPTED: "interrupted"}[code]
+    if events is not None:
+        events.emit("summary", status=status, **totals, seconds=round(elapsed, 3), categories=by_category,
+                    journal=str(journal.path) if journal is not None and journal.count else None,
+                    plan=str(plan_out) if plan_out else None, metrics=str(report) if report else None,
+                    exit=code)
+        events.close()
+    elif plan is not None and (dry_run or plan_out):
+        print(f"Planned {len(plan.ops) - plan.duplicates} files, {plan.duplicates} duplicates, "
+              f"{len(plan.mkdirs)} new folders" + (f"; plan saved to {plan_out}" if plan_out else ""))
+    else:
+        print(f"{done_status.capitalize()} {totals[done_status]} files ({_fmt_size(totals['bytes'])}) "
+              f"in {elapsed:.1f}s; {totals['duplicates']} duplicates, {totals['missing']} missing, {totals['stale']} stale, "
+              f"{totals['errors']} errors")
+    return code
+
+
 LOG_FILE = Path.home() / ".sort_watcher.log"
 
 def create_icon_image():
+    from PIL import Image, ImageDraw
     img = Image.new("RGBA", (64, 64), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     draw.polygon([(8, 16), (24, 16), (32, 24), (56, 24), (56, 52), (8, 52)], fill="#a78bfa")
     draw.rectangle([(8, 24), (56, 52)], fill="#818cf8")
     return img
 
-class SortingHandler(FileSystemEventHandler):  # type: ignore[misc,valid-type]
-    def __init__(self, target_folder, icon, dest_mode_override: str = "", dest_custom_override: str = ""):
+class DebounceScheduler:
+    """Coalesces events per key and fires *callback(batch)* once keys go quiet.
+
+    One thread and a deadline heap replace a threading.Timer per path.
+    Re-scheduling a key only records a newer sequence number; the stale heap
+    entry is skipped when it surfaces, so a create followed by any number of
+    modifies is one job.  When the earliest key falls due, the scheduler
+    waits *window* seconds more and hands every key due by then (up to
+    *max_batch*) to a bounded worker pool as one batch.
+
+    Backpressure: schedule() blocks once *max_pending* keys are waiting,
+    and the scheduler blocks for a free worker instead of queueing batches.
+    """
+
+    def __init__(
+        self,
+        callback:    Callable[[list[str]], None],
+        delay:       float = 2.0,
+        workers:     int   = 4,
+        window:      float = 0.25,
+        max_batch:   int   = 256,
+        max_pending: int   = 100_000,
+    ) -> None:
+        self.delay       = delay
+        self.window      = window
+        self.max_batch   = max_batch
+        self.max_pending = max_pending
+        self._callback   = callback
+        self._heap: list[tuple[float, int, str]] = []
+        self._live: dict[str, int] = {}
+        self._first: dict[str, float] = {}   # key -> first event since its last dispatch (metrics on)
+        self._seq        = 0
+        self._cv         = threading.Condition()
+        self._stopped    = False
+        self._slots      = threading.BoundedSemaphore(workers)
+        self._pool       = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cable-watch")
+        self._counters   = {"events": 0, "coalesced": 0, "batches": 0, "in_flight": 0, "peak_pending": 0}
+        self._thread     = threading.Thread(target=self._run, name="cable-debounce", daemon=True)
+        self._thread.start()
+
+    def schedule(self, key: str, delay: Optional[float] = None) -> None:
+        with self._cv:
+            while len(self._live) >= self.max_pending and key not in self._live and not self._stopped:
+                self._cv.wait()
+            c = self._counters
+            c["events"] += 1
+            if key in self._live:
+                c["coalesced"] += 1
+            elif _METRICS is not None:
+                self._first[key] = time.perf_counter()
+            self._seq += 1
+            self._live[key] = self._seq
+            c["peak_pending"] = max(c["peak_pending"], len(self._live))
+            heapq.heappush(self._heap, (time.monotonic() + (self.delay if delay is None else delay),
+                                        self._seq, key))
+            if self._heap[0][1] == self._seq:
+                self._cv.notify_all()
+
+    @property
+    def pending(self) -> int:
+        with self._cv:
+            return len(self._live)
+
+    def stats(self) -> dict:
+        """Queue-depth counters: pending keys, batches in flight, totals so far."""
+        with self._cv:
+            return {"pending": len(self._live), **self._counters}
+
+    def stop(self) -> None:
+        with self._cv:
+            self._stopped = True
+            self._cv.notify_all()
+        self._thread.join()
+        self._pool.shutdown(wait=True)
+
+    def _next_batch(self) -> Optional[list[str]]:
+        with self._cv:
+            batch_due: Optional[float] = None
+            while not self._stopped:
+                if not self._heap:
+                    self._cv.wait()
+                    continue
+                now = time.monotonic()
+                due = self._heap[0][0]
+                if batch_due is None:
+                    if due > now:
+                        self._cv.wait(due - now)
+                        continue
+                    batch_due = now + self.window
+                if now < batch_due and len(self._live) < self.max_batch:
+                    self._cv.wait(batch_due - now)
+                    continue
+                batch: list[str] = []
+                while self._heap and self._heap[0][0] <= now and len(batch) < self.max_batch:
+                    _, seq, key = heapq.heappop(self._heap)
+                    if self._live.get(key) == seq:
+                        del self._live[key]
+                        batch.append(key)
+                if not batch:
+                    batch_due = None
+                    continue
+                if self._first:
+                    self._note_waits(batch)
+                self._counters["batches"] += 1
+                self._cv.notify_all()   # wake producers blocked on max_pending
+                return batch
+            return None
+
+    def _note_waits(self, batch: list[str]) -> None:
+        """Record how long each key sat in the queue, from its first event to now."""
+        m, tr = _METRICS, _TRACER
+        now   = time.perf_counter()
+        for key in batch:
+            since = self._first.pop(key, None)
+            if since is None:
+                continue
+            if m is not None:
+                m.observe("debounce", now - since)
+            if tr is not None:
+                tr.wait("debounce", key, since, now)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            t0 = time.perf_counter()
+            self._slots.acquire()
+            if _METRICS is not None:
+                _METRICS.lap("worker_wait", t0, item=f"{len(batch)} paths")
+            with self._cv:
+                self._counters["in_flight"] += 1
+            self._pool.submit(self._fire, batch)
+
+    def _fire(self, batch: list[str]) -> None:
+        try:
+            self._callback(batch)
+        except Exception as e:
+            logging.error(f"[ERR]  Watcher batch of {len(batch)} failed: {e}")
+        finally:
+            with self._cv:
+                self._counters["in_flight"] -= 1
+            self._slots.release()
+
+
+def _flush_log() -> None:
+    """Write out log records buffered by the watcher's MemoryHandler."""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+SNAPSHOT_DIR = Path.home() / ".cable_snapshots"
+
+
+class FolderSnapshot:
+    """Last known (size, mtime_ns) of every file a watcher saw in its folder.
+
+    Persisted as compact JSON per watched folder, so a restarted daemon can
+    tell which files arrived (or changed) while it was down without pushing
+    everything through the pipeline again.  *loaded* is False until a
+    listing exists, either read from disk or taken by a first sweep.
+    """
+
+    def __init__(self, folder: Path) -> None:
+        key = hashlib.sha1(os.path.normcase(str(folder)).encode("utf-8")).hexdigest()[:16]
+        self.path = SNAPSHOT_DIR / f"{key}.json"
+        self.entries: dict[str, tuple[int, int]] = {}
+        self.dir_mtime_ns = 0
+        self.loaded = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.entries = {k: (v[0], v[1]) for k, v in data["entries"].items()}
+            self.dir_mtime_ns = int(data.get("dir_mtime_ns", 0))
+            self.loaded = True
+        except Exception:
+            pass
+
+    def save(self) -> None:
+        try:
+            SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps({"dir_mtime_ns": self.dir_mtime_ns, "entries": self.entries},
+                           separators=(",", ":")),
+                encoding="utf-8",
+            )
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+
+class SortingHandler:
+    """watchdog event handler; dispatch() mirrors FileSystemEventHandler's."""
+
+    def __init__(
+        self,
+        target_folder,
+        icon,
+        dest_mode_override:   str = "",
+        dest_custom_override: str = "",
+        workers:              int = 4,
+        batch_window:         float = 0.25,
+        verify:               bool = False,
+        metrics_path:         Optional[Path] = None,
+        trace_path:           Optional[Path] = None,
+    ):
         self.target = Path(target_folder).resolve()
         self.icon = icon
-        self.cfg = load_config()
         # CLI-supplied overrides always win over whatever is in the config file
-        if dest_mode_override:
-            self.cfg["dest_mode"]   = dest_mode_override
-            self.cfg["dest_custom"] = dest_custom_override
+        overrides = {"dest_mode": dest_mode_override, "dest_custom": dest_custom_override} if dest_mode_override else {}
+        self.config = ConfigStore(overrides)
+        self.config.start()
         self.sorted_count = 0
-        self._lock = threading.Lock()
-        self._timers: dict[str, threading.Timer] = {}
+        self._count_lock  = threading.Lock()
+        self._src_locks   = _KeyedLocks()   # one job per source path at a time
+        self._dest_locks  = _KeyedLocks()   # duplicate check + claim + transfer per destination name
+        self._index       = DestIndex()     # kept for the whole session, updated by every claim
+        self._engine      = MoveEngine(verify=verify)   # cross-device copies share two lanes across batches
+        self._scheduler   = DebounceScheduler(self.process_batch, delay=2.0, workers=workers,
+                                              window=batch_window)
+        self._snapshot    = FolderSnapshot(self.target)
+        # the session's Metrics; exported to a Prometheus text file (see start_metrics)
+        self.metrics      = Metrics("watch", self.target)
+        self.metrics_path = metrics_path or METRICS_DIR / f"watch-{self._snapshot.path.stem}.prom"
+        self._prev_metrics = activate_metrics(self.metrics)
+        self._exporter: Optional[threading.Thread] = None
+        self.tracer       = Tracer(trace_path) if trace_path else None
+        self._prev_tracer = activate_tracer(self.tracer) if self.tracer else None
+        recover_journals(self.target)
+        self._journal     = UndoJournal(self.target, mode="watch")
+        self._sweep_stop  = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+
+    def dispatch(self, event):
+        handler = getattr(self, f"on_{event.event_type}", None)
+        if handler is not None:
+            handler(event)
 
     def on_created(self, event):
         if not event.is_directory:
@@ -972,88 +4668,231 @@ class SortingHandler(FileSystemEventHandler):  # type: ignore[misc,valid-type]
             self._schedule(event.src_path)
 
     def _schedule(self, src_path):
-        with self._lock:
-            if src_path in self._timers:
-                self._timers[src_path].cancel()
-            timer = threading.Timer(2.0, self.process_file, args=[src_path])
-            self._timers[src_path] = timer
-            timer.start()
+        self._scheduler.schedule(src_path)
+
+    def lane_stats(self) -> list[dict]:
+        return self._engine.report()
+
+    def queue_stats(self) -> dict:
+        return self._scheduler.stats()
+
+    @property
+    def cfg(self) -> dict:
+        return self.config.cfg
+
+    def sweep(self, force: bool = False) -> int:
+        """Catch up on files the event stream never reported.
+
+        Diffs a fresh scandir of the folder against the persisted snapshot
+        and schedules only entries that are new or whose size/mtime moved.
+        With no snapshot yet (a first start) the listing is only recorded:
+        files already in the folder stay put, as they always have.  Unless
+        *force*d, nothing is listed while the folder's own mtime is
+        unchanged since the last sweep.  Returns the number of paths pushed.
+        """
+        try:
+            dir_mtime_ns = os.stat(self.target).st_mtime_ns
+        except OSError:
+            return 0
+        snap = self._snapshot
+        if not force and dir_mtime_ns == snap.dir_mtime_ns:
+            return 0
+
+        skip_root = tables().skip_root
+        baseline  = not snap.loaded
+        fresh: dict[str, tuple[int, int]] = {}
+        pushed = 0
+        with os.scandir(self.target) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith(".") or name in skip_root or name == "sort_log.json":
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                state = (st.st_size, st.st_mtime_ns)
+                fresh[name] = state
+                if not baseline and snap.entries.get(name) != state:
+                    self._schedule(entry.path)
+                    pushed += 1
+
+        snap.entries      = fresh
+        snap.dir_mtime_ns = dir_mtime_ns
+        snap.loaded       = True
+        snap.save()
+        if pushed:
+            logging.info(f"[SWEEP] {pushed} file{'s' if pushed != 1 else ''} queued from catch-up scan")
+        return pushed
+
+    def start_sweeps(self, interval: float = 300.0) -> None:
+        """Sweep once now, then every *interval* seconds in the background."""
+        def loop() -> None:
+            force = True
+            while True:
+                try:
+                    self.sweep(force=force)
+                    force = False
+                except Exception as e:
+                    logging.error(f"[SWEEP] Catch-up scan failed: {e}")
+                if self._sweep_stop.wait(interval):
+                    return
+
+        self._sweeper = threading.Thread(target=loop, name="cable-sweep", daemon=True)
+        self._sweeper.start()
+
+    def export_metrics(self) -> None:
+        """Refresh the Prometheus text file with the session's metrics and queue state."""
+        self.metrics.gauges.update({f"queue_{k}": v for k, v in self.queue_stats().items()})
+        self.metrics.gauges["sorted_files"] = self.sorted_count
+        try:
+            self.metrics.write_prometheus(self.metrics_path)
+            if self.tracer is not None:
+                self.tracer.flush()
+        except OSError as e:
+            logging.error(f"[METRICS] Could not write {self.metrics_path}: {e}")
+
+    def start_metrics(self, interval: float = 15.0) -> None:
+        """Export now, then every *interval* seconds in the background."""
+        def loop() -> None:
+            self.export_metrics()
+            while not self._sweep_stop.wait(interval):
+                self.export_metrics()
+
+        self._exporter = threading.Thread(target=loop, name="cable-metrics", daemon=True)
+        self._exporter.start()
+
+    def close(self) -> None:
+        self._sweep_stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+        if self._exporter is not None:
+            self._exporter.join()
+        self._scheduler.stop()
+        self.config.stop()
+        self._journal.close()
+        if self._exporter is not None:
+            self.export_metrics()
+            self.metrics.write_report()
+        activate_metrics(self._prev_metrics)
+        if self.tracer is not None:
+            activate_tracer(self._prev_tracer)
+            self.tracer.close()
 
     def process_file(self, src_str):
-        with self._lock:
-            self._timers.pop(src_str, None)
-                
-            self.cfg = load_config()
+        self.process_batch([src_str])
+
+    def process_batch(self, paths: list[str]) -> None:
+        """Sort one coalesced batch through the same executor as sort_folder.
+
+        The session-wide DestIndex makes each destination's mkdir and
+        listing happen once, collisions share its counters, and the batch's
+        log lines are written out together at the end.
+        """
+        cfg             = self.cfg
+        patterns        = list(cfg.get("exclude_patterns", []))
+        copy_mode       = bool(cfg.get("copy_mode"))
+        date_subfolders = bool(cfg.get("date_subfolders"))
+        dest_mode       = str(cfg.get("dest_mode", "here"))
+        dest_custom     = str(cfg.get("dest_custom", ""))
+        dest_root       = Path(dest_custom) if dest_mode == "where" and dest_custom else None
+        skip_root       = tables().skip_root
+        verb            = "COPY" if copy_mode else "MOVE"
+        sorted_now      = 0
+        metrics         = self.metrics
+        t_batch         = time.perf_counter()
+
+        for src_str in paths:
             src = Path(src_str)
-            if not src.exists():
-                return
-                
-            if src.parent.resolve() != self.target:
-                return
-                
-            if src.name in SKIP_ROOT or src.name.startswith(".") or src.name == "sort_log.json":
-                return
-                
-            if apply_excludes([src], list(self.cfg.get("exclude_patterns", []))) == []:
-                return
-                
-            cat = classify(src)
-            meta = cat_meta(cat)
-            date_subfolders = bool(self.cfg.get("date_subfolders"))
-            dest_mode      = str(self.cfg.get("dest_mode", "here"))
-            dest_custom    = str(self.cfg.get("dest_custom", ""))
-            dest_root      = Path(dest_custom) if dest_mode == "where" and dest_custom else None
-
-            dest_dir = _dest_dir_for(src, self.target, meta, cat, date_subfolders, dest_mode, dest_root)
-            dest = dest_dir / src.name
-            
-            if src.resolve() == dest.resolve():
-                return
-                
-            if dest.exists():
-                if file_hash(src) == file_hash(dest):
-                    logging.warning(f"[SKIP] Identical file exists: {src.name}")
-                    return
-                dest = unique_dest(dest)
-                
-            copy_mode = bool(self.cfg.get("copy_mode"))
-            
-            try:
-                dest_dir.mkdir(parents=True, exist_ok=True)
-                # Use full path for log when dest is outside the watched folder
+            if src.parent != self.target:
+                continue
+            if src.name in skip_root or src.name.startswith(".") or src.name == "sort_log.json":
+                continue
+            if patterns and _is_excluded(src.name, patterns):
+                continue
+
+            t0 = time.perf_counter()
+            with self._src_locks.hold(src_str):
+                t0 = metrics.lap("lock_wait", t0, item=src.name)
                 try:
-                    folder_name = dest.parent.relative_to(self.target)
-                except ValueError:
-                    folder_name = dest.parent
-                if copy_mode:
-                    shutil.copy2(str(src), str(dest))
-                    logging.info(f"[COPY] {src.name}  ->  {folder_name}")
-                else:
-                    shutil.move(str(src), str(dest))
-                    logging.info(f"[MOVE] {src.name}  ->  {folder_name}")
-                
-                self.sorted_count += 1
-                self.icon.title = f"Folder Sorter Watcher\n{self.target.name}\nSorted: {self.sorted_count}"
-            except PermissionError:
-                self._schedule(src_str)
-            except Exception as e:
-                logging.error(f"[ERR]  Could not process {src.name}: {e}")
+                    rec = ItemRecord.from_path(src)
+                except OSError:
+                    continue
+                t0       = metrics.lap("scan", t0, item=src.name)
+                cat      = classify(rec)
+                dest_dir = _dest_dir_for(rec, self.target, cat_meta(cat), cat, date_subfolders,
+                                         dest_mode, dest_root)
+                metrics.lap("classify", t0, cat, item=src.name)
+                if dest_dir == self.target:
+                    continue
+                try:
+                    cat, status, dest = _sort_one(rec, self.target, copy_mode, date_subfolders,
+                                                  dest_mode, dest_root, self._index, self._dest_locks,
+                                                  self._engine, cat, dest_dir)
+                except PermissionError:
+                    metrics.count("retried")
+                    self._schedule(src_str)
+                    continue
+                except Exception as e:
+                    metrics.count("errors")
+                    logging.error(f"[ERR]  Could not process {src.name}: {e}")
+                    continue
 
-def run_watcher(target_folder: Path, dest_mode_override: str = "", dest_custom_override: str = "") -> None:
+            if status == "dup":
+                logging.warning(f"[SKIP] Identical file exists: {src.name}")
+                continue
+            assert dest is not None
+            # Use full path for log when dest is outside the watched folder
+            try:
+                folder_name = dest.parent.relative_to(self.target)
+            except ValueError:
+                folder_name = dest.parent
+            logging.info(f"[{verb}] {src.name}  ->  {folder_name}")
+            if not copy_mode:
+                self._journal.append({"src": src_str, "dst": str(dest), "cat": cat})
+            sorted_now += 1
+
+        metrics.lap("batch", t_batch, item=f"{len(paths)} paths")
+        if sorted_now:
+            metrics.count("sorted", sorted_now)
+            self._journal.commit()
+            flush_hash_cache()
+            flush_capture_dates()
+            with self._count_lock:
+                self.sorted_count += sorted_now
+                self.icon.title = f"Folder Sorter Watcher\n{self.target.name}\nSorted: {self.sorted_count}"
+        _flush_log()
+
+def run_watcher(
+    target_folder:        Path,
+    dest_mode_override:   str = "",
+    dest_custom_override: str = "",
+    workers:              int = 4,
+    batch_window:         float = 0.25,
+    verify:               bool = False,
+    metrics_path:         Optional[Path] = None,
+    trace_path:           Optional[Path] = None,
+) -> None:
     try:
-        if Observer is None:
+        if not _watcher_available():
             print("[ERROR] Watcher dependencies not installed.")
             sys.exit(1)
+        import logging.handlers
+        import pystray
+        from watchdog.observers import Observer
             
         target = target_folder.resolve()
         if not target.is_dir():
             sys.exit(1)
             
+        # Records are buffered and written per batch (see _flush_log); errors go out at once
+        file_handler = logging.FileHandler(LOG_FILE, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter("%(asctime)s  %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
         logging.basicConfig(
-            filename=LOG_FILE,
             level=logging.INFO,
-            format="%(asctime)s  %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
+            handlers=[logging.handlers.MemoryHandler(1024, flushLevel=logging.ERROR, target=file_handler)],
         )
         
         logging.info("")
@@ -1061,6 +4900,7 @@ def run_watcher(target_folder: Path, dest_mode_override: str = "", dest_custom_o
         logging.info(f" STARTED WATCHER")
         logging.info(f" Watching: {target}")
         logging.info("==================================================")
+        _flush_log()
         
         icon = pystray.Icon("sort_watcher")
         icon.icon = create_icon_image()
@@ -1068,10 +4908,20 @@ def run_watcher(target_folder: Path, dest_mode_override: str = "", dest_custom_o
         
         event_handler = SortingHandler(target, icon,
                                         dest_mode_override=dest_mode_override,
-                                        dest_custom_override=dest_custom_override)
+                                        dest_custom_override=dest_custom_override,
+                                        workers=workers,
+                                        batch_window=batch_window,
+                                        verify=verify,
+                                        metrics_path=metrics_path,
+                                        trace_path=trace_path)
         observer = Observer()
         observer.schedule(event_handler, str(target), recursive=False)
         observer.start()
+        event_handler.start_sweeps()
+        event_handler.start_metrics()
+        logging.info(f"[METRICS] Prometheus text file: {event_handler.metrics_path}")
+        if trace_path:
+            logging.info(f"[TRACE] Writing trace events to {trace_path}")
         
         def open_log(icon, item):
             if sys.platform == "win32":
@@ -1088,6 +4938,10 @@ def run_watcher(target_folder: Path, dest_mode_override: str = "", dest_custom_o
         icon.menu = pystray.Menu(
             pystray.MenuItem(f"Watching: {target.name}", lambda: None, enabled=False),
             pystray.MenuItem(lambda text: f"Sorted items: {event_handler.sorted_count}", lambda: None, enabled=False),
+            pystray.MenuItem(
+                lambda text: "Queue: {pending} pending, {in_flight} running".format(**event_handler.queue_stats()),
+                lambda: None, enabled=False,
+            ),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem("Open Log File", open_log),
             pystray.MenuItem("Exit Watcher", stop_watcher)
@@ -1095,7 +4949,21 @@ def run_watcher(target_folder: Path, dest_mode_override: str = "", dest_custom_o
         
         icon.run()
         observer.join()
+        event_handler.close()
+        stats = event_handler.queue_stats()
+        logging.info(
+            f"[QUEUE] {stats['events']} events, {stats['coalesced']} coalesced, "
+            f"{stats['batches']} batches, peak depth {stats['peak_pending']}"
+        )
+        for lane in event_handler.lane_stats():
+            kind = "rename" if lane["same_device"] else f"copy dev {lane['src_dev']}->{lane['dst_dev']}"
+            logging.info(
+                f"[LANE]  {kind}: {lane['files']} files, {_fmt_size(lane['bytes'])} "
+                f"in {lane['seconds']:.1f}s ({', '.join(f'{k} {n}' for k, n in lane['strategies'].items())})"
+            )
+        _flush_log()
     except Exception as e:
+        _flush_log()
         import traceback
         with open(LOG_FILE, "a", encoding="utf-8") as f:
             f.write(f"\nCRITICAL DAEMON CRASH:\n{e}\n")
@@ -1109,12 +4977,124 @@ def main() -> None:
     )
     parser.add_argument(
         "--undo", metavar="FOLDER",
-        help="Undo the last sort operation in FOLDER (reads sort_log.json)",
+        help="Undo the last sort operation in FOLDER, or the runs/files picked by the --undo-* options",
+    )
+    parser.add_argument(
+        "--undo-list", metavar="FOLDER",
+        help="List the undo history kept for FOLDER (sort runs and watcher sessions)",
+    )
+    parser.add_argument(
+        "--undo-run", metavar="N", type=int, action="append",
+        help="With --undo: undo run N from --undo-list (1 = newest; repeatable)",
+    )
+    parser.add_argument(
+        "--undo-category", metavar="CATEGORY",
+        help="With --undo: only restore files sorted into CATEGORY (e.g. Images)",
+    )
+    parser.add_argument(
+        "--undo-since", metavar="WHEN",
+        help="With --undo: only restore files moved at or after WHEN (ISO date/time)",
+    )
+    parser.add_argument(
+        "--undo-until", metavar="WHEN",
+        help="With --undo: only restore files moved at or before WHEN (ISO date/time)",
+    )
+    parser.add_argument(
+        "--undo-glob", metavar="PATTERN",
+        help="With --undo: only restore files whose original name (or path) matches PATTERN",
+    )
+    parser.add_argument(
+        "--link", metavar="FOLDER",
+        help="Virtual sort: fill FOLDER's category folders with hard/symlinks instead of moving "
+             "anything; run again to add new files and prune links to deleted ones",
     )
     parser.add_argument(
         "--watch", metavar="FOLDER", nargs="?", const="GUI",
         help="Run as a background watcher on FOLDER (or open a picker if omitted)",
     )
+    parser.add_argument(
+        "--workers", metavar="N", type=int, default=None,
+        help="Move/copy files on N worker threads (sort: default 1, N > 1 also drops the "
+             "per-file UI delay; watcher: default 4)",
+    )
+    parser.add_argument(
+        "--copy-lanes", metavar="N", type=int, default=2,
+        help="Run at most N cross-device copies at once (default 2); same-disk moves are plain renames",
+    )
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="Verify every copy: hash the data as it streams and check the destination reads back "
+             "the same (the digest is kept for later duplicate checks)",
+    )
+    parser.add_argument(
+        "--metrics-textfile", metavar="PATH",
+        help="Watcher: keep Prometheus metrics in PATH for node_exporter's textfile collector "
+             "(default ~/.cable_metrics/watch-<id>.prom, refreshed every 15 s)",
+    )
+    parser.add_argument(
+        "--trace", metavar="FILE",
+        help="Record a per-file timeline of the sort or watcher (classify, lock waits, hashing, "
+             "moves, debounce) to FILE as Chrome trace-event JSON, for Perfetto or chrome://tracing",
+    )
+    parser.add_argument(
+        "--batch-window", metavar="SECONDS", type=float, default=0.25,
+        help="Watcher: extra time to gather files that settle together into one batch (default 0.25)",
+    )
+    parser.add_argument(
+        "--recursive", action="store_true",
+        help="Sort every file below the chosen folder, moving files as the walk finds them",
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="Sort very large folders in bounded memory (on-disk ordering, no preview)",
+    )
+    parser.add_argument(
+        "--sort", metavar="FOLDER",
+        help="Sort FOLDER without prompts or the terminal UI, for cron and job runners; settings come "
+             "from cable.json's session keys unless overridden below.  Exit code: 0 ok, 1 some files "
+             "failed, 2 bad arguments, 3 could not run, 130 interrupted",
+    )
+    parser.add_argument(
+        "--ndjson", action="store_true",
+        help="With --sort: stream one JSON event per file to stdout, then a summary event",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="With --sort: plan and report every file's destination, but move nothing",
+    )
+    parser.add_argument(
+        "--dest-mode", choices=("here", "defaults", "where"),
+        help="With --sort: sort into FOLDER itself, the OS library folders, or --dest-dir",
+    )
+    parser.add_argument(
+        "--dest-dir", metavar="PATH",
+        help="With --sort: put the category folders under PATH (implies --dest-mode where)",
+    )
+    parser.add_argument(
+        "--copy", action=argparse.BooleanOptionalAction, default=None,
+        help="With --sort: copy instead of move (--no-copy to force moving)",
+    )
+    parser.add_argument(
+        "--date-subfolders", action=argparse.BooleanOptionalAction, default=None,
+        help="With --sort: file photos and videos under YYYY/MM",
+    )
+    parser.add_argument(
+        "--sort-order", choices=[code for _, _, code in SORT_OPTIONS],
+        help="With --sort: order files are handled in",
+    )
+    parser.add_argument(
+        "--exclude", metavar="PATTERN", action="append",
+        help="With --sort: also skip names matching PATTERN (repeatable)",
+    )
+    parser.add_argument(
+        "--plan-out", metavar="FILE",
+        help="Plan the sort (classification, destinations, collisions, duplicates) and save it to "
+             "FILE instead of moving anything; review it, then run it with --apply",
+    )
+    parser.add_argument(
+        "--apply", metavar="PLAN",
+        help="Carry out a plan saved with --plan-out, without classifying or hashing again",
+    )
     parser.add_argument(
         "--run-watch-daemon", metavar="FOLDER",
         help=argparse.SUPPRESS,
@@ -1128,9 +5108,70 @@ def main() -> None:
         help=argparse.SUPPRESS,
     )
     args = parser.parse_args()
+    if (args.plan_out or args.dry_run) and (args.recursive or args.stream):
+        parser.error("--plan-out and --dry-run need the whole listing up front; they cannot be "
+                     "combined with --recursive or --stream")
+
+    if args.sort:
+        cfg = load_config()
+        if args.dest_dir:
+            cfg["dest_mode"], cfg["dest_custom"] = "where", str(Path(args.dest_dir).resolve())
+        elif args.dest_mode:
+            cfg["dest_mode"] = args.dest_mode
+        if cfg["dest_mode"] == "where" and not cfg["dest_custom"]:
+            parser.error("--dest-mode where needs --dest-dir (or dest_custom in cable.json)")
+        for key, value in (("copy_mode", args.copy), ("date_subfolders", args.date_subfolders),
+                           ("sort_mode", args.sort_order)):
+            if value is not None:
+                cfg[key] = value
+        cfg["exclude_patterns"] = list(cfg["exclude_patterns"]) + (args.exclude or [])
+        sys.exit(headless_sort(
+            Path(args.sort).resolve(),
+            cfg,
+            workers=max(1, args.workers or 1),
+            copy_lanes=args.copy_lanes,
+            verify=args.verify,
+            recursive=args.recursive,
+            stream=args.stream,
+            ndjson=args.ndjson,
+            dry_run=args.dry_run,
+            plan_out=Path(args.plan_out).resolve() if args.plan_out else None,
+            trace_path=Path(args.trace) if args.trace else None,
+        ))
+
+    if args.undo_list:
+        list_undo_history(Path(args.undo_list))
+        return
+
+    if args.link:
+        virtual_sort(Path(args.link).resolve(), recursive=args.recursive)
+        return
+
+    if args.apply:
+        apply_saved_plan(
+            Path(args.apply),
+            workers=max(1, args.workers or 1),
+            copy_lanes=args.copy_lanes,
+            verify=args.verify,
+            trace_path=Path(args.trace) if args.trace else None,
+        )
+        return
 
     if args.undo:
-        undo_sort(Path(args.undo))
+        try:
+            since = _parse_when(args.undo_since)
+            until = _parse_when(args.undo_until)
+        except ValueError as exc:
+            parser.error(f"invalid --undo-since/--undo-until: {exc}")
+        undo_sort(
+            Path(args.undo),
+            run_ids=args.undo_run,
+            category=args.undo_category,
+            since=since,
+            until=until,
+            pattern=args.undo_glob,
+            workers=max(1, args.workers or 8),
+        )
         return
         
     if args.run_watch_daemon:
@@ -1138,11 +5179,23 @@ def main() -> None:
             Path(args.run_watch_daemon),
             dest_mode_override=args.daemon_dest_mode,
             dest_custom_override=args.daemon_dest_custom,
+            workers=max(1, args.workers or 4),
+            batch_window=max(0.0, args.batch_window),
+            verify=args.verify,
+            metrics_path=Path(args.metrics_textfile) if args.metrics_textfile else None,
+            trace_path=Path(args.trace) if args.trace else None,
         )
         return
 
+    from rich.align import Align
+    from rich.columns import Columns
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+    from rich.rule import Rule
+    from rich.text import Text
+
     if args.watch:
-        if Observer is None:
+        if not _watcher_available():
             console.print(f"[{C_BAD}]Error: Watcher dependencies missing.[/]")
             console.print(f"[{C_DIM}]Run: python -m pip install watchdog pystray pillow[/]")
             return
@@ -1179,6 +5232,15 @@ def main() -> None:
                 cmd = [sys.executable, "--run-watch-daemon", str(target)]
             else:
                 cmd = [sys.executable, __file__, "--run-watch-daemon", str(target)]
+            if args.workers:
+                cmd += ["--workers", str(args.workers)]
+            cmd += ["--batch-window", str(args.batch_window)]
+            if args.verify:
+                cmd.append("--verify")
+            if args.metrics_textfile:
+                cmd += ["--metrics-textfile", str(Path(args.metrics_textfile).resolve())]
+            if args.trace:
+                cmd += ["--trace", str(Path(args.trace).resolve())]
             
             subprocess.Popen(cmd, creationflags=flags)
             console.print()
@@ -1229,7 +5291,7 @@ def main() -> None:
     cfg["run_mode"] = run_mode
     
     if run_mode == "2":
-        if Observer is None:
+        if not _watcher_available():
             console.print(f"[{C_BAD}]Error: Watcher dependencies missing.[/]")
             console.print(f"[{C_DIM}]Run: python -m pip install watchdog pystray pillow[/]")
             return
@@ -1252,6 +5314,15 @@ def main() -> None:
                 cmd = [sys.executable, __file__, "--run-watch-daemon", str(target),
                        "--daemon-dest-mode", dest_mode,
                        "--daemon-dest-custom", cfg["dest_custom"]]
+            if args.workers:
+                cmd += ["--workers", str(args.workers)]
+            cmd += ["--batch-window", str(args.batch_window)]
+            if args.verify:
+                cmd.append("--verify")
+            if args.metrics_textfile:
+                cmd += ["--metrics-textfile", str(Path(args.metrics_textfile).resolve())]
+            if args.trace:
+                cmd += ["--trace", str(Path(args.trace).resolve())]
                 
             subprocess.Popen(cmd, creationflags=flags)
             console.print()
@@ -1270,54 +5341,109 @@ def main() -> None:
             
         return
 
-    step_header(4, "Sort Order")
-    sort_mode     = pick_sort_order(default=str(cfg["sort_mode"]))
-    cfg["sort_mode"] = sort_mode
+    patterns = list(cfg["exclude_patterns"])
+    run_metrics = Metrics("sort", target)
+    plan: Optional[SortPlan] = None
+    if args.recursive or args.stream:
+        step = 4
+        if not args.recursive:
+            step_header(step, "Sort Order")
+            sort_mode     = pick_sort_order(default=str(cfg["sort_mode"]))
+            cfg["sort_mode"] = sort_mode
+            step += 1
+        step_header(step, "Options")
+        cfg = pick_options(cfg)
+        patterns = list(cfg["exclude_patterns"])
+
+        total: Optional[int]
+        if args.recursive:
+            items: Iterable[ItemRecord] = sniffer().prefetching(
+                walk_items(target, patterns, _prune_dirs(dest_mode, dest_root))
+            )
+            total = None
+            blurb = (f"  [{C_ACCENT}]Recursive[/]  [#f9fafb]Every file below [bold]{target.name}[/] is "
+                     f"classified and moved as the walk finds it.[/]\n"
+                     f"  [{C_DIM}]No preview is built, so the first files move before the walk finishes.[/]")
+            what  = f"[#fbbf24]every file[/] under {target.name}"
+        else:
+            with console.status("[bold #c4b5fd]Scanning…[/]", spinner="dots2"):
+                t0 = time.perf_counter()
+                total, items = external_sorted(
+                    iter_items(target, patterns), key=lambda r: _item_sort_key(r, sort_mode),
+                )
+                run_metrics.lap("scan", t0)
+            items = sniffer().prefetching(items)
+            if not total:
+                console.print()
+                console.print(Panel(
+                    "  [bold #fbbf24]The folder is already empty or fully organised![/]",
+                    border_style="#78350f", padding=(1, 2),
+                ))
+                save_config(cfg)
+                return
+            blurb = (f"  [{C_ACCENT}]Streaming[/]  [#f9fafb]{total} items are ordered on disk and "
+                     f"moved one by one; memory stays flat.[/]\n"
+                     f"  [{C_DIM}]No preview is built for streaming runs.[/]")
+            what  = f"[#fbbf24]{total}[/] items"
+        console.print(Panel(blurb, border_style="#4c1d95", padding=(1, 2)))
+        console.print()
+        step += 1
+    else:
+        step_header(4, "Sort Order")
+        sort_mode     = pick_sort_order(default=str(cfg["sort_mode"]))
+        cfg["sort_mode"] = sort_mode
 
-    step_header(5, "Options")
-    cfg = pick_options(cfg)
+        step_header(5, "Options")
+        cfg = pick_options(cfg)
+        patterns = list(cfg["exclude_patterns"])
 
-    raw_items = [
-        i for i in target.iterdir()
-        if i.name not in SKIP_ROOT and not i.name.startswith(".")
-        and i.name != "sort_log.json"
-    ]
-    raw_items = apply_excludes(raw_items, list(cfg["exclude_patterns"]))
+        t0        = time.perf_counter()
+        raw_items = scan_items(target, patterns)
+        run_metrics.lap("scan", t0, nbytes=sum(i.size for i in raw_items))
+        sniffer().prefetch(raw_items)   # reads unknown files' headers while the preview is built
 
-    if not raw_items:
-        console.print()
-        console.print(Panel(
-            "  [bold #fbbf24]The folder is already empty or fully organised![/]",
-            border_style="#78350f", padding=(1, 2),
-        ))
-        save_config(cfg)
-        return
+        if not raw_items:
+            console.print()
+            console.print(Panel(
+                "  [bold #fbbf24]The folder is already empty or fully organised![/]",
+                border_style="#78350f", padding=(1, 2),
+            ))
+            save_config(cfg)
+            return
 
-    items = sorted_items(raw_items, sort_mode)
+        items = sorted_items(raw_items, sort_mode)
+        total = len(items)
+        # one classification pass: the preview, the counts and the sort itself all read the plan
+        with console.status("[bold #c4b5fd]Planning…[/]", spinner="dots2"), collecting(run_metrics):
+            plan = plan_sort(target, items, bool(cfg["copy_mode"]), bool(cfg["date_subfolders"]),
+                             dest_mode, dest_root)
 
-    step_header(6, "Preview")
-    console.print(build_preview(items, sort_mode))
+        step_header(6, "Preview")
+        console.print(build_preview(plan, sort_mode))
 
-    # quick category breakdown bar
-    counts: dict[str, int] = {}
-    for i in items:
-        k = classify(i)
-        counts[k] = counts.get(k, 0) + 1
+        # quick category breakdown bar
+        counts, _ = plan.counts()
 
-    bar_parts: list[Text] = []
-    for cat, cnt in list(sorted(counts.items(), key=lambda x: -x[1]))[:6]:  # type: ignore[misc]
-        meta  = cat_meta(cat)
-        label = cat.split("  ")[-1] if "  " in cat else cat
-        bar_parts.append(Text(f"  {meta['icon']} {label}: {cnt}", style=meta["color"]))
+        bar_parts: list[Text] = []
+        for cat, cnt in list(sorted(counts.items(), key=lambda x: -x[1]))[:6]:  # type: ignore[misc]
+            meta  = cat_meta(cat)
+            label = cat.split("  ")[-1] if "  " in cat else cat
+            bar_parts.append(Text(f"  {meta['icon']} {label}: {cnt}", style=meta["color"]))
 
-    console.print()
-    console.print(Columns(bar_parts, padding=(0, 1)))
-    console.print()
+        console.print()
+        console.print(Columns(bar_parts, padding=(0, 1)))
+        console.print()
+        what = f"[#fbbf24]{total - plan.duplicates}[/] items"
+        if plan.duplicates:
+            what += f" [dim]({plan.duplicates} identical already there)[/]"
+        step = 7
 
     # options summary line
     mode_str = "[bold #60a5fa]copy[/]" if cfg["copy_mode"] else "[bold #34d399]move[/]"
+    if args.verify:
+        mode_str += " [dim](verified)[/]"
     date_str = "[bold #a78bfa]YYYY/MM[/]" if cfg["date_subfolders"] else "[dim]flat[/]"
-    excl_str = f"[{C_ACCENT}]{', '.join(cfg['exclude_patterns'])}[/]" if cfg["exclude_patterns"] else "[dim]none[/]"
+    excl_str = f"[{C_ACCENT}]{', '.join(patterns)}[/]" if patterns else "[dim]none[/]"
     if dest_mode == "defaults":
         dest_str = "[bold #a78bfa]Defaults[/]"
     elif dest_mode == "where" and dest_root:
@@ -1330,14 +5456,32 @@ def main() -> None:
         f"[{C_DIM}]·[/]  [{C_DIM}]Media:[/] {date_str}  "
         f"[{C_DIM}]·[/]  [{C_DIM}]Excluded:[/] {excl_str}"
     )
+    for err in tables().rule_errors:
+        console.print(f"  [{C_WARN}]⚠  cable.json: skipped {err}[/]")
     console.print()
 
-    step_header(7, "Confirm")
+    if plan is not None and args.plan_out:
+        plan_path = Path(args.plan_out).resolve()
+        try:
+            plan.save(plan_path)
+        except OSError as exc:
+            console.print(f"  [{C_BAD}]Could not save the plan: {exc}[/]")
+            return
+        console.print(Panel(
+            f"  [bold #34d399]✔[/]  Plan saved \u2192 [#f9fafb]{plan_path}[/]\n"
+            f"  [{C_DIM}]Nothing was moved.  Run it with --apply {plan_path}[/]",
+            border_style="#065f46", padding=(1, 2),
+        ))
+        console.print()
+        save_config(cfg)
+        return
+
+    step_header(step, "Confirm")
     proceed = Confirm.ask(
         f"  [bold #c4b5fd]{'Copy' if cfg['copy_mode'] else 'Sort'} "
-        f"[#fbbf24]{len(items)}[/] items into subfolders?[/]",
+        f"{what} into subfolders?[/]",
         default=True,
-        console=console,
+        console=console.real,
     )
 
     if not proceed:
@@ -1347,27 +5491,63 @@ def main() -> None:
         save_config(cfg)
         return
 
-    step_header(8, "Sorting")
-    results, size_results, elapsed, ops_log, duplicates = sort_folder(
-        target,
-        items,
-        copy_mode=bool(cfg["copy_mode"]),
-        date_subfolders=bool(cfg["date_subfolders"]),
-        dest_mode=dest_mode,
-        dest_root=dest_root,
-    )
-
-    # Write undo log (move mode only)
-    # Undo log is written relative to target (source) folder always
-    if ops_log and not cfg["copy_mode"]:
-        write_undo_log(target, ops_log)
-        console.print(f"\n  [{C_DIM}]Undo log saved \u2192 [bold]sort_log.json[/]  (run with --undo to restore)[/]")
+    step_header(step + 1, "Sorting")
+    # Undo journal (move mode only) is appended next to the source folder as ops happen
+    recovered = recover_journals(target)
+    if recovered:
+        console.print(f"  [{C_WARN}]Recovered undo data from {recovered} interrupted run"
+                      f"{'s' if recovered != 1 else ''}.[/]\n")
+    undo_log = None if cfg["copy_mode"] else UndoJournal(target)
+    engine   = MoveEngine(copy_lanes=args.copy_lanes, verify=args.verify)
+    run_metrics.mode = "copy" if cfg["copy_mode"] else "move"
+    tracer = Tracer(Path(args.trace)) if args.trace else None
+    activate_tracer(tracer)
+    try:
+        with collecting(run_metrics):
+            if plan is not None:
+                results, size_results, elapsed, _, duplicates = apply_plan(
+                    plan,
+                    workers=max(1, args.workers or 1),
+                    ops_sink=undo_log.append if undo_log else None,
+                    engine=engine,
+                    pace=not args.workers or args.workers == 1,
+                )
+            else:
+                results, size_results, elapsed, _, duplicates = sort_folder(
+                    target,
+                    items,
+                    copy_mode=bool(cfg["copy_mode"]),
+                    date_subfolders=bool(cfg["date_subfolders"]),
+                    dest_mode=dest_mode,
+                    dest_root=dest_root,
+                    workers=max(1, args.workers or 1),
+                    total=total,
+                    ops_sink=undo_log.append if undo_log else None,
+                    bounded=bool(args.recursive or args.stream),
+                    engine=engine,
+                )
+    finally:
+        if undo_log is not None:
+            undo_log.close()
+        if tracer is not None:
+            activate_tracer(None)
+            tracer.close()
+
+    if undo_log is not None and undo_log.count:
+        console.print(f"\n  [{C_DIM}]Undo journal saved \u2192 [bold]{JOURNAL_DIR_NAME}/{undo_log.path.name}[/]  "
+                      f"(run with --undo to restore)[/]")
+    report = run_metrics.write_report()
+    if report is not None:
+        console.print(f"  [{C_DIM}]Metrics report \u2192 {report}[/]")
+    if tracer is not None:
+        console.print(f"  [{C_DIM}]Trace \u2192 {tracer.path}  (open in ui.perfetto.dev)[/]")
 
     # ── Done ─────────────────────────────────────────────────────────────────
     console.print()
     console.print(Rule("[bold #34d399]  ✔  Complete  [/]", style="#065f46"))
     console.print()
-    console.print(build_summary(results, size_results, elapsed, bool(cfg["copy_mode"]), duplicates))
+    console.print(build_summary(results, size_results, elapsed, bool(cfg["copy_mode"]), duplicates,
+                                engine.report(), run_metrics.report()["phases"]))
     console.print()
     console.print(build_stats_panel(results, size_results))
     console.print()
@@ -1387,4 +5567,12 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()    # capture-date workers in a frozen build
+    headless = any(a == "--sort" or a.startswith("--sort=") for a in sys.argv[1:])
+    if not headless and importlib.util.find_spec("rich") is None:
+        print("[ERROR] Missing 'rich' library.  Run: pip install rich")
+        sys.exit(1)
+    _force_utf8_stdio()
     main()